@@ -0,0 +1,42 @@
+"""add user trigram indexes
+
+Revision ID: 7f3b1d2e9a64
+Revises: 2a6d9e4f8c31
+Create Date: 2026-10-18 14:08:52.631940
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7f3b1d2e9a64"
+down_revision: Union[str, None] = "2a6d9e4f8c31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_user_email_trgm",
+        "user",
+        ["email"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"email": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_user_phone_trgm",
+        "user",
+        ["phone"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"phone": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_phone_trgm", table_name="user", postgresql_using="gin")
+    op.drop_index("ix_user_email_trgm", table_name="user", postgresql_using="gin")
@@ -0,0 +1,116 @@
+"""partition failed message log
+
+Revision ID: 8a4f2d6e1c97
+Revises: 5e1a7c9d3f86
+Create Date: 2026-10-18 19:20:38.271604
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4f2d6e1c97"
+down_revision: Union[str, None] = "5e1a7c9d3f86"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, create_dt, update_dt, message_type, message_name, error_message, "
+    "fingerprint, window_start_dt, occurrences, first_seen_dt, last_seen_dt, payload"
+)
+
+# monthly partitions from the oldest existing row up to two months ahead, the partition maintenance job takes over
+# from there. names have to match src/service_layer/failed_message_log/partitions.py
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month date := date_trunc('month', LEAST((SELECT min(create_dt) FROM failed_message_log_old), now()));
+BEGIN
+    WHILE month <= date_trunc('month', now()) + interval '2 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF failed_message_log FOR VALUES FROM (%L) TO (%L)',
+            'failed_message_log_' || to_char(month, '"y"YYYY"m"MM'),
+            month,
+            month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$
+"""
+
+
+def columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.String(length=21), nullable=False),
+        sa.Column("create_dt", postgresql.TIMESTAMP(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("update_dt", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("message_type", sa.String(length=255), nullable=False),
+        sa.Column("message_name", sa.String(length=255), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=False),
+        sa.Column("fingerprint", sa.String(length=40), nullable=True),
+        sa.Column("window_start_dt", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("occurrences", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("first_seen_dt", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("last_seen_dt", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    # a table can not be turned into a partitioned one in place, so the rows are copied into a new table
+    op.drop_index("ix_failed_message_log_fingerprint_window", table_name="failed_message_log")
+    op.drop_index(op.f("ix_failed_message_log_id"), table_name="failed_message_log")
+    op.execute(
+        "ALTER TABLE failed_message_log RENAME CONSTRAINT failed_message_log_pkey TO failed_message_log_old_pkey"
+    )
+    op.rename_table("failed_message_log", "failed_message_log_old")
+
+    op.create_table(
+        "failed_message_log",
+        *columns(),
+        sa.PrimaryKeyConstraint("id", "create_dt"),
+        postgresql_partition_by="RANGE (create_dt)",
+    )
+    op.create_index(op.f("ix_failed_message_log_id"), "failed_message_log", ["id"], unique=False)
+    op.create_index(
+        "ix_failed_message_log_fingerprint_window",
+        "failed_message_log",
+        ["fingerprint", "window_start_dt", "create_dt"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_failed_message_log_message_name_create_dt",
+        "failed_message_log",
+        ["message_name", "create_dt"],
+        unique=False,
+    )
+    op.execute(CREATE_PARTITIONS)
+    op.execute(f"INSERT INTO failed_message_log ({COLUMNS}) SELECT {COLUMNS} FROM failed_message_log_old")
+    op.drop_table("failed_message_log_old")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "failed_message_log_old",
+        *columns(),
+        sa.PrimaryKeyConstraint("id", name="failed_message_log_old_pkey"),
+    )
+    op.execute(f"INSERT INTO failed_message_log_old ({COLUMNS}) SELECT {COLUMNS} FROM failed_message_log")
+    # dropping the parent drops every partition with it
+    op.drop_table("failed_message_log")
+    op.rename_table("failed_message_log_old", "failed_message_log")
+    op.execute(
+        "ALTER TABLE failed_message_log RENAME CONSTRAINT failed_message_log_old_pkey TO failed_message_log_pkey"
+    )
+    op.create_index(op.f("ix_failed_message_log_id"), "failed_message_log", ["id"], unique=True)
+    op.create_index(
+        "ix_failed_message_log_fingerprint_window",
+        "failed_message_log",
+        ["fingerprint", "window_start_dt"],
+        unique=True,
+    )
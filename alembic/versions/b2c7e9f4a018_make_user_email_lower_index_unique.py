@@ -0,0 +1,30 @@
+"""make user email lower index unique
+
+Revision ID: b2c7e9f4a018
+Revises: 8a4f2d6e1c97
+Create Date: 2026-10-18 21:05:51.640187
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c7e9f4a018"
+down_revision: Union[str, None] = "8a4f2d6e1c97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # fails if existing emails collide when lowercased, those accounts have to be merged or renamed first
+    op.drop_index("ix_user_email_lower", table_name="user")
+    op.create_index("ix_user_email_lower", "user", [sa.text("lower(email)")], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_email_lower", table_name="user")
+    op.create_index("ix_user_email_lower", "user", [sa.text("lower(email)")], unique=False)
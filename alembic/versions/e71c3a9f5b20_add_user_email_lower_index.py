@@ -0,0 +1,27 @@
+"""add user email lower index
+
+Revision ID: e71c3a9f5b20
+Revises: 4b8e0a7c2d15
+Create Date: 2026-10-18 11:40:05.771203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e71c3a9f5b20"
+down_revision: Union[str, None] = "4b8e0a7c2d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_user_email_lower", "user", [sa.text("lower(email)")], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_email_lower", table_name="user")
@@ -0,0 +1,28 @@
+"""add failed message log default partition
+
+Revision ID: e8b3c6d2a417
+Revises: d4a1f7b3c925
+Create Date: 2026-10-18 23:02:11.905317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b3c6d2a417"
+down_revision: Union[str, None] = "d4a1f7b3c925"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # rows no monthly partition covers land here instead of failing the insert, the partition maintenance job
+    # moves them into their own partitions. the name has to match src/service_layer/failed_message_log/partitions.py
+    op.execute("CREATE TABLE IF NOT EXISTS failed_message_log_default PARTITION OF failed_message_log DEFAULT")
+
+
+def downgrade() -> None:
+    # rows still in the default partition are dropped with it
+    op.execute("DROP TABLE IF EXISTS failed_message_log_default")
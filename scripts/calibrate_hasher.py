@@ -0,0 +1,34 @@
+import argparse
+import os
+
+from src.common.security.hasher_calibration import calibrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark argon2 parameters on this host")
+    parser.add_argument("--target-latency-ms", type=float, default=250)
+    parser.add_argument("--max-memory-cost", type=int, default=65536, help="upper bound for memory cost in KiB")
+    parser.add_argument("--parallelism", type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--max-time-cost", type=int, default=10)
+    args = parser.parse_args()
+
+    selected, measured = calibrate(
+        target_latency_ms=args.target_latency_ms,
+        max_memory_cost=args.max_memory_cost,
+        parallelism=args.parallelism,
+        samples=args.samples,
+        max_time_cost=args.max_time_cost,
+    )
+
+    print(f"{'time_cost':>10} {'memory_cost':>12} {'parallelism':>12} {'p50_ms':>10} {'p99_ms':>10}")
+    for result in measured:
+        marker = " <- selected" if result == selected else ""
+        print(
+            f"{result.time_cost:>10} {result.memory_cost:>12} {result.parallelism:>12} "
+            f"{result.p50_ms:>10.2f} {result.p99_ms:>10.2f}{marker}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ class AbstractRepository(abc.ABC):
     async def get(self, ident: Any):
         return await self._get(ident)
 
+    async def get_many(self, idents: list[Any]) -> list[Any]:
+        return await self._get_many(idents)
+
     async def get_by(self, *args, **kwargs):
         return await self._get_by(*args, **kwargs)
 
@@ -30,6 +33,9 @@ class AbstractRepository(abc.ABC):
     @abc.abstractmethod
     async def _get(self, ident: Any) -> Any | None: ...
 
+    @abc.abstractmethod
+    async def _get_many(self, idents: list[Any]) -> list[Any]: ...
+
     @abc.abstractmethod
     async def _get_by(self, *args, **kwargs) -> Any | None: ...
 
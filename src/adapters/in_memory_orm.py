@@ -2,8 +2,8 @@ import sqlalchemy as sa
 from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import registry, relationship
 
-from src.domain.base import FailedMessageLog
-from src.domain.user.model import AuthorizedFeatures, User
+from src.domain.base import FailedMessageLog, OutboxMessage
+from src.domain.user.model import AuthorizedFeatures, RevokedToken, User
 
 metadata = sa.MetaData()
 mapper_registry = registry(metadata=metadata)
@@ -30,11 +30,15 @@ user = sa.Table(
         sqlite.TIMESTAMP(timezone=True),
         onupdate=sa.func.current_timestamp(),
     ),
-    sa.Column("phone", sa.String(length=100), nullable=False),
-    sa.Column("email", sa.String(length=100), nullable=False),
+    sa.Column("phone", sa.String(length=100), index=True, unique=True, nullable=False),
+    sa.Column("email", sa.String(length=100), index=True, unique=True, nullable=False),
     sa.Column("password", sa.Text, nullable=False),
     sa.Column("type", sa.String(length=100), nullable=False),
 )
+# emails are unique regardless of case, login looks them up through this index
+sa.Index("ix_user_email_lower", sa.func.lower(user.c.email), unique=True)
+sa.Index("ix_user_email_id", user.c.email, user.c.id)
+sa.Index("ix_user_phone_id", user.c.phone, user.c.id)
 
 authorized_features = sa.Table(
     "authorized_features",
@@ -93,6 +97,93 @@ failed_message_log = sa.Table(
     sa.Column("message_type", sa.String(length=255), nullable=False),
     sa.Column("message_name", sa.String(length=255), nullable=False),
     sa.Column("error_message", sa.Text, nullable=False),
+    sa.Column("fingerprint", sa.String(length=40), nullable=True),
+    sa.Column("window_start_date", sqlite.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column("occurrences", sa.Integer, nullable=False, default=1, server_default="1"),
+    sa.Column("first_seen_date", sqlite.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column("last_seen_date", sqlite.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column("payload", sa.JSON, nullable=True),
+)
+sa.Index(
+    "ix_failed_message_log_fingerprint_window",
+    failed_message_log.c.fingerprint,
+    failed_message_log.c.window_start_date,
+    failed_message_log.c.create_date,
+    unique=True,
+)
+sa.Index(
+    "ix_failed_message_log_message_name_create_date",
+    failed_message_log.c.message_name,
+    failed_message_log.c.create_date,
+)
+
+revoked_token = sa.Table(
+    "revoked_token",
+    mapper_registry.metadata,
+    sa.Column(
+        "id",
+        sa.String(length=21),
+        primary_key=True,
+        index=True,
+        unique=True,
+    ),
+    sa.Column(
+        "create_date",
+        sqlite.TIMESTAMP(timezone=True),
+        default=sa.func.now(),
+        server_default=sa.func.now(),
+        nullable=False,
+    ),
+    sa.Column(
+        "update_date",
+        sqlite.TIMESTAMP(timezone=True),
+        onupdate=sa.func.current_timestamp(),
+    ),
+    sa.Column("jti", sa.String(length=32), index=True, unique=True, nullable=False),
+    sa.Column("user_id", sa.String(length=21), index=True, nullable=False),
+    sa.Column("expire_date", sqlite.TIMESTAMP(timezone=True), index=True, nullable=False),
+)
+
+outbox_message = sa.Table(
+    "outbox_message",
+    mapper_registry.metadata,
+    sa.Column(
+        "id",
+        sa.String(length=21),
+        primary_key=True,
+        index=True,
+        unique=True,
+    ),
+    sa.Column(
+        "create_date",
+        sqlite.TIMESTAMP(timezone=True),
+        default=sa.func.now(),
+        server_default=sa.func.now(),
+        nullable=False,
+    ),
+    sa.Column(
+        "update_date",
+        sqlite.TIMESTAMP(timezone=True),
+        onupdate=sa.func.current_timestamp(),
+    ),
+    sa.Column("message_name", sa.String(length=255), nullable=False),
+    sa.Column("payload", sa.JSON, nullable=False),
+    sa.Column("attempts", sa.Integer, nullable=False, default=0, server_default="0"),
+    sa.Column("last_error", sa.Text, nullable=True),
+    sa.Column("processed_date", sqlite.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column("lease_expire_date", sqlite.TIMESTAMP(timezone=True), nullable=True),
+)
+# the dispatcher only ever scans unprocessed messages in creation order
+sa.Index(
+    "ix_outbox_message_pending",
+    outbox_message.c.create_date,
+    sqlite_where=outbox_message.c.processed_date.is_(None),
+)
+# the purge job only ever scans processed messages by age
+sa.Index(
+    "ix_outbox_message_processed",
+    outbox_message.c.processed_date,
+    sqlite_where=outbox_message.c.processed_date.is_not(None),
 )
 
 
@@ -118,3 +209,5 @@ def start_mappers():
         },
     )
     mapper_registry.map_imperatively(FailedMessageLog, failed_message_log)
+    mapper_registry.map_imperatively(RevokedToken, revoked_token)
+    mapper_registry.map_imperatively(OutboxMessage, outbox_message)
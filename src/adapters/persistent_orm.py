@@ -2,8 +2,8 @@ import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import registry, relationship
 
-from src.domain.base import FailedMessageLog
-from src.domain.user.model import AuthorizedFeatures, User
+from src.domain.base import FailedMessageLog, OutboxMessage
+from src.domain.user.model import AuthorizedFeatures, RevokedToken, User
 
 metadata = sa.MetaData()
 mapper_registry = registry(metadata=metadata)
@@ -30,11 +30,17 @@ user = sa.Table(
         postgresql.TIMESTAMP(timezone=True),
         onupdate=sa.func.current_timestamp(),
     ),
-    sa.Column("phone", sa.String(length=100), nullable=False),
-    sa.Column("email", sa.String(length=100), nullable=False),
+    sa.Column("phone", sa.String(length=100), index=True, unique=True, nullable=False),
+    sa.Column("email", sa.String(length=100), index=True, unique=True, nullable=False),
     sa.Column("password", sa.Text, nullable=False),
     sa.Column("type", sa.String(length=100), nullable=False),
 )
+# emails are unique regardless of case, login looks them up through this index
+sa.Index("ix_user_email_lower", sa.func.lower(user.c.email), unique=True)
+sa.Index("ix_user_email_id", user.c.email, user.c.id)
+sa.Index("ix_user_phone_id", user.c.phone, user.c.id)
+sa.Index("ix_user_email_trgm", user.c.email, postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"})
+sa.Index("ix_user_phone_trgm", user.c.phone, postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"})
 
 authorized_features = sa.Table(
     "authorized_features",
@@ -69,6 +75,8 @@ authorized_features = sa.Table(
 )
 
 
+# range partitioned by month on create_dt, so every unique key has to include it. partitions are created and
+# dropped by the maintain_failed_message_log_partitions job
 failed_message_log = sa.Table(
     "failed_message_log",
     mapper_registry.metadata,
@@ -77,23 +85,116 @@ failed_message_log = sa.Table(
         sa.String(length=21),
         primary_key=True,
         index=True,
-        unique=True,
     ),
     sa.Column(
         "create_dt",
         postgresql.TIMESTAMP(timezone=True),
+        primary_key=True,
         default=sa.func.now(),
         server_default=sa.func.now(),
         nullable=False,
+        key="create_date",
     ),
     sa.Column(
         "update_dt",
         postgresql.TIMESTAMP(timezone=True),
         onupdate=sa.func.current_timestamp(),
+        key="update_date",
     ),
     sa.Column("message_type", sa.String(length=255), nullable=False),
     sa.Column("message_name", sa.String(length=255), nullable=False),
     sa.Column("error_message", sa.Text, nullable=False),
+    sa.Column("fingerprint", sa.String(length=40), nullable=True),
+    sa.Column("window_start_dt", postgresql.TIMESTAMP(timezone=True), nullable=True, key="window_start_date"),
+    sa.Column("occurrences", sa.Integer, nullable=False, default=1, server_default="1"),
+    sa.Column("first_seen_dt", postgresql.TIMESTAMP(timezone=True), nullable=True, key="first_seen_date"),
+    sa.Column("last_seen_dt", postgresql.TIMESTAMP(timezone=True), nullable=True, key="last_seen_date"),
+    sa.Column("payload", postgresql.JSONB, nullable=True),
+    postgresql_partition_by="RANGE (create_dt)",
+)
+# repeats of a failure are upserted into the row of their fingerprint and window, whose create_dt is the window start
+sa.Index(
+    "ix_failed_message_log_fingerprint_window",
+    failed_message_log.c.fingerprint,
+    failed_message_log.c.window_start_date,
+    failed_message_log.c.create_date,
+    unique=True,
+)
+sa.Index(
+    "ix_failed_message_log_message_name_create_dt",
+    failed_message_log.c.message_name,
+    failed_message_log.c.create_date,
+)
+
+revoked_token = sa.Table(
+    "revoked_token",
+    mapper_registry.metadata,
+    sa.Column(
+        "id",
+        sa.String(length=21),
+        primary_key=True,
+        index=True,
+        unique=True,
+    ),
+    sa.Column(
+        "create_dt",
+        postgresql.TIMESTAMP(timezone=True),
+        default=sa.func.now(),
+        server_default=sa.func.now(),
+        nullable=False,
+    ),
+    sa.Column(
+        "update_dt",
+        postgresql.TIMESTAMP(timezone=True),
+        onupdate=sa.func.current_timestamp(),
+    ),
+    sa.Column("jti", sa.String(length=32), index=True, unique=True, nullable=False),
+    sa.Column("user_id", sa.String(length=21), index=True, nullable=False),
+    sa.Column("expire_dt", postgresql.TIMESTAMP(timezone=True), index=True, nullable=False, key="expire_date"),
+)
+
+outbox_message = sa.Table(
+    "outbox_message",
+    mapper_registry.metadata,
+    sa.Column(
+        "id",
+        sa.String(length=21),
+        primary_key=True,
+        index=True,
+        unique=True,
+    ),
+    sa.Column(
+        "create_dt",
+        postgresql.TIMESTAMP(timezone=True),
+        default=sa.func.now(),
+        server_default=sa.func.now(),
+        nullable=False,
+        key="create_date",
+    ),
+    sa.Column(
+        "update_dt",
+        postgresql.TIMESTAMP(timezone=True),
+        onupdate=sa.func.current_timestamp(),
+        key="update_date",
+    ),
+    sa.Column("message_name", sa.String(length=255), nullable=False),
+    sa.Column("payload", postgresql.JSONB, nullable=False),
+    sa.Column("attempts", sa.Integer, nullable=False, default=0, server_default="0"),
+    sa.Column("last_error", sa.Text, nullable=True),
+    sa.Column("processed_dt", postgresql.TIMESTAMP(timezone=True), nullable=True, key="processed_date"),
+    sa.Column("lease_expire_dt", postgresql.TIMESTAMP(timezone=True), nullable=True, key="lease_expire_date"),
+)
+# the dispatcher only ever scans unprocessed messages in creation order
+sa.Index(
+    "ix_outbox_message_pending",
+    outbox_message.c.create_date,
+    postgresql_where=outbox_message.c.processed_date.is_(None),
+)
+# the purge job only ever scans processed messages by age
+sa.Index(
+    "ix_outbox_message_processed",
+    outbox_message.c.processed_date,
+    postgresql_where=outbox_message.c.processed_date.is_not(None),
 )
 
 
@@ -118,4 +219,11 @@ def start_mappers():
             )
         },
     )
-    mapper_registry.map_imperatively(FailedMessageLog, failed_message_log)
+    mapper_registry.map_imperatively(
+        FailedMessageLog,
+        failed_message_log,
+        # create_dt is only part of the primary key because partitioning requires it, ids are unique on their own
+        primary_key=[failed_message_log.c.id],
+    )
+    mapper_registry.map_imperatively(RevokedToken, revoked_token)
+    mapper_registry.map_imperatively(OutboxMessage, outbox_message)
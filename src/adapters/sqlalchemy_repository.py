@@ -7,6 +7,7 @@ from sqlalchemy.future import select
 from sqlalchemy.sql.selectable import Select
 
 from src.adapters.abstract_repository import AbstractRepository
+from src.utils.batch_loader import BatchLoader
 
 T = TypeVar("T", bound=object)
 
@@ -17,6 +18,8 @@ class SqlAlchemyRepository(Generic[T], AbstractRepository):  # type: ignore
         self.session = session
         self.model = model
         self.query: Select = select(self.model)
+        # gets made within one loop tick on this session are resolved by one WHERE id IN (...)
+        self.loader: BatchLoader[Any, T] = BatchLoader(self._load_by_ids)
 
     def _add(self, item: T):
         self.session.add(item)
@@ -64,11 +67,17 @@ class SqlAlchemyRepository(Generic[T], AbstractRepository):  # type: ignore
                     _filters.append(model_column.is_(value))
         return _filters
 
-    async def _get(self, ident: UUID) -> T | None:
-        _query = self.query.where(self.model.id == ident)  # type: ignore
+    async def _load_by_ids(self, idents: list[Any]) -> dict[Any, T]:
+        _query = self.query.where(self.model.id.in_(idents))  # type: ignore
         execution = await self.session.execute(_query)
-        model: T | None = execution.scalar_one_or_none()
-        return model
+        return {model.id: model for model in execution.scalars().all()}  # type: ignore
+
+    async def _get(self, ident: UUID) -> T | None:
+        return await self.loader.load(ident)
+
+    async def _get_many(self, idents: list[Any]) -> list[T]:
+        models = await self.loader.load_many(idents)
+        return [model for model in models if model is not None]
 
     async def _get_by(self, *args, **kwargs) -> T | None:
         _filters = self._get_filters(*args, **kwargs)
@@ -1,4 +1,5 @@
 from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor  # type: ignore
+from apscheduler.jobstores.memory import MemoryJobStore  # type: ignore
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore  # type: ignore
 from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore
 from pytz import timezone
@@ -9,8 +10,10 @@ background_scheduler: BackgroundScheduler | None = None
 
 
 jobstores = {
-    "default": SQLAlchemyJobStore(url="sqlite:///jobs.sqlite")
+    "default": SQLAlchemyJobStore(url="sqlite:///jobs.sqlite"),
     # use an in memory scheduler for now, don't think ap scheduler supports asyncpg yet
+    "memory": MemoryJobStore(),
+    # for jobs that maintain per process state, every worker has to run its own copy
 }
 executors = {"default": ThreadPoolExecutor(20), "processpool": ProcessPoolExecutor(5)}
 job_defaults = {"coalesce": False, "max_instances": 3}
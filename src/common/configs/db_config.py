@@ -2,25 +2,66 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engin
 from sqlalchemy.orm import sessionmaker
 
 from src.adapters.persistent_orm import start_mappers
-from src.common.configs.settings import settings
+from src.common.configs.pool_metrics import InstrumentedQueuePool
+from src.common.configs.settings import PoolSettings, Workload, settings
 
 engine: AsyncEngine | None = None
 autocommit_engine: AsyncEngine | None = None
+broadcast_engine: AsyncEngine | None = None
 async_transactional_session_factory: sessionmaker | None = None
 async_autocommit_session_factory: sessionmaker | None = None
+workload_engines: dict[Workload, AsyncEngine] = {}
+transactional_session_factories: dict[Workload, sessionmaker] = {}
+autocommit_session_factories: dict[Workload, sessionmaker] = {}
+replica_engines: list[AsyncEngine] = []
 
 
-if settings.stage != "TEST" or settings.is_ci is True:
-    engine = create_async_engine(
-        settings.db_settings.url,
+def create_pooled_engine(url: str, pool_settings: PoolSettings) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
         pool_pre_ping=True,
-        pool_size=settings.db_settings.pool_size,
-        max_overflow=settings.db_settings.max_overflow,
+        pool_size=pool_settings.pool_size,
+        max_overflow=pool_settings.max_overflow,
+        pool_timeout=pool_settings.pool_timeout,
         future=True,
     )
-    async_transactional_session_factory = sessionmaker(
-        engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
-    )
+
+
+if settings.stage != "TEST" or settings.is_ci is True:
+    for workload, pool_settings in settings.db_settings.workload_pools.items():
+        workload_engine = create_pooled_engine(settings.db_settings.url, pool_settings)
+        workload_engines[workload] = workload_engine
+        transactional_session_factories[workload] = sessionmaker(
+            workload_engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
+        )
+        autocommit_session_factories[workload] = sessionmaker(
+            workload_engine.execution_options(isolation_level="AUTOCOMMIT"), expire_on_commit=False, class_=AsyncSession
+        )
+    engine = workload_engines["COMMAND"]
     autocommit_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
-    async_autocommit_session_factory = sessionmaker(autocommit_engine, expire_on_commit=False, class_=AsyncSession)
+    async_transactional_session_factory = transactional_session_factories["COMMAND"]
+    async_autocommit_session_factory = autocommit_session_factories["QUERY"]
+    # its own pool, so the long lived listener does not hold a slot of a workload pool
+    broadcast_engine = create_pooled_engine(
+        settings.db_settings.url, settings.db_settings.broadcast_pool
+    ).execution_options(isolation_level="AUTOCOMMIT")
+    # replicas only ever serve the query workload
+    replica_engines = [
+        create_pooled_engine(replica_url, settings.db_settings.workload_pools["QUERY"]).execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        for replica_url in settings.db_settings.replica_urls
+    ]
     start_mappers()
+
+
+def get_pools() -> dict[str, InstrumentedQueuePool]:
+    pools: dict[str, InstrumentedQueuePool] = {}
+    for workload, workload_engine in workload_engines.items():
+        pools[workload.lower()] = workload_engine.sync_engine.pool  # type: ignore
+    if broadcast_engine is not None:
+        pools["broadcast"] = broadcast_engine.sync_engine.pool  # type: ignore
+    for i, replica_engine in enumerate(replica_engines):
+        pools[f"replica_{i}"] = replica_engine.sync_engine.pool  # type: ignore
+    return pools
@@ -0,0 +1,68 @@
+import time
+from typing import Any
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.utils.metrics import Histogram
+
+WAIT_INFO_KEY = "checkout_wait_ms"
+# weight of the newest wait in the moving average the admission check looks at
+RECENT_WAIT_ALPHA = 0.2
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkout_ms = Histogram()
+        self.wait_ms = Histogram()
+        self.pre_ping_ms = Histogram()
+        self.recent_wait_ms = 0.0
+
+    def observe_checkout(self, wait_ms: float, total_ms: float, pre_ping: bool):
+        self.checkout_ms.observe(total_ms)
+        self.wait_ms.observe(wait_ms)
+        if pre_ping:
+            # everything after the queue hands out a connection is the liveness ping
+            self.pre_ping_ms.observe(max(0.0, total_ms - wait_ms))
+        self.recent_wait_ms += RECENT_WAIT_ALPHA * (wait_ms - self.recent_wait_ms)
+
+
+# queue pool that times every checkout, split into waiting for a connection and pinging it
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        record = super()._do_get()  # type: ignore
+        record.info[WAIT_INFO_KEY] = (time.perf_counter() - start) * 1000
+        return record
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        connection = super().connect()
+        total_ms = (time.perf_counter() - start) * 1000
+        wait_ms = connection.info.pop(WAIT_INFO_KEY, 0.0)
+        self.metrics.observe_checkout(wait_ms=wait_ms, total_ms=total_ms, pre_ping=self._pre_ping)  # type: ignore
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics  # type: ignore
+        return pool  # type: ignore
+
+    def saturated(self) -> bool:
+        # no idle connection left and no overflow connection may be opened
+        return self.checkedin() == 0 and self.overflow() >= self._max_overflow  # type: ignore
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size(),
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "recent_wait_ms": self.metrics.recent_wait_ms,
+            "checkout_ms": self.metrics.checkout_ms.snapshot(),
+            "wait_ms": self.metrics.wait_ms.snapshot(),
+            "pre_ping_ms": self.metrics.pre_ping_ms.snapshot(),
+        }
@@ -2,35 +2,72 @@ import ast
 import sys
 from base64 import b64encode
 from datetime import timedelta
+from functools import cached_property
 from typing import Literal
 
 from decouple import config  # type: ignore
-from pydantic import SecretStr
+from pydantic import BaseModel, SecretStr
 from pydantic_settings import BaseSettings
 
 if not config("STAGE"):
     raise Exception("STAGE is not defined")
 
 
+Workload = Literal["AUTH", "COMMAND", "QUERY", "LOGGING"]
+
+
+class PoolSettings(BaseModel):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+
+
 class DBSettings(BaseSettings):
     db_server: str = config("DB_SERVER")
     db_user: str = config("DB_USER")
     db_password: SecretStr = SecretStr(config("DB_PASSWORD"))
     db_name: str = config("DB_NAME")
     db_port: int = config("DB_PORT")
-    pool_size: int = 10
-    max_overflow: int = 10
+    # one pool per workload so a burst of one kind of work (e.g. count queries) can not starve the others
+    workload_pools: dict[Workload, PoolSettings] = {
+        "AUTH": PoolSettings(pool_size=5, max_overflow=5, pool_timeout=5),
+        "COMMAND": PoolSettings(pool_size=10, max_overflow=10, pool_timeout=30),
+        "QUERY": PoolSettings(pool_size=10, max_overflow=10, pool_timeout=10),
+        "LOGGING": PoolSettings(pool_size=2, max_overflow=2, pool_timeout=5),
+    }
+    # cache invalidation broadcasts, one connection stays checked out for LISTEN and one is reused for NOTIFY
+    broadcast_pool: PoolSettings = PoolSettings(pool_size=2, max_overflow=0, pool_timeout=5)
+    # requests are rejected while the pool is exhausted and checkouts have recently waited longer than this
+    admission_wait_budget_ms: float = 250
+    pool_metrics_log_seconds: int = 60
+    # "host" or "host:port" of streaming replicas, they share the primary's credentials and database name
+    db_replica_servers: list[str] = ast.literal_eval(config("DB_REPLICA_SERVERS", default="[]"))
+    replica_policy: Literal["ROUND_ROBIN", "LEAST_BUSY"] = "ROUND_ROBIN"
+    replica_max_lag_seconds: float = 5
+    replica_health_check_seconds: int = 10
+    read_your_writes_seconds: int = 5
 
-    @property
-    def url(self) -> str:
+    def _url(self, server: str, port: int) -> str:
         return "postgresql+asyncpg://{}:{}@{}:{}/{}".format(
             self.db_user,
             self.db_password.get_secret_value(),
-            self.db_server,
-            self.db_port,
+            server,
+            port,
             self.db_name,
         )
 
+    @property
+    def url(self) -> str:
+        return self._url(server=self.db_server, port=self.db_port)
+
+    @property
+    def replica_urls(self) -> list[str]:
+        urls: list[str] = []
+        for replica in self.db_replica_servers:
+            server, _, port = replica.partition(":")
+            urls.append(self._url(server=server, port=int(port) if port else self.db_port))
+        return urls
+
 
 class JWTSettings(BaseSettings):
     raw_secret_key: SecretStr = SecretStr(config("RAW_SECRET_KEY"))
@@ -44,18 +81,92 @@ class JWTSettings(BaseSettings):
     refresh_expiration_delta: timedelta = timedelta(days=15)
     allow_refresh: bool = True
     access_toke_expire_minutes: int = 60 * 24 * 8
+    claims_max_staleness: timedelta = timedelta(minutes=5)
+    revalidate_stale_claims: bool = True
+    token_cache_size: int = 10000
+    revocation_capacity: int = 100_000
+    revocation_error_rate: float = 0.001
+    revocation_refresh_seconds: int = 30
 
-    @property
+    @cached_property
     def secret_key(self):
         return SecretStr(b64encode(self.raw_secret_key.get_secret_value().encode()).decode())
 
 
+class HasherSettings(BaseSettings):
+    backend: Literal["THREAD", "PROCESS"] = "THREAD"
+    max_workers: int = 4
+    max_queue_size: int = 64
+    time_cost: int = 3
+    memory_cost: int = 65536
+    parallelism: int = 4
+    memory_budget_kib: int = 65536 * 8
+    calibrate_on_startup: bool = False
+    target_latency_ms: float = 250
+
+
+class SearchSettings(BaseSettings):
+    backend: Literal["TRIGRAM", "LIKE", "NGRAM"] = "TRIGRAM"
+    min_pattern_length: int = 3
+    ngram_max_candidates: int = 10000
+
+
+class CacheSettings(BaseSettings):
+    user_cache_size: int = 10000
+    user_cache_ttl_seconds: float = 60
+    invalidation_backend: Literal["POSTGRES", "LOOPBACK"] = "POSTGRES"
+    invalidation_channel: str = "cache_invalidation"
+
+
+class OutboxSettings(BaseSettings):
+    # when disabled events are handled inline, inside the request that raised them
+    enabled: bool = True
+    # run a dispatcher inside every api process, turn off when a standalone outbox worker is deployed
+    dispatch_in_process: bool = True
+    batch_size: int = 100
+    poll_interval_seconds: float = 1.0
+    max_attempts: int = 5
+    # a claimed message is handed to another dispatcher once its lease runs out without an outcome
+    lease_seconds: float = 300
+    # processed messages are kept this long for inspection, then purged
+    retention_hours: float = 72
+    purge_interval_minutes: float = 60
+
+
+class MessageBusSettings(BaseSettings):
+    # SEQUENTIAL stops at the first failing handler, CONCURRENT runs every handler of an event and logs each failure
+    event_dispatch: Literal["SEQUENTIAL", "CONCURRENT"] = "SEQUENTIAL"
+    event_concurrency: int = 10
+    event_handler_timeout_seconds: float = 30
+
+
+class FailedMessageLogSettings(BaseSettings):
+    # when buffered, failures are written in batches by a background task instead of inside the failing request
+    buffered: bool = True
+    buffer_capacity: int = 10000
+    flush_batch_size: int = 500
+    flush_interval_seconds: float = 1.0
+    # repeats of the same failure within one window are counted on a single row
+    dedup_window_seconds: int = 60
+    # the table is partitioned by month, a scheduled job keeps premake_months of partitions ahead
+    # and drops partitions older than retention_months
+    premake_months: int = 2
+    retention_months: int = 3
+    partition_maintenance_hours: float = 6
+
+
 class Settings(BaseSettings):
     stage: Literal["LOCAL", "TEST", "DEV", "STAGE", "PROD"] = config("STAGE")
     is_ci: bool = False
     timezone: str = "Asia/Seoul"
     db_settings: DBSettings = DBSettings()
     jwt_settings: JWTSettings = JWTSettings()
+    hasher_settings: HasherSettings = HasherSettings()
+    search_settings: SearchSettings = SearchSettings()
+    cache_settings: CacheSettings = CacheSettings()
+    outbox_settings: OutboxSettings = OutboxSettings()
+    message_bus_settings: MessageBusSettings = MessageBusSettings()
+    failed_message_log_settings: FailedMessageLogSettings = FailedMessageLogSettings()
     test_url: str = "http://test"
     api_v1_str: str = "/api/v1"
     api_v1_login_url: str = "/api/v1/login"
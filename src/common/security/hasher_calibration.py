@@ -0,0 +1,81 @@
+import statistics
+import time
+from dataclasses import dataclass
+
+from argon2 import PasswordHasher
+
+# OWASP minimum recommendation for argon2id is 19 MiB of memory with a time cost of 2
+MIN_MEMORY_COST = 19456
+MIN_TIME_COST = 2
+
+
+@dataclass(frozen=True)
+class CalibrationResult:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    p50_ms: float
+    p99_ms: float
+
+    def to_hasher(self) -> PasswordHasher:
+        return PasswordHasher(
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism,
+        )
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def benchmark(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> CalibrationResult:
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    durations: list[float] = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash(password="calibration-password")
+        durations.append((time.perf_counter() - start) * 1000)
+    return CalibrationResult(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        p50_ms=statistics.median(durations),
+        p99_ms=percentile(durations, 99),
+    )
+
+
+def candidate_memory_costs(max_memory_cost: int) -> list[int]:
+    memory_costs = [MIN_MEMORY_COST]
+    memory_cost = 32768
+    while memory_cost <= max_memory_cost:
+        memory_costs.append(memory_cost)
+        memory_cost *= 2
+    return memory_costs
+
+
+# benchmarks argon2 on this host and picks the most expensive parameters whose p99 stays within the target,
+# returns the selected parameters together with every measured parameter set
+def calibrate(
+    target_latency_ms: float,
+    max_memory_cost: int,
+    parallelism: int,
+    samples: int = 5,
+    max_time_cost: int = 10,
+) -> tuple[CalibrationResult, list[CalibrationResult]]:
+    measured: list[CalibrationResult] = []
+    selected: CalibrationResult | None = None
+    for memory_cost in candidate_memory_costs(max_memory_cost=max_memory_cost):
+        for time_cost in range(MIN_TIME_COST, max_time_cost + 1):
+            result = benchmark(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism, samples=samples)
+            measured.append(result)
+            if result.p99_ms > target_latency_ms:
+                break
+            if selected is None or time_cost * memory_cost >= selected.time_cost * selected.memory_cost:
+                selected = result
+    if selected is None:
+        # nothing fits the target, fall back to the cheapest parameters that are still considered safe
+        selected = measured[0]
+    return selected, measured
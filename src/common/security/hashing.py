@@ -0,0 +1,180 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Literal
+
+from argon2 import PasswordHasher
+
+from src.common.configs.settings import settings
+from src.common.security.hasher_calibration import calibrate
+
+
+class HasherOverloaded(Exception): ...
+
+
+def _hash(hasher: PasswordHasher, password: str) -> str:
+    return hasher.hash(password=password)
+
+
+def _verify(hasher: PasswordHasher, hash: str, password: str) -> bool:
+    return hasher.verify(hash=hash, password=password)
+
+
+# argon2 is cpu and memory heavy, run it off the event loop and reject work instead of queueing forever
+class AsyncPasswordHasher:
+    def __init__(
+        self,
+        hasher: PasswordHasher,
+        executor: Executor,
+        max_workers: int,
+        max_queue_size: int,
+    ):
+        self.hasher = hasher
+        self.executor = executor
+        self.max_pending = max_workers + max_queue_size
+        self.pending = 0
+        self.successor: AsyncPasswordHasher | None = None
+        # admission happens on the event loop, retirement on whichever thread reconfigures the hasher
+        self.lock = threading.Lock()
+
+    def _admit(self, count: int) -> "AsyncPasswordHasher | None":
+        # returns the hasher to forward to once this one is retired, otherwise takes count slots
+        with self.lock:
+            if self.successor is not None:
+                return self.successor
+            if self.pending + count > self.max_pending:
+                raise HasherOverloaded("too many password hashing operations in progress")
+            self.pending += count
+            return None
+
+    def _release(self, count: int):
+        with self.lock:
+            self.pending -= count
+            drained = self.successor is not None and self.pending == 0
+        if drained:
+            # the last admitted job has already returned, there is nothing left to wait for
+            self.executor.shutdown(wait=False)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        successor = self._admit(1)
+        if successor is not None:
+            return await successor._run(func, *args)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, self.hasher, *args))
+        finally:
+            self._release(1)
+
+    async def _run_many(self, func: Callable[..., Any], args: list[tuple[Any, ...]]) -> list[Any]:
+        # every item of a batch is its own executor job, so every item takes a slot, all or nothing
+        successor = self._admit(len(args))
+        if successor is not None:
+            return await successor._run_many(func, args)
+        try:
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(
+                *[loop.run_in_executor(self.executor, partial(func, self.hasher, *arg)) for arg in args]
+            )
+        finally:
+            self._release(len(args))
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        return await self._run_many(_hash, [(password,) for password in passwords])
+
+    async def verify(self, hash: str, password: str) -> bool:
+        return await self._run(_verify, hash, password)
+
+    def check_needs_rehash(self, hash: str) -> bool:
+        return self.hasher.check_needs_rehash(hash=hash)
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+    # callers may still hold this hasher after it is replaced, jobs already admitted finish on its executor and
+    # anything submitted later is forwarded to the successor. the executor shuts down once the last job returns
+    def retire(self, successor: "AsyncPasswordHasher"):
+        with self.lock:
+            self.successor = successor
+            drained = self.pending == 0
+        if drained:
+            self.shutdown()
+
+
+def executor_factory(backend: Literal["THREAD", "PROCESS"], max_workers: int) -> Executor:
+    if backend == "PROCESS":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+
+
+def max_concurrent_hashes(memory_budget_kib: int, memory_cost: int) -> int:
+    return max(1, memory_budget_kib // memory_cost)
+
+
+def async_password_hasher_factory(
+    backend: Literal["THREAD", "PROCESS"],
+    max_workers: int,
+    max_queue_size: int,
+    memory_budget_kib: int | None = None,
+    hasher: PasswordHasher | None = None,
+) -> AsyncPasswordHasher:
+    hasher = hasher or PasswordHasher()
+    if memory_budget_kib is not None:
+        # every running hash holds memory_cost KiB, so the worker count is what bounds total memory use
+        max_workers = min(max_workers, max_concurrent_hashes(memory_budget_kib, hasher.memory_cost))
+    return AsyncPasswordHasher(
+        hasher=hasher,
+        executor=executor_factory(backend=backend, max_workers=max_workers),
+        max_workers=max_workers,
+        max_queue_size=max_queue_size,
+    )
+
+
+password_hasher: AsyncPasswordHasher | None = None
+
+
+def configure_password_hasher(hasher: PasswordHasher) -> AsyncPasswordHasher:
+    global password_hasher
+    previous = password_hasher
+    password_hasher = async_password_hasher_factory(
+        backend=settings.hasher_settings.backend,
+        max_workers=settings.hasher_settings.max_workers,
+        max_queue_size=settings.hasher_settings.max_queue_size,
+        memory_budget_kib=settings.hasher_settings.memory_budget_kib,
+        hasher=hasher,
+    )
+    # swapped before the old one is retired, so no new request can pick up a hasher that is shutting down
+    if previous is not None:
+        previous.retire(successor=password_hasher)
+    return password_hasher
+
+
+def calibrate_password_hasher() -> AsyncPasswordHasher:
+    selected, _ = calibrate(
+        target_latency_ms=settings.hasher_settings.target_latency_ms,
+        max_memory_cost=min(settings.hasher_settings.memory_cost, settings.hasher_settings.memory_budget_kib),
+        parallelism=settings.hasher_settings.parallelism,
+    )
+    return configure_password_hasher(hasher=selected.to_hasher())
+
+
+def get_password_hasher() -> AsyncPasswordHasher:
+    if password_hasher is None:
+        return configure_password_hasher(
+            hasher=PasswordHasher(
+                time_cost=settings.hasher_settings.time_cost,
+                memory_cost=settings.hasher_settings.memory_cost,
+                parallelism=settings.hasher_settings.parallelism,
+            )
+        )
+    return password_hasher
+
+
+def shutdown_password_hasher():
+    global password_hasher
+    if password_hasher is not None:
+        password_hasher.shutdown()
+        password_hasher = None
@@ -0,0 +1,59 @@
+import hashlib
+import math
+from datetime import datetime
+from typing import Iterable
+
+from src.common.configs.settings import settings
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        # double hashing: derive every position from two independent 64 bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+# in process snapshot of revoked jtis, a miss means the token is not revoked (as of the last refresh),
+# a hit has to be confirmed against the revoked_token table because of false positives
+class RevocationList:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom_filter = BloomFilter(capacity=capacity, error_rate=error_rate)
+        self.added_since_refresh: set[str] = set()
+        self.refreshed_at: datetime | None = None
+
+    def replace(self, jtis: Iterable[str]):
+        bloom_filter = BloomFilter(capacity=self.capacity, error_rate=self.error_rate)
+        # keep local revocations that may have been committed after the snapshot was read
+        for jti in [*jtis, *self.added_since_refresh]:
+            bloom_filter.add(jti)
+        self.bloom_filter = bloom_filter
+        self.added_since_refresh = set()
+        self.refreshed_at = datetime.now()
+
+    def add(self, jti: str):
+        self.bloom_filter.add(jti)
+        self.added_since_refresh.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        return jti in self.bloom_filter
+
+
+revocation_list = RevocationList(
+    capacity=settings.jwt_settings.revocation_capacity,
+    error_rate=settings.jwt_settings.revocation_error_rate,
+)
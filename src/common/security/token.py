@@ -1,3 +1,5 @@
+import hashlib
+import time
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
@@ -6,6 +8,7 @@ import jwt
 from pydantic import BaseModel
 
 from src.common.configs.settings import settings
+from src.utils.cache import TTLCache
 
 
 class TokenExpired(Exception): ...
@@ -46,15 +49,31 @@ def create_jwt_token(
     )
 
 
+token_cache: TTLCache[str, Token] = TTLCache(max_size=settings.jwt_settings.token_cache_size)
+
+
+def _token_digest(token: str, key: str) -> str:
+    # the key is part of the digest so rotating the secret never serves tokens signed with the old one
+    return hashlib.sha256(f"{key}:{token}".encode()).hexdigest()
+
+
 def validate_jwt_token(token: str):
+    key = settings.jwt_settings.secret_key.get_secret_value()
+    digest = _token_digest(token=token, key=key)
+    cached = token_cache.get(digest)
+    if cached is not None:
+        return cached
     try:
         decoded_token = jwt.decode(
             jwt=token,
-            key=settings.jwt_settings.secret_key.get_secret_value(),
+            key=key,
             algorithms=[settings.jwt_settings.algorithm],
         )
-        return Token(**decoded_token)
+        validated = Token(**decoded_token)
     except jwt.ExpiredSignatureError:
         raise TokenExpired("token has expired")
     except Exception as e:
         raise InvalidToken(f"token is invalid: {str(e)}")
+    if validated.exp > time.time():
+        token_cache.set(digest, validated, expires_at=validated.exp)
+    return validated
@@ -1,12 +1,21 @@
 from typing import Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class Command(BaseModel): ...
 
 
-class Event(BaseModel): ...
+class Event(BaseModel):
+    # set once the event is written to the outbox, its durable handlers then run in the outbox dispatcher
+    _outboxed: bool = PrivateAttr(default=False)
+
+    @property
+    def outboxed(self) -> bool:
+        return self._outboxed
+
+    def mark_outboxed(self):
+        self._outboxed = True
 
 
 Message = Union[Command, Event]
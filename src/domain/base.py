@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Literal
@@ -34,3 +35,70 @@ class FailedMessageLog(Base):
     message_type: Literal["COMMAND", "EVENT"] = field(default="EVENT")
     message_name: str = field(default="")
     error_message: str = field(default="")
+    # one row per fingerprint per window, repeats of the same failure only bump occurrences and last_seen_date
+    fingerprint: str = field(default="")
+    window_start_date: datetime | None = field(default=None)
+    occurrences: int = field(default=1)
+    first_seen_date: datetime = field(default_factory=datetime.now)
+    last_seen_date: datetime = field(default_factory=datetime.now)
+    # the message of the first occurrence in the window, with sensitive fields redacted
+    payload: dict[str, Any] | None = field(default=None)
+
+    @classmethod
+    def create(
+        cls,
+        message_type: Literal["COMMAND", "EVENT"],
+        message_name: str,
+        error_message: str,
+        window_seconds: int,
+        payload: dict[str, Any] | None = None,
+    ) -> "FailedMessageLog":
+        now = datetime.now()
+        timestamp = int(now.timestamp())
+        fingerprint = hashlib.sha1(f"{message_type}:{message_name}:{error_message}".encode()).hexdigest()
+        window_start_date = datetime.fromtimestamp(timestamp - timestamp % window_seconds)
+        return cls(
+            # the table is partitioned on create_date, pinning it to the window start keeps every repeat in one row
+            create_date=window_start_date,
+            message_type=message_type,
+            message_name=message_name,
+            error_message=error_message,
+            fingerprint=fingerprint,
+            window_start_date=window_start_date,
+            first_seen_date=now,
+            last_seen_date=now,
+            payload=redact(payload) if payload is not None else None,
+        )
+
+    @property
+    def dedup_key(self) -> tuple[str, datetime | None]:
+        return self.fingerprint, self.window_start_date
+
+    def merge(self, other: "FailedMessageLog"):
+        self.occurrences += other.occurrences
+        self.first_seen_date = min(self.first_seen_date, other.first_seen_date)
+        self.last_seen_date = max(self.last_seen_date, other.last_seen_date)
+
+
+SENSITIVE_FIELDS = ("password", "token", "secret")
+
+
+def redact(payload: Any) -> Any:
+    if isinstance(payload, dict):
+        return {
+            key: "[REDACTED]" if any(x in key.lower() for x in SENSITIVE_FIELDS) else redact(value)
+            for key, value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [redact(x) for x in payload]
+    return payload
+
+
+@dataclass(repr=True, eq=False)
+class OutboxMessage(Base):
+    message_name: str = field(default="")
+    payload: dict[str, Any] = field(default_factory=dict)
+    attempts: int = field(default=0)
+    last_error: str | None = field(default=None)
+    processed_date: datetime | None = field(default=None)
+    lease_expire_date: datetime | None = field(default=None)
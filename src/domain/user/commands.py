@@ -7,6 +7,10 @@ class CreateUser(Command):
     password: str
 
 
+class CreateUsers(Command):
+    users: list[CreateUser]
+
+
 class UpdateUser(Command):
     id: str
     phone: str
@@ -11,6 +11,12 @@ class UserOut(BaseModel):
     email: str
 
 
+class UserClaims(BaseModel):
+    id: str
+    phone: str
+    email: str
+
+
 class UserSearchParams(BaseModel):
     phone: str | None = Field(None)
     email: str | None = Field(None)
@@ -1,13 +1,22 @@
 from dataclasses import dataclass, field
+from datetime import datetime
 
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
+from src.common.security.hashing import AsyncPasswordHasher
 from src.domain.base import Base
 from src.domain.user.dto import UserOut
 from src.domain.user.enums import FeatureAuthorizations, UserType
 
 
+async def averify_password(hashed_password: str, password: str, hasher: AsyncPasswordHasher) -> bool:
+    try:
+        return await hasher.verify(hash=hashed_password, password=password)
+    except VerifyMismatchError:
+        return False
+
+
 @dataclass(repr=True, eq=False)
 class User(Base):
     phone: str = field(default="")
@@ -20,15 +29,33 @@ class User(Base):
     def create(cls, phone: str, email: str, password: str, hasher: PasswordHasher) -> "User":
         return cls(phone=phone, email=email, password=hasher.hash(password=password))
 
+    @classmethod
+    async def acreate(cls, phone: str, email: str, password: str, hasher: AsyncPasswordHasher) -> "User":
+        return cls(phone=phone, email=email, password=await hasher.hash(password=password))
+
+    @classmethod
+    async def acreate_many(cls, users: list[tuple[str, str, str]], hasher: AsyncPasswordHasher) -> list["User"]:
+        hashed_passwords = await hasher.hash_many(passwords=[password for _, _, password in users])
+        return [
+            cls(phone=phone, email=email, password=hashed_password)
+            for (phone, email, _), hashed_password in zip(users, hashed_passwords)
+        ]
+
     def verify(self, password: str, hasher: PasswordHasher) -> bool:
         try:
             return hasher.verify(hash=self.password, password=password)
         except VerifyMismatchError:
             return False
 
+    async def averify(self, password: str, hasher: AsyncPasswordHasher) -> bool:
+        return await averify_password(hashed_password=self.password, password=password, hasher=hasher)
+
     def update_password(self, password: str, hasher: PasswordHasher):
         self.password = hasher.hash(password=password)
 
+    async def aupdate_password(self, password: str, hasher: AsyncPasswordHasher):
+        self.password = await hasher.hash(password=password)
+
     def to_dto(self):
         return UserOut(
             id=self.id,
@@ -39,8 +66,27 @@ class User(Base):
         )
 
 
+# projection of the columns needed to authenticate, loaded without the full entity and its mapper state
+@dataclass(frozen=True)
+class UserCredentials:
+    id: str
+    email: str
+    phone: str
+    password: str
+
+    async def averify(self, password: str, hasher: AsyncPasswordHasher) -> bool:
+        return await averify_password(hashed_password=self.password, password=password, hasher=hasher)
+
+
 @dataclass(repr=True, eq=False)
 class AuthorizedFeatures(Base):
     user_id: str = field(default="")
     user: User = field(init=False)
     feature: str = field(default=FeatureAuthorizations.NONE.value)
+
+
+@dataclass(repr=True, eq=False)
+class RevokedToken(Base):
+    jti: str = field(default="")
+    user_id: str = field(default="")
+    expire_date: datetime = field(default_factory=datetime.now)
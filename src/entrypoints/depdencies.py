@@ -1,9 +1,12 @@
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import Depends, Security
+from fastapi import Depends, HTTPException, Security
+from starlette import status
 
+from src.common.configs.settings import settings
 from src.common.security.token import Token
-from src.domain.user.dto import UserOut
+from src.domain.user.dto import UserClaims, UserOut
 from src.entrypoints.dto import PaginationParams
 from src.entrypoints.security import get_token
 from src.service_layer.message_bus import MessageBus, get_message_bus
@@ -31,3 +34,20 @@ async def get_current_user(
 
 
 GetCurrentUser = Annotated[UserOut, Security(get_current_user)]
+
+
+async def get_current_user_from_claims(
+    token: GetToken,
+    user_query_service: UserQueryServiceDep,
+) -> UserClaims:
+    # trust the verified claims while they are fresh, so identity costs no database round trip
+    issued_at = datetime.fromtimestamp(token.iat)
+    if datetime.now() - issued_at <= settings.jwt_settings.claims_max_staleness:
+        return UserClaims(id=token.sub, email=token.email, phone=token.phone)
+    if not settings.jwt_settings.revalidate_stale_claims:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="token claims are stale")
+    user: UserOut = await user_query_service.get_one_or_raise(ident=token.sub)
+    return UserClaims(id=user.id, email=user.email, phone=user.phone)
+
+
+GetCurrentUserClaims = Annotated[UserClaims, Security(get_current_user_from_claims)]
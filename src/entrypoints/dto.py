@@ -1,11 +1,15 @@
-from typing import Any
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, Literal
 
 from pydantic import BaseModel
 from pydantic.fields import Field
 from sqlalchemy.sql import Select
 from sqlalchemy.sql.expression import nullslast
 
-from src.entrypoints.exceptions import InvalidSortException
+from src.entrypoints.exceptions import InvalidCursorException, InvalidSortException
+
+CURSOR_TIEBREAKER = "id"
 
 
 class GenericResponse(BaseModel):
@@ -13,9 +17,24 @@ class GenericResponse(BaseModel):
 
 
 class PaginationParams(BaseModel):
-    page: int = Field(1, ge=1)
-    size: int = Field(20, ge=1, le=100)
-    sort: str | None = Field(None)
+    page: int = Field(default=1, ge=1)
+    size: int = Field(default=20, ge=1, le=100)
+    sort: str | None = Field(default=None)
+    mode: Literal["offset", "cursor"] = Field(default="offset")
+    cursor: str | None = Field(default=None)
+    # unset means exact for offset pages and none for cursor pages
+    include_total: Literal["exact", "estimate", "none"] | None = Field(default=None)
+
+    @property
+    def cursor_mode(self) -> bool:
+        return self.mode == "cursor" or self.cursor is not None
+
+    @property
+    def total_mode(self) -> Literal["exact", "estimate", "none"]:
+        if self.include_total is not None:
+            return self.include_total
+        # page N of a cursor walk should cost the same as page 1, so cursor pages are only counted on request
+        return "none" if self.cursor_mode else "exact"
 
     @property
     def offset(self):
@@ -47,9 +66,45 @@ class PaginationParams(BaseModel):
                 raise InvalidSortException(f"invalid sorting parameter: {condition}")
         return ordering
 
+    def get_keyset(self, model, allowed_columns: list[str]) -> tuple[str, bool]:
+        # keyset pagination needs a single sort key, the id is appended as a tiebreaker to make it unique
+        if not self.sort:
+            return CURSOR_TIEBREAKER, True
+        conditions = self.parse_order_by_conditions()
+        if len(conditions) != 1:
+            raise InvalidSortException("cursor pagination supports a single sorting parameter")
+        condition = conditions[0]
+        asc = not condition.startswith("-")
+        condition = condition.lstrip("-")
+        if condition not in allowed_columns or not hasattr(model, condition):
+            raise InvalidSortException(f"invalid sorting parameter for cursor pagination: {condition}")
+        return condition, asc
+
+    def decode_cursor(self) -> tuple[Any, Any] | None:
+        if not self.cursor:
+            return None
+        try:
+            sort_value, tiebreaker_value = json.loads(urlsafe_b64decode(self.cursor.encode()))
+        except Exception:
+            raise InvalidCursorException("invalid cursor")
+        return sort_value, tiebreaker_value
+
+    @staticmethod
+    def encode_cursor(sort_value: Any, tiebreaker_value: Any) -> str:
+        return urlsafe_b64encode(json.dumps([sort_value, tiebreaker_value], default=str).encode()).decode()
+
+
+class Page(BaseModel):
+    items: list[Any] = Field([])
+    total: int | None = Field(None)
+    has_next: bool | None = Field(None)
+    next_cursor: str | None = Field(None)
+
 
 class PaginationOut(BaseModel):
     items: list[Any] = Field([])
-    total: int = Field(0, ge=0)
+    total: int | None = Field(0, ge=0)
     page: int = Field(0, ge=0)
     size: int = Field(5, ge=1, le=100)
+    has_next: bool | None = Field(None)
+    next_cursor: str | None = Field(None)
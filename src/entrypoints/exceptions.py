@@ -1 +1,7 @@
 class InvalidSortException(Exception): ...
+
+
+class InvalidCursorException(Exception): ...
+
+
+class InvalidSearchException(Exception): ...
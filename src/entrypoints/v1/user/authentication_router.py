@@ -4,8 +4,9 @@ from fastapi import APIRouter, Body, Depends
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 from starlette import status
 
-from src.entrypoints.depdencies import AuthServiceDep
-from src.entrypoints.v1.user.dto import LoginSuccess, RefreshRequest, RefreshSuccess
+from src.entrypoints.depdencies import AuthServiceDep, GetToken
+from src.entrypoints.dto import GenericResponse
+from src.entrypoints.v1.user.dto import LoginSuccess, RefreshRequest, RefreshSuccess, RevokeRequest
 
 auth_router = APIRouter()
 
@@ -40,3 +41,17 @@ async def refresh_token(
         grant_type=req.grant_type,
     )
     return RefreshSuccess(token=token)
+
+
+@auth_router.post(
+    "/revoke",
+    response_model=GenericResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def revoke_token(
+    token: GetToken,
+    auth_service: AuthServiceDep,
+    req: Annotated[RevokeRequest, Body()],
+):
+    await auth_service.revoke(user_id=token.sub, token_to_revoke=req.token)
+    return {"success": True}
@@ -33,3 +33,7 @@ class RefreshRequest(BaseModel):
 
 class RefreshSuccess(BaseModel):
     token: str = Field(...)
+
+
+class RevokeRequest(BaseModel):
+    token: str = Field(...)
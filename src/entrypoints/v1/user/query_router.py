@@ -4,6 +4,7 @@ from fastapi import APIRouter, Path
 from fastapi.param_functions import Depends
 from starlette import status
 
+from src.common.configs.settings import settings
 from src.domain.user.dto import UserOut, UserSearchParams
 from src.entrypoints.depdencies import GetToken, PaginationParamDeps, UserQueryServiceDep
 from src.entrypoints.v1.user.dto import UserPaginatedOut
@@ -16,6 +17,11 @@ user_query_router = APIRouter()
     "/users",
     response_model=UserPaginatedOut,
     status_code=status.HTTP_200_OK,
+    description=(
+        "email and phone match anywhere in the value, case insensitively with the TRIGRAM (default) and NGRAM "
+        "search backends. "
+        f"patterns shorter than {settings.search_settings.min_pattern_length} characters are rejected with a 400."
+    ),
 )
 async def paginate_users(
     _: GetToken,
@@ -24,15 +30,17 @@ async def paginate_users(
     pagination_params: PaginationParamDeps,
 ) -> UserPaginatedOut:
     # TODO: add authorization
-    users, total = await query_service.paginate(
+    page = await query_service.paginate(
         search_params=search_params,
         pagination_params=pagination_params,
     )
     return UserPaginatedOut(
-        items=users,
-        total=total,
+        items=page.items,
+        total=page.total,
         page=pagination_params.page,
         size=pagination_params.size,
+        has_next=page.has_next,
+        next_cursor=page.next_cursor,
     )
 
 
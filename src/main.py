@@ -1,14 +1,21 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette import status
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
 
+from src.common.configs import db_config
 from src.common.configs.ap_scheduler_config import background_scheduler
-from src.common.configs.settings import settings
+from src.common.configs.settings import Workload, settings
+from src.common.security.hashing import HasherOverloaded, calibrate_password_hasher, shutdown_password_hasher
+from src.entrypoints.exceptions import InvalidCursorException, InvalidSearchException, InvalidSortException
 from src.entrypoints.v1.router import api_v1_router
+from src.entrypoints.v1.user.authentication_router import auth_router
+from src.service_layer.cache_invalidation import invalidation_broadcaster
 from src.service_layer.exceptions import (
     ConcurrencyException,
     DuplicateRecord,
@@ -17,6 +24,31 @@ from src.service_layer.exceptions import (
     MethodNotFound,
     Unauthorized,
 )
+from src.service_layer.failed_message_log.partitions import maintain_failed_message_log_partitions
+from src.service_layer.failed_message_log.writer import failed_message_log_writer
+from src.service_layer.jobs import bind_event_loop, refresh_revocation_list, schedule_jobs
+from src.service_layer.outbox.dispatcher import outbox_dispatcher
+from src.service_layer.replica_router import replica_router
+from src.service_layer.user.ngram_index import build_user_ngram_index
+from src.service_layer.view import shared_session_scope
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+AUTH_PATHS = {f"{settings.api_v1_str}{route.path}" for route in auth_router.routes}  # type: ignore
+
+
+def start_background_workers():
+    failed_message_log_writer.start()
+    if settings.outbox_settings.enabled and settings.outbox_settings.dispatch_in_process:
+        outbox_dispatcher.start()
+
+
+async def stop_background_workers():
+    await outbox_dispatcher.stop()
+    # after the dispatcher, so failures from its last batch are flushed too
+    await failed_message_log_writer.stop()
+
 
 if settings.is_ci is False:
 
@@ -24,15 +56,33 @@ if settings.is_ci is False:
     async def lifespan(app: FastAPI):
         # startup events
         assert background_scheduler is not None
+        bind_event_loop(asyncio.get_running_loop())
+        await refresh_revocation_list()
+        await replica_router.check_health()
+        # make sure this month's partition exists before anything can fail and need logging
+        await maintain_failed_message_log_partitions()
+        if settings.search_settings.backend == "NGRAM":
+            await build_user_ngram_index()
+        schedule_jobs(background_scheduler)
         background_scheduler.start()
+        await invalidation_broadcaster.start()
+        start_background_workers()
+        if settings.hasher_settings.calibrate_on_startup:
+            await asyncio.to_thread(calibrate_password_hasher)
         yield
         # shutdown events
+        await stop_background_workers()
+        await invalidation_broadcaster.stop()
+        shutdown_password_hasher()
 
 else:
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        start_background_workers()
         yield
+        await stop_background_workers()
+        shutdown_password_hasher()
 
 
 app = FastAPI(
@@ -78,11 +128,33 @@ async def exception_handler(request: Request, call_next):
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"error": "Duplicate record exists", "message": str(e)},
         )
+    except (InvalidSortException, InvalidCursorException) as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"error": "Invalid pagination parameters", "message": str(e)},
+        )
+    except InvalidSearchException as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"error": "Invalid search parameters", "message": str(e)},
+        )
     except ConcurrencyException as e:
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"error": "Concurrency exception", "message": str(e)},
         )
+    except PoolTimeoutError as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": "Service unavailable", "message": str(e)},
+            headers={"Retry-After": "1"},
+        )
+    except HasherOverloaded as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": "Service unavailable", "message": str(e)},
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -90,6 +162,49 @@ async def exception_handler(request: Request, call_next):
         )
 
 
+@app.middleware("http")
+async def share_request_session(request: Request, call_next):
+    # every view opened while handling the request (dependencies included) shares one session, and clients that
+    # just wrote read from the primary for a few seconds so they see their own writes despite replica lag
+    read_from_primary = READ_PRIMARY_COOKIE in request.cookies or READ_PRIMARY_HEADER in request.headers
+    async with shared_session_scope(read_from_primary=read_from_primary):
+        response = await call_next(request)
+    if replica_router.replicas and request.method not in SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=settings.db_settings.read_your_writes_seconds,
+            httponly=True,
+        )
+    return response
+
+
+def get_request_workload(request: Request) -> Workload:
+    if request.url.path in AUTH_PATHS:
+        return "AUTH"
+    if request.method in SAFE_METHODS:
+        return "QUERY"
+    return "COMMAND"
+
+
+@app.middleware("http")
+async def shed_load(request: Request, call_next):
+    # reject up front while the request's pool is exhausted and checkouts are already waiting past the budget,
+    # so queued requests do not all run into the pool timeout
+    pool = db_config.get_pools().get(get_request_workload(request).lower())
+    if (
+        pool is not None
+        and pool.saturated()
+        and pool.metrics.recent_wait_ms > settings.db_settings.admission_wait_budget_ms
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": "Service unavailable", "message": "database connection pool is saturated"},
+            headers={"Retry-After": "1"},
+        )
+    return await call_next(request)
+
+
 app.include_router(api_v1_router)
 
 
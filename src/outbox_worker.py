@@ -0,0 +1,25 @@
+import asyncio
+import logging
+import signal
+
+from src.service_layer.failed_message_log.writer import failed_message_log_writer
+from src.service_layer.outbox.dispatcher import outbox_dispatcher
+
+logger = logging.getLogger(__name__)
+
+
+# standalone outbox dispatcher, run it next to api processes started with OUTBOX dispatch_in_process off
+async def main():
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, lambda: asyncio.ensure_future(outbox_dispatcher.stop()))
+    logger.info("outbox worker started")
+    failed_message_log_writer.start()
+    try:
+        await outbox_dispatcher.run()
+    finally:
+        await failed_message_log_writer.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
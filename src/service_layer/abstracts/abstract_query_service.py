@@ -1,21 +1,31 @@
 import abc
-from typing import Any
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
 
-from src.entrypoints.dto import PaginationParams
+from src.entrypoints.dto import Page, PaginationParams
 from src.service_layer.abstracts.abstract_view import AbstractView
+from src.utils.single_flight import SingleFlight
+
+T = TypeVar("T")
 
 
 class AbstractQueryService(abc.ABC):
     def __init__(
         self,
         view: AbstractView,
+        single_flight: SingleFlight | None = None,
     ):
         self.view = view
+        self.single_flight = single_flight
+
+    async def coalesce(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        if self.single_flight is None:
+            return await func()
+        return await self.single_flight.do(key, func)
 
     @abc.abstractmethod
     async def get_one_or_raise(self, ident: Any) -> Any | None:
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def paginate(self, search_params: Any, pagination_params: PaginationParams) -> tuple[list[Any], int]:
+    async def paginate(self, search_params: Any, pagination_params: PaginationParams) -> Page:
         raise NotImplementedError
@@ -9,12 +9,16 @@ from sqlalchemy.sql import Select
 from src.adapters.abstract_repository import AbstractRepository
 from src.domain import Message
 from src.service_layer.failed_message_log.repository import FailedMessageLogRepository
+from src.service_layer.outbox.repository import OutboxRepository
+from src.service_layer.revoked_token.repository import RevokedTokenRepository
 from src.service_layer.user.repository import UserRepository
 
 
 class AbstractUnitOfWork(abc.ABC):
     user: UserRepository
     failed_message_log: FailedMessageLogRepository
+    revoked_token: RevokedTokenRepository
+    outbox: OutboxRepository
 
     async def __aenter__(self) -> "AbstractUnitOfWork":
         self.session: AsyncSession
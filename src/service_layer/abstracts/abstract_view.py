@@ -1,5 +1,5 @@
 import abc
-from typing import Any, Type
+from typing import Any, AsyncIterator, Hashable, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -11,6 +11,7 @@ from src.adapters.abstract_repository import AbstractRepository
 class AbstractView(abc.ABC):
     user: AbstractRepository
     failed_message_log: AbstractRepository
+    revoked_token: AbstractRepository
 
     async def __aenter__(self) -> "AbstractView":
         self.session: AsyncSession
@@ -28,9 +29,36 @@ class AbstractView(abc.ABC):
             one=one,
         )
 
+    def stream(self, query: Select, batch_size: int) -> AsyncIterator[list[Any]]:
+        return self._stream(query=query, batch_size=batch_size)
+
+    def statement_key(self, query: Select) -> Hashable:
+        return self._statement_key(query=query)
+
     async def get_count(self, query: Any, filters: list) -> int:
         return await self._get_count(query=query, filters=filters)
 
+    async def get_estimated_count(self, query: Any, filters: list) -> int:
+        return await self._get_estimated_count(query=query, filters=filters)
+
+    async def count_and_paginate(
+        self,
+        query: Select,
+        filters: list[Any],
+        ordering: list[Any],
+        offset: int,
+        size: int,
+        scalars: bool,
+    ) -> tuple[int, list[Any]]:
+        return await self._count_and_paginate(
+            query=query,
+            filters=filters,
+            ordering=ordering,
+            offset=offset,
+            size=size,
+            scalars=scalars,
+        )
+
     async def paginate(
         self,
         query: Select,
@@ -49,10 +77,40 @@ class AbstractView(abc.ABC):
             scalars=scalars,
         )
 
+    async def keyset_paginate(
+        self,
+        query: Select,
+        filters: list[Any],
+        sort_column: Any,
+        tiebreaker_column: Any,
+        ascending: bool,
+        after: tuple[Any, Any] | None,
+        size: int,
+        scalars: bool,
+    ):
+        return await self._keyset_paginate(
+            query=query,
+            filters=filters,
+            sort_column=sort_column,
+            tiebreaker_column=tiebreaker_column,
+            ascending=ascending,
+            after=after,
+            size=size,
+            scalars=scalars,
+        )
+
     @abc.abstractmethod
     async def _execute(self, query: str | Select, scalars: bool, one: bool):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def _statement_key(self, query: Select) -> Hashable:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _stream(self, query: Select, batch_size: int) -> AsyncIterator[list[Any]]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def _paginate(
         self,
@@ -65,6 +123,36 @@ class AbstractView(abc.ABC):
     ):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def _keyset_paginate(
+        self,
+        query: Select,
+        filters: list,
+        sort_column: Any,
+        tiebreaker_column: Any,
+        ascending: bool,
+        after: tuple[Any, Any] | None,
+        size: int,
+        scalars: bool,
+    ):
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def _get_count(self, query: Select, filters: list[Any]):
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _get_estimated_count(self, query: Select, filters: list[Any]) -> int:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _count_and_paginate(
+        self,
+        query: Select,
+        filters: list,
+        ordering: list,
+        offset: int,
+        size: int,
+        scalars: bool,
+    ) -> tuple[int, list[Any]]:
+        raise NotImplementedError
@@ -0,0 +1,148 @@
+import abc
+import asyncio
+import json
+import logging
+from typing import Any, Hashable, Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.common.configs import db_config
+from src.common.configs.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+# anything held in process that a write elsewhere can make stale, caches and the in memory search index
+class Invalidatable(Protocol):
+    def pop(self, key: Any) -> Any: ...
+
+    def clear(self) -> None: ...
+
+
+# fans cache evictions out to every worker, each worker subscribes its in process caches by name
+class InvalidationBroadcaster(abc.ABC):
+    def __init__(self):
+        self.caches: dict[str, Invalidatable] = {}
+
+    def subscribe(self, cache_name: str, cache: Invalidatable):
+        self.caches[cache_name] = cache
+
+    def deliver(self, cache_name: str, key: Hashable):
+        cache = self.caches.get(cache_name)
+        if cache is not None:
+            cache.pop(key)
+
+    def clear_all(self):
+        for cache in self.caches.values():
+            cache.clear()
+
+    async def publish(self, cache_name: str, key: str):
+        await self._publish(cache_name=cache_name, key=key)
+
+    async def start(self):
+        await self._start()
+
+    async def stop(self):
+        await self._stop()
+
+    @abc.abstractmethod
+    async def _publish(self, cache_name: str, key: str):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _start(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _stop(self):
+        raise NotImplementedError
+
+
+# single process delivery, used by tests and when there is no database to broadcast through
+class LoopbackBroadcaster(InvalidationBroadcaster):
+    async def _publish(self, cache_name: str, key: str):
+        self.deliver(cache_name=cache_name, key=key)
+
+    async def _start(self): ...
+
+    async def _stop(self): ...
+
+
+# postgres LISTEN/NOTIFY on a dedicated autocommit engine, every worker keeps one connection checked out for
+# listening and sends notifications through another, so neither ever takes a slot from a workload pool
+class PostgresBroadcaster(InvalidationBroadcaster):
+    def __init__(self, engine: AsyncEngine, channel: str):
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        self.connection: AsyncConnection | None = None
+        self.reconnect_task: asyncio.Task | None = None
+        self.stopping = False
+
+    async def _publish(self, cache_name: str, key: str):
+        payload = json.dumps({"cache": cache_name, "key": key})
+        async with self.engine.connect() as connection:
+            await connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str):
+        try:
+            message = json.loads(payload)
+            self.deliver(cache_name=message["cache"], key=message["key"])
+        except (ValueError, KeyError):
+            logger.warning(f"ignoring malformed cache invalidation payload: {payload}")
+
+    def _on_termination(self, connection: Any):
+        # evictions sent while we are not listening are lost, so nothing cached until now can be trusted
+        self.clear_all()
+        if not self.stopping:
+            self.reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _listen(self):
+        self.connection = await self.engine.connect()
+        raw_connection = await self.connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        await driver_connection.add_listener(self.channel, self._on_notification)
+        driver_connection.add_termination_listener(self._on_termination)
+
+    async def _reconnect(self):
+        if self.connection is not None:
+            await self.connection.invalidate()
+            self.connection = None
+        while not self.stopping:
+            try:
+                await self._listen()
+                self.clear_all()
+                return
+            except Exception as e:
+                logger.warning(f"cache invalidation listener failed to reconnect: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _start(self):
+        self.stopping = False
+        await self._listen()
+
+    async def _stop(self):
+        self.stopping = True
+        if self.reconnect_task is not None:
+            self.reconnect_task.cancel()
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+
+
+def invalidation_broadcaster_factory() -> InvalidationBroadcaster:
+    if settings.cache_settings.invalidation_backend == "POSTGRES" and db_config.broadcast_engine is not None:
+        return PostgresBroadcaster(
+            engine=db_config.broadcast_engine,
+            channel=settings.cache_settings.invalidation_channel,
+        )
+    return LoopbackBroadcaster()
+
+
+invalidation_broadcaster = invalidation_broadcaster_factory()
@@ -0,0 +1,118 @@
+import logging
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.common.configs import db_config
+from src.common.configs.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "failed_message_log"
+# catches rows no monthly partition covers, so inserts keep working if maintenance lapses
+DEFAULT_PARTITION_NAME = f"{TABLE_NAME}_default"
+PARTITION_NAME_PATTERN = re.compile(rf"^{TABLE_NAME}_y(\d{{4}})m(\d{{2}})$")
+
+LIST_PARTITIONS_QUERY = f"""
+SELECT child.relname
+FROM pg_inherits
+JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+WHERE parent.relname = '{TABLE_NAME}'
+"""
+
+# held until the maintenance transaction ends, so workers running the job at once plan one after another
+# instead of racing to create and drop the same partitions
+ADVISORY_LOCK_QUERY = f"SELECT pg_advisory_xact_lock(hashtext('{TABLE_NAME}_partitions'))"
+
+STRANDED_MONTHS_QUERY = f"SELECT DISTINCT date_trunc('month', create_dt)::date FROM {DEFAULT_PARTITION_NAME}"
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE_NAME}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    match = PARTITION_NAME_PATTERN.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+# monthly partitions from this month up to premake_months ahead should exist, as should one for every month that
+# has rows stranded in the default partition. partitions whose whole month is older than retention_months are
+# dropped. partitions that do not follow the naming scheme are left alone
+def plan_partitions(
+    existing: list[str],
+    today: date,
+    premake_months: int,
+    retention_months: int,
+    stranded_months: list[date] | None = None,
+) -> tuple[list[date], list[str]]:
+    current = today.replace(day=1)
+    existing_months = {partition_month(name) for name in existing}
+    oldest_kept = add_months(current, -retention_months)
+    wanted = {add_months(current, i) for i in range(premake_months + 1)}
+    wanted.update(month for month in stranded_months or [] if month >= oldest_kept)
+    to_create = sorted(month for month in wanted if month not in existing_months)
+    to_drop = sorted(name for name in existing if (month := partition_month(name)) is not None and month < oldest_kept)
+    return to_create, to_drop
+
+
+async def maintain_failed_message_log_partitions(today: date | None = None):
+    engine = db_config.workload_engines.get("LOGGING")
+    if engine is None:
+        return
+    async with engine.begin() as connection:
+        await connection.execute(text(ADVISORY_LOCK_QUERY))
+        existing = list((await connection.execute(text(LIST_PARTITIONS_QUERY))).scalars().all())
+        stranded_months = list((await connection.execute(text(STRANDED_MONTHS_QUERY))).scalars().all())
+        today = today or datetime.now().date()
+        to_create, to_drop = plan_partitions(
+            existing=existing,
+            today=today,
+            premake_months=settings.failed_message_log_settings.premake_months,
+            retention_months=settings.failed_message_log_settings.retention_months,
+            stranded_months=stranded_months,
+        )
+        for month in to_create:
+            await create_partition(connection=connection, month=month)
+        # dropping a partition removes its rows and indexes at once, no DELETE and no vacuum afterwards
+        for name in to_drop:
+            await connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        oldest_kept = add_months(today.replace(day=1), -settings.failed_message_log_settings.retention_months)
+        await connection.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION_NAME} WHERE create_dt < '{oldest_kept.isoformat()}'")
+        )
+        remaining = (await connection.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION_NAME}"))).scalar_one()
+    if to_create or to_drop:
+        logger.info(
+            f"failed_message_log partitions created: {[partition_name(x) for x in to_create]}, dropped: {to_drop}"
+        )
+    if remaining:
+        logger.error(
+            f"{remaining} failed message logs are outside every monthly partition, in {DEFAULT_PARTITION_NAME}"
+        )
+
+
+# a partition can not be created for a range the default partition holds rows of, so the partition is built as a
+# plain table, the month's rows are moved into it and then it is attached
+async def create_partition(connection: AsyncConnection, month: date):
+    name = partition_name(month)
+    bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    await connection.execute(text(f"CREATE TABLE IF NOT EXISTS {name} (LIKE {TABLE_NAME} INCLUDING DEFAULTS)"))
+    await connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION_NAME} "
+            f"WHERE create_dt >= '{month.isoformat()}' AND create_dt < '{add_months(month, 1).isoformat()}' "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    await connection.execute(text(f"ALTER TABLE {TABLE_NAME} ATTACH PARTITION {name} FOR VALUES {bounds}"))
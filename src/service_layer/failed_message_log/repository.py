@@ -1,9 +1,44 @@
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from src.adapters.sqlalchemy_repository import SqlAlchemyRepository
 from src.domain.base import FailedMessageLog
 
+UPSERT_FIELDS = (
+    "id",
+    "create_date",
+    "message_type",
+    "message_name",
+    "error_message",
+    "fingerprint",
+    "window_start_date",
+    "occurrences",
+    "first_seen_date",
+    "last_seen_date",
+    "payload",
+)
+
 
 class FailedMessageLogRepository(SqlAlchemyRepository[FailedMessageLog]):  # type: ignore
     def __init__(self, session: AsyncSession):
         super(FailedMessageLogRepository, self).__init__(session, FailedMessageLog)
+
+    # one multi row INSERT ... ON CONFLICT, logs that share a fingerprint and window with an existing row
+    # add their occurrences to it instead of inserting another row
+    async def upsert_many(self, logs: list[FailedMessageLog]):
+        if not logs:
+            return
+        table: Any = inspect(FailedMessageLog).local_table
+        insert = postgresql.insert if self.session.bind.dialect.name == "postgresql" else sqlite.insert
+        query = insert(table).values([{x: getattr(log, x) for x in UPSERT_FIELDS} for log in logs])
+        query = query.on_conflict_do_update(
+            index_elements=[table.c.fingerprint, table.c.window_start_date, table.c.create_date],
+            set_={
+                table.c.occurrences: table.c.occurrences + query.excluded.occurrences,
+                table.c.last_seen_date: query.excluded.last_seen_date,
+            },
+        )
+        await self.session.execute(query)
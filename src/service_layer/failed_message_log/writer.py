@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+from src.common.configs.settings import settings
+from src.domain.base import FailedMessageLog
+from src.service_layer import unit_of_work
+from src.service_layer.failed_message_log.repository import FailedMessageLogRepository
+from src.utils.metrics import get_counter
+
+logger = logging.getLogger(__name__)
+
+WRITTEN = get_counter("failed_message_log_writer.written")
+COLLAPSED = get_counter("failed_message_log_writer.collapsed")
+DROPPED = get_counter("failed_message_log_writer.dropped")
+FLUSH_FAILURES = get_counter("failed_message_log_writer.flush_failures")
+
+
+# keeps failure records in a bounded ring buffer and writes them in multi row inserts from a background task,
+# so a failing request never waits on (or adds a transaction to) a database that may be the reason it failed.
+# records with the same fingerprint and window are merged while buffered, so an error storm takes one slot.
+# when the buffer is full the oldest record is dropped, records are best effort by design
+class FailedMessageLogWriter:
+    def __init__(self, capacity: int, batch_size: int, flush_interval_seconds: float):
+        self.buffer: OrderedDict[tuple[str, datetime | None], FailedMessageLog] = OrderedDict()
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.dropped = 0
+        self.collapsed = 0
+        self.written = 0
+        self.flush_failures = 0
+        self.wakeup: asyncio.Event | None = None
+        self.task: asyncio.Task | None = None
+        self.stopping = False
+
+    def _put(self, log: FailedMessageLog, last: bool = True):
+        buffered = self.buffer.get(log.dedup_key)
+        if buffered is not None:
+            buffered.merge(log)
+            self.collapsed += log.occurrences
+            COLLAPSED.inc(log.occurrences)
+            return
+        if len(self.buffer) >= self.capacity:
+            if not last:
+                self.dropped += log.occurrences
+                DROPPED.inc(log.occurrences)
+                return
+            _, oldest = self.buffer.popitem(last=False)
+            self.dropped += oldest.occurrences
+            DROPPED.inc(oldest.occurrences)
+        self.buffer[log.dedup_key] = log
+        if not last:
+            self.buffer.move_to_end(log.dedup_key, last=False)
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def append(self, log: FailedMessageLog):
+        self._put(log)
+        if self.wakeup is not None and len(self.buffer) >= self.batch_size:
+            self.wakeup.set()
+
+    def stats(self) -> dict[str, int]:
+        return dict(
+            buffered=len(self.buffer),
+            written=self.written,
+            collapsed=self.collapsed,
+            dropped=self.dropped,
+            failures=self.flush_failures,
+        )
+
+    async def _write(self, batch: list[FailedMessageLog]):
+        uow = unit_of_work.get_uow(
+            repositories=dict(failed_message_log=FailedMessageLogRepository),
+            workload="LOGGING",
+        )
+        async with uow:
+            await uow.failed_message_log.upsert_many(batch)
+            await uow.commit()
+
+    async def flush(self) -> int:
+        flushed = 0
+        while self.buffer:
+            batch = [self.buffer.popitem(last=False)[1] for _ in range(min(self.batch_size, len(self.buffer)))]
+            try:
+                await self._write(batch)
+            except Exception as e:
+                # put the batch back in front for the next flush, anything that no longer fits counts as dropped
+                self.flush_failures += 1
+                FLUSH_FAILURES.inc()
+                logger.warning(f"failed to write {len(batch)} failed message logs: {e}")
+                for log in reversed(batch):
+                    self._put(log, last=False)
+                break
+            self.written += len(batch)
+            WRITTEN.inc(len(batch))
+            flushed += len(batch)
+        return flushed
+
+    async def run(self):
+        self.wakeup = asyncio.Event()
+        while not self.stopping:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        self.stopping = False
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        self.stopping = True
+        if self.wakeup is not None:
+            self.wakeup.set()
+        if self.task is not None:
+            await self.task
+            self.task = None
+        # whatever was appended after the last pass
+        await self.flush()
+        if self.dropped:
+            logger.warning(f"dropped {self.dropped} failed message logs because the buffer was full")
+
+
+failed_message_log_writer = FailedMessageLogWriter(
+    capacity=settings.failed_message_log_settings.buffer_capacity,
+    batch_size=settings.failed_message_log_settings.flush_batch_size,
+    flush_interval_seconds=settings.failed_message_log_settings.flush_interval_seconds,
+)
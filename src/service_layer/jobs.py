@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Coroutine
+
+from apscheduler.schedulers.base import BaseScheduler  # type: ignore
+from sqlalchemy import delete, select
+
+from src.common.configs import db_config
+from src.common.configs.settings import settings
+from src.common.security.revocation import revocation_list
+from src.domain.user.model import RevokedToken
+from src.service_layer import unit_of_work
+from src.service_layer.failed_message_log.partitions import maintain_failed_message_log_partitions
+from src.service_layer.outbox.repository import OutboxRepository
+from src.service_layer.replica_router import replica_router
+from src.service_layer.revoked_token.repository import RevokedTokenRepository
+from src.utils.metrics import snapshot_counters
+
+logger = logging.getLogger(__name__)
+
+JOB_TIMEOUT_SECONDS = 60
+
+# the background scheduler runs jobs on its own threads, async jobs are handed back to the app's event loop
+# because the engine's connections belong to it
+event_loop: asyncio.AbstractEventLoop | None = None
+
+
+def bind_event_loop(loop: asyncio.AbstractEventLoop):
+    global event_loop
+    event_loop = loop
+
+
+def run_on_event_loop(coroutine_factory: Callable[[], Coroutine[Any, Any, Any]]):
+    if event_loop is None or event_loop.is_closed():
+        logger.warning(f"no event loop bound, skipping {coroutine_factory.__name__}")
+        return
+    future = asyncio.run_coroutine_threadsafe(coroutine_factory(), event_loop)
+    return future.result(timeout=JOB_TIMEOUT_SECONDS)
+
+
+async def refresh_revocation_list():
+    uow = unit_of_work.get_uow(repositories=dict(revoked_token=RevokedTokenRepository), workload="AUTH")
+    async with uow:
+        now = datetime.now()
+        await uow.execute(
+            delete(RevokedToken).where(RevokedToken.expire_date <= now),  # type: ignore
+            scalars=False,
+            one=False,
+        )
+        await uow.commit()
+        jtis: list[str] = await uow.execute(
+            select(RevokedToken.jti).where(RevokedToken.expire_date > now),  # type: ignore
+            scalars=True,
+            one=False,
+        )
+    revocation_list.replace(jtis)
+
+
+async def purge_processed_outbox_messages():
+    uow = unit_of_work.get_uow(repositories=dict(outbox=OutboxRepository))
+    async with uow:
+        before = datetime.now() - timedelta(hours=settings.outbox_settings.retention_hours)
+        purged = await uow.outbox.purge_processed(before=before)
+        await uow.commit()
+    if purged:
+        logger.info(f"purged {purged} processed outbox messages")
+
+
+def refresh_revocation_list_job():
+    run_on_event_loop(refresh_revocation_list)
+
+
+def check_replica_health_job():
+    run_on_event_loop(replica_router.check_health)
+
+
+def maintain_failed_message_log_partitions_job():
+    run_on_event_loop(maintain_failed_message_log_partitions)
+
+
+def purge_processed_outbox_messages_job():
+    run_on_event_loop(purge_processed_outbox_messages)
+
+
+def log_pool_metrics_job():
+    for name, pool in db_config.get_pools().items():
+        logger.info(f"connection pool {name}: {pool.snapshot()}")
+    logger.info(f"counters: {snapshot_counters()}")
+
+
+def schedule_jobs(scheduler: BaseScheduler):
+    scheduler.add_job(
+        refresh_revocation_list_job,
+        "interval",
+        seconds=settings.jwt_settings.revocation_refresh_seconds,
+        id="refresh_revocation_list",
+        jobstore="memory",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        log_pool_metrics_job,
+        "interval",
+        seconds=settings.db_settings.pool_metrics_log_seconds,
+        id="log_pool_metrics",
+        jobstore="memory",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        maintain_failed_message_log_partitions_job,
+        "interval",
+        hours=settings.failed_message_log_settings.partition_maintenance_hours,
+        id="maintain_failed_message_log_partitions",
+        jobstore="memory",
+        replace_existing=True,
+    )
+    if settings.outbox_settings.enabled:
+        scheduler.add_job(
+            purge_processed_outbox_messages_job,
+            "interval",
+            minutes=settings.outbox_settings.purge_interval_minutes,
+            id="purge_processed_outbox_messages",
+            jobstore="memory",
+            replace_existing=True,
+        )
+    if replica_router.replicas:
+        scheduler.add_job(
+            check_replica_health_job,
+            "interval",
+            seconds=settings.db_settings.replica_health_check_seconds,
+            id="check_replica_health",
+            jobstore="memory",
+            replace_existing=True,
+        )
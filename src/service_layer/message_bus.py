@@ -1,15 +1,26 @@
+import asyncio
 from collections import defaultdict, deque
 from typing import Any, Callable, Literal, Type
 
+from src.common.configs.settings import settings
 from src.domain import Command, Event, Message
 from src.domain.base import FailedMessageLog
 from src.domain.user import commands as user_commands
+from src.domain.user import events as user_events
+from src.service_layer import unit_of_work
 from src.service_layer.abstracts.abstract_command_handler import CommandHandler
 from src.service_layer.abstracts.abstract_event_handler import EventHandler
 from src.service_layer.abstracts.abstract_unit_of_work import AbstractUnitOfWork
 from src.service_layer.failed_message_log.repository import FailedMessageLogRepository
-from src.service_layer.unit_of_work import SqlAlchemyUnitOfWork
-from src.service_layer.user.factory import get_user_creation_handler, get_user_delete_handler, get_user_update_handler
+from src.service_layer.failed_message_log.writer import FailedMessageLogWriter, failed_message_log_writer
+from src.service_layer.user.factory import (
+    get_user_bulk_creation_handler,
+    get_user_cache_invalidation_handler,
+    get_user_creation_handler,
+    get_user_delete_handler,
+    get_user_search_index_handler,
+    get_user_update_handler,
+)
 
 
 class MessageBus:
@@ -18,14 +29,27 @@ class MessageBus:
         uow: AbstractUnitOfWork,
         event_handlers: dict[Type[Event], list[Callable[..., EventHandler]]],
         command_handlers: dict[Type[Command], Callable[..., CommandHandler]],
+        local_event_handlers: dict[Type[Event], list[Callable[..., EventHandler]]] | None = None,
+        event_dispatch: Literal["SEQUENTIAL", "CONCURRENT"] = "SEQUENTIAL",
+        event_concurrency: int = 10,
+        event_handler_timeout_seconds: float | None = None,
+        failed_message_log_writer: FailedMessageLogWriter | None = None,
     ) -> None:
         self.queue: deque[Message] = deque()
         self.uow = uow
         self.event_handlers = event_handlers
         self.command_handlers = command_handlers
+        self.local_event_handlers = local_event_handlers or {}
+        self.event_dispatch = event_dispatch
+        self.event_concurrency = event_concurrency
+        self.event_handler_timeout_seconds = event_handler_timeout_seconds
+        self.failed_message_log_writer = failed_message_log_writer
 
     async def handle(self, message: Message) -> Any | None:
         self.queue.appendleft(message)
+        return await self._drain()
+
+    async def _drain(self) -> Any | None:
         res: Any | None = None
 
         while self.queue:
@@ -38,19 +62,35 @@ class MessageBus:
                 raise Exception(f"{message} was not a Command or Event")
         return res
 
-    async def _add_log(self, message_type: Literal["EVENT", "COMMAND"], message_name: str, error_message: str):
+    async def _add_log(self, message_type: Literal["EVENT", "COMMAND"], message: Message, error_message: str):
+        log = FailedMessageLog.create(
+            message_type=message_type,
+            message_name=type(message).__name__,
+            error_message=error_message,
+            window_seconds=settings.failed_message_log_settings.dedup_window_seconds,
+            payload=message.model_dump(mode="json"),
+        )
+        # a writer nobody started would only buffer until it drops, so without a running one the log is written here
+        if self.failed_message_log_writer is not None and self.failed_message_log_writer.running:
+            self.failed_message_log_writer.append(log)
+            return
         async with self.uow:
-            self.uow.failed_message_log.add(
-                FailedMessageLog(
-                    message_type=message_type,
-                    message_name=message_name,
-                    error_message=error_message,
-                )
-            )
+            await self.uow.failed_message_log.upsert_many([log])
             await self.uow.commit()
 
+    def get_event_handlers(self, event: Event) -> list[Callable[..., EventHandler]]:
+        # per process handlers always run here, in the process that committed the change. durable handlers run
+        # here too unless the event went through the outbox, then the dispatcher runs them
+        handlers = list(self.local_event_handlers.get(type(event), []))
+        if not event.outboxed:
+            handlers.extend(self.event_handlers.get(type(event), []))
+        return handlers
+
     async def handle_event(self, event: Event):
-        for handler_factory_func in self.event_handlers[type(event)]:
+        if self.event_dispatch == "CONCURRENT":
+            await self.handle_event_concurrently(event)
+            return
+        for handler_factory_func in self.get_event_handlers(event):
             try:
                 service: EventHandler = handler_factory_func()
                 await service.execute(event=event)
@@ -58,11 +98,63 @@ class MessageBus:
             except Exception as e:
                 await self._add_log(
                     message_type="EVENT",
-                    message_name=type(event).__name__,
+                    message=event,
                     error_message=str(e),
                 )
                 raise e
 
+    async def _run_event_handler(
+        self, handler_factory_func: Callable[..., EventHandler], event: Event, semaphore: asyncio.Semaphore
+    ) -> EventHandler:
+        async with semaphore:
+            service: EventHandler = handler_factory_func()
+            try:
+                await asyncio.wait_for(service.execute(event=event), timeout=self.event_handler_timeout_seconds)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"{type(service).__name__} timed out after {self.event_handler_timeout_seconds} seconds"
+                )
+            return service
+
+    async def handle_event_concurrently(self, event: Event):
+        # handlers of one event are independent, so a failing handler does not stop the others, every failure is
+        # logged and the first one is re-raised once all handlers have finished
+        semaphore = asyncio.Semaphore(self.event_concurrency)
+        results = await asyncio.gather(
+            *(self._run_event_handler(func, event, semaphore) for func in self.get_event_handlers(event)),
+            return_exceptions=True,
+        )
+        errors: list[BaseException] = []
+        follow_ups: deque[Message] = deque()
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+            else:
+                follow_ups.extendleft(result.events)
+        # logged one at a time, the logging unit of work is not safe to share between tasks
+        for error in errors:
+            await self._add_log(
+                message_type="EVENT",
+                message=event,
+                error_message=str(error),
+            )
+        if errors:
+            await self._handle_follow_ups(follow_ups)
+            raise errors[0]
+        self.queue.extendleft(reversed(follow_ups))
+
+    async def _handle_follow_ups(self, follow_ups: deque[Message]):
+        # the handlers that succeeded have already committed, so their follow-up events are handled before the
+        # failure is raised instead of being dropped with the rest of the queue. they get a queue of their own, and
+        # a failure among them is logged by the bus as usual but does not replace the original error
+        queue, self.queue = self.queue, follow_ups
+        try:
+            await self._drain()
+        except Exception:
+            pass
+        finally:
+            self.queue = queue
+
     async def handle_command(self, command: Command):
         try:
             handler_factory_func = self.command_handlers[type(command)]
@@ -73,16 +165,30 @@ class MessageBus:
         except Exception as e:
             await self._add_log(
                 message_type="COMMAND",
-                message_name=type(command).__name__,
+                message=command,
                 error_message=str(e),
             )
             raise e
 
 
+# durable work, delivered through the outbox when it is enabled
 event_handlers: dict[Type[Event], list[Callable[..., EventHandler]]] = defaultdict(list)
 
+unit_of_work.outbox_event_types.update(event_type for event_type, handlers in event_handlers.items() if handlers)
+
+# per process side effects on in memory state, run inline after the commit by the process that made the change,
+# other processes hear about it through the invalidation broadcaster
+local_event_handlers: dict[Type[Event], list[Callable[..., EventHandler]]] = defaultdict(list)
+local_event_handlers[user_events.UserUpdated].append(get_user_cache_invalidation_handler)
+local_event_handlers[user_events.UserDeleted].append(get_user_cache_invalidation_handler)
+
+if settings.search_settings.backend == "NGRAM":
+    for user_event in (user_events.UserCreated, user_events.UserUpdated, user_events.UserDeleted):
+        local_event_handlers[user_event].append(get_user_search_index_handler)
+
 command_handlers: dict[Type[Command], Callable[..., CommandHandler]] = {
     user_commands.CreateUser: get_user_creation_handler,
+    user_commands.CreateUsers: get_user_bulk_creation_handler,
     user_commands.UpdateUser: get_user_update_handler,
     user_commands.DeleteUser: get_user_delete_handler,
 }
@@ -90,7 +196,14 @@ command_handlers: dict[Type[Command], Callable[..., CommandHandler]] = {
 
 def get_message_bus():
     return MessageBus(
-        uow=SqlAlchemyUnitOfWork(repositories=dict(failed_message_log=FailedMessageLogRepository)),
+        uow=unit_of_work.get_uow(repositories=dict(failed_message_log=FailedMessageLogRepository), workload="LOGGING"),
         event_handlers=event_handlers,
         command_handlers=command_handlers,
+        local_event_handlers=local_event_handlers,
+        event_dispatch=settings.message_bus_settings.event_dispatch,
+        event_concurrency=settings.message_bus_settings.event_concurrency,
+        event_handler_timeout_seconds=settings.message_bus_settings.event_handler_timeout_seconds,
+        failed_message_log_writer=(
+            failed_message_log_writer if settings.failed_message_log_settings.buffered else None
+        ),
     )
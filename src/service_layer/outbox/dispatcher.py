@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Type
+
+from src.common.configs.settings import settings
+from src.domain import Command, Event
+from src.domain.base import OutboxMessage
+from src.service_layer import unit_of_work
+from src.service_layer.abstracts.abstract_command_handler import CommandHandler
+from src.service_layer.abstracts.abstract_event_handler import EventHandler
+from src.service_layer.failed_message_log.repository import FailedMessageLogRepository
+from src.service_layer.failed_message_log.writer import FailedMessageLogWriter, failed_message_log_writer
+from src.service_layer.message_bus import MessageBus, command_handlers, event_handlers
+from src.service_layer.outbox.repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+# claims batches of outbox messages and runs their durable event handlers through the message bus, delivery is at
+# least once: a failing message is retried on the next pass and given up on (processed with last_error) after
+# max_attempts, a message whose dispatcher died mid batch is claimed again once its lease expires
+class OutboxDispatcher:
+    def __init__(
+        self,
+        event_handlers: dict[Type[Event], list[Callable[..., EventHandler]]],
+        command_handlers: dict[Type[Command], Callable[..., CommandHandler]],
+        batch_size: int,
+        poll_interval_seconds: float,
+        max_attempts: int,
+        lease_seconds: float,
+        failed_message_log_writer: FailedMessageLogWriter | None = None,
+    ):
+        self.event_handlers = event_handlers
+        self.command_handlers = command_handlers
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.failed_message_log_writer = failed_message_log_writer
+        self.wakeup: asyncio.Event | None = None
+        self.task: asyncio.Task | None = None
+        self.stopping = False
+
+    def get_event_type(self, name: str) -> Type[Event] | None:
+        for event_type in self.event_handlers:
+            if event_type.__name__ == name:
+                return event_type
+        return None
+
+    def notify(self):
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    async def _dispatch(self, message: OutboxMessage) -> dict[str, Any]:
+        event_type = self.get_event_type(message.message_name)
+        try:
+            if event_type is not None:
+                message_bus = MessageBus(
+                    uow=unit_of_work.get_uow(
+                        repositories=dict(failed_message_log=FailedMessageLogRepository),
+                        workload="LOGGING",
+                    ),
+                    event_handlers=self.event_handlers,
+                    command_handlers=self.command_handlers,
+                    event_dispatch=settings.message_bus_settings.event_dispatch,
+                    event_concurrency=settings.message_bus_settings.event_concurrency,
+                    event_handler_timeout_seconds=settings.message_bus_settings.event_handler_timeout_seconds,
+                    failed_message_log_writer=self.failed_message_log_writer,
+                )
+                await message_bus.handle(event_type(**message.payload))
+            return dict(processed_date=datetime.now())
+        except Exception as e:
+            attempts = message.attempts + 1
+            if attempts >= self.max_attempts:
+                logger.error(f"giving up on outbox message {message.id} ({message.message_name}): {e}")
+                return dict(attempts=attempts, last_error=str(e), processed_date=datetime.now())
+            return dict(attempts=attempts, last_error=str(e))
+
+    async def claim(self) -> list[OutboxMessage]:
+        uow = unit_of_work.get_uow(repositories=dict(outbox=OutboxRepository))
+        async with uow:
+            messages = await uow.outbox.claim_pending(batch_size=self.batch_size, lease_seconds=self.lease_seconds)
+            await uow.commit()
+        return messages
+
+    async def record_outcome(self, message: OutboxMessage, outcome: dict[str, Any]):
+        uow = unit_of_work.get_uow(repositories=dict(outbox=OutboxRepository))
+        async with uow:
+            await uow.outbox.update_outcome(ident=message.id, **outcome)
+            await uow.commit()
+
+    async def dispatch_batch(self) -> int:
+        # handlers run outside any transaction, so neither a connection nor a row lock is held while they work,
+        # and each outcome is committed on its own so one failure does not re-run the messages that succeeded
+        messages = await self.claim()
+        for message in messages:
+            outcome = await self._dispatch(message)
+            await self.record_outcome(message=message, outcome=outcome)
+        return len(messages)
+
+    async def run(self):
+        self.wakeup = asyncio.Event()
+        self.stopping = False
+        while not self.stopping:
+            self.wakeup.clear()
+            try:
+                dispatched = await self.dispatch_batch()
+            except Exception as e:
+                logger.exception(f"outbox dispatch failed: {e}")
+                dispatched = 0
+            if dispatched < self.batch_size and not self.stopping:
+                # a full batch means there is probably more waiting, otherwise sleep until a commit or the next poll
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self):
+        unit_of_work.outbox_listeners.append(self.notify)
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        self.stopping = True
+        self.notify()
+        if self.notify in unit_of_work.outbox_listeners:
+            unit_of_work.outbox_listeners.remove(self.notify)
+        if self.task is not None:
+            await self.task
+            self.task = None
+
+
+outbox_dispatcher = OutboxDispatcher(
+    event_handlers=event_handlers,
+    command_handlers=command_handlers,
+    batch_size=settings.outbox_settings.batch_size,
+    poll_interval_seconds=settings.outbox_settings.poll_interval_seconds,
+    max_attempts=settings.outbox_settings.max_attempts,
+    lease_seconds=settings.outbox_settings.lease_seconds,
+    failed_message_log_writer=failed_message_log_writer if settings.failed_message_log_settings.buffered else None,
+)
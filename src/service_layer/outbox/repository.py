@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from src.adapters.sqlalchemy_repository import SqlAlchemyRepository
+from src.domain.base import OutboxMessage
+
+
+class OutboxRepository(SqlAlchemyRepository[OutboxMessage]):  # type: ignore
+    def __init__(self, session: AsyncSession):
+        super(OutboxRepository, self).__init__(session, OutboxMessage)
+
+    async def claim_pending(self, batch_size: int, lease_seconds: float) -> list[OutboxMessage]:
+        # the row locks only last until the claim is committed, the lease is what keeps other dispatchers away
+        # while the handlers run, and hands the message to them if this one dies before recording an outcome
+        now = datetime.now()
+        query = (
+            select(OutboxMessage)
+            .where(
+                OutboxMessage.processed_date.is_(None),  # type: ignore
+                or_(
+                    OutboxMessage.lease_expire_date.is_(None),  # type: ignore
+                    OutboxMessage.lease_expire_date < now,  # type: ignore
+                ),
+            )
+            .order_by(OutboxMessage.create_date)  # type: ignore
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        execution = await self.session.execute(query)
+        messages = list(execution.scalars().all())
+        if messages:
+            await self.session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_([x.id for x in messages]))  # type: ignore
+                .values(lease_expire_date=now + timedelta(seconds=lease_seconds))
+            )
+        return messages
+
+    async def update_outcome(
+        self,
+        ident: str,
+        attempts: int | None = None,
+        last_error: str | None = None,
+        processed_date: datetime | None = None,
+    ):
+        # the lease is released with the outcome, so a failed message is retried on the next pass
+        values = dict(attempts=attempts, last_error=last_error, processed_date=processed_date)
+        query = (
+            update(OutboxMessage)
+            .where(OutboxMessage.id == ident)  # type: ignore
+            .values(
+                lease_expire_date=None,
+                **{key: value for key, value in values.items() if value is not None},
+            )
+        )
+        await self.session.execute(query)
+
+    async def purge_processed(self, before: datetime) -> int:
+        query = delete(OutboxMessage).where(OutboxMessage.processed_date < before)  # type: ignore
+        execution: Any = await self.session.execute(query)
+        return execution.rowcount
@@ -0,0 +1,82 @@
+import itertools
+import logging
+from typing import Callable, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.common.configs import db_config
+from src.common.configs.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# zero when the replica has replayed everything it received, otherwise the age of the last replayed transaction
+REPLICATION_LAG_QUERY = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.session_factory: Callable[[], AsyncSession] = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        self.healthy = True
+        self.lag_seconds = 0.0
+
+    @property
+    def checked_out(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()  # type: ignore
+
+
+# picks the session factory reads go through, replicas that fail their health check or lag behind
+# max_lag_seconds are skipped, and the primary is used when no replica is usable
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary_session_factory: Callable[[], AsyncSession] | None,
+        replicas: list[Replica],
+        policy: Literal["ROUND_ROBIN", "LEAST_BUSY"],
+        max_lag_seconds: float,
+    ):
+        self.primary_session_factory = primary_session_factory
+        self.replicas = replicas
+        self.policy = policy
+        self.max_lag_seconds = max_lag_seconds
+        self.counter = itertools.count()
+
+    def usable_replicas(self) -> list[Replica]:
+        return [x for x in self.replicas if x.healthy and x.lag_seconds <= self.max_lag_seconds]
+
+    def route(self, read_from_primary: bool = False) -> Callable[[], AsyncSession] | None:
+        replicas = [] if read_from_primary else self.usable_replicas()
+        if not replicas:
+            return self.primary_session_factory
+        if self.policy == "LEAST_BUSY":
+            return min(replicas, key=lambda x: x.checked_out).session_factory
+        return replicas[next(self.counter) % len(replicas)].session_factory
+
+    async def check_health(self):
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as connection:
+                    lag = (await connection.execute(text(REPLICATION_LAG_QUERY))).scalar_one()
+                replica.lag_seconds = float(lag)
+                replica.healthy = True
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning(f"replica {replica.engine.url.host} is unhealthy, reading from the primary: {e}")
+                replica.healthy = False
+
+
+replica_router = ReplicaRouter(
+    primary_session_factory=db_config.async_autocommit_session_factory,
+    replicas=[Replica(engine=engine) for engine in db_config.replica_engines],
+    policy=settings.db_settings.replica_policy,
+    max_lag_seconds=settings.db_settings.replica_max_lag_seconds,
+)
@@ -0,0 +1,9 @@
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from src.adapters.sqlalchemy_repository import SqlAlchemyRepository
+from src.domain.user.model import RevokedToken
+
+
+class RevokedTokenRepository(SqlAlchemyRepository[RevokedToken]):  # type: ignore
+    def __init__(self, session: AsyncSession):
+        super(RevokedTokenRepository, self).__init__(session, RevokedToken)
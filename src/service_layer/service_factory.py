@@ -1,17 +1,27 @@
-from argon2 import PasswordHasher  # type: ignore
-
+from src.common.security.hashing import get_password_hasher
 from src.service_layer import unit_of_work, view
+from src.service_layer.revoked_token.repository import RevokedTokenRepository
 from src.service_layer.user.authentication_service import AuthenticationService
+from src.service_layer.user.cache import user_cache, user_single_flight
 from src.service_layer.user.query_service import UserQueryService
 from src.service_layer.user.repository import UserRepository
+from src.service_layer.user.search import get_user_search_backend
 
 
 def get_user_query_service() -> UserQueryService:
-    return UserQueryService(view=view.get_view(repositories=dict(user=UserRepository)))
+    return UserQueryService(
+        view=view.get_view(repositories=dict(user=UserRepository)),
+        search_backend=get_user_search_backend(),
+        cache=user_cache,
+        single_flight=user_single_flight,
+    )
 
 
 def get_auth_service() -> AuthenticationService:
     return AuthenticationService(
-        uow=unit_of_work.get_uow(repositories=dict(user=UserRepository)),
-        hasher=PasswordHasher(),
+        uow=unit_of_work.get_uow(
+            repositories=dict(user=UserRepository, revoked_token=RevokedTokenRepository),
+            workload="AUTH",
+        ),
+        hasher=get_password_hasher(),
     )
@@ -1,32 +1,55 @@
 from collections import deque
-from typing import Any, Type
+from typing import Any, Callable, Collection, Type
 
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.exc import StaleDataError
 
 from src.adapters.abstract_repository import AbstractRepository
+from src.common.configs import db_config
 from src.common.configs.db_config import async_transactional_session_factory
-from src.domain import Message
+from src.common.configs.settings import Workload, settings
+from src.domain import Event, Message
+from src.domain.base import OutboxMessage
 from src.service_layer import exceptions
 from src.service_layer.abstracts.abstract_unit_of_work import AbstractUnitOfWork
 from src.service_layer.failed_message_log.repository import FailedMessageLogRepository
+from src.service_layer.outbox.repository import OutboxRepository
+from src.service_layer.revoked_token.repository import RevokedTokenRepository
 from src.service_layer.user.repository import UserRepository
 
 DEFAULT_TRANSACTIONAL_SESSION_FACTORY = async_transactional_session_factory
 
+UNIQUE_VIOLATION_SQLSTATE = "23505"
+
+# called after a commit wrote outbox messages, lets an in-process dispatcher pick them up without waiting a poll
+outbox_listeners: list[Callable[[], None]] = []
+
+# event types with durable handlers, filled in by the message bus. nothing else is worth an outbox row
+outbox_event_types: set[Type[Event]] = set()
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    sqlstate = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+    return sqlstate == UNIQUE_VIOLATION_SQLSTATE or "UNIQUE constraint failed" in str(error.orig)
+
 
 class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
     def __init__(
         self,
         repositories: dict[str, Type[AbstractRepository]],
         session_factory=DEFAULT_TRANSACTIONAL_SESSION_FACTORY,
+        outbox_event_types: Collection[Type[Event]] = (),
     ):
         self.repositories = repositories
         self.events: deque[Message] = deque()
         self.session_factory = session_factory
+        self.outbox_event_types = outbox_event_types
         self.user: UserRepository | None = None  # type: ignore
         self.failed_message_log: FailedMessageLogRepository | None = None  # type: ignore
+        self.revoked_token: RevokedTokenRepository | None = None  # type: ignore
+        self.outbox: OutboxRepository | None = None  # type: ignore
 
     async def __aenter__(self) -> AbstractUnitOfWork:
         self.session: AsyncSession = self.session_factory()
@@ -40,12 +63,35 @@ class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
         await self.rollback()
         await self.session.close()
 
+    def _write_outbox(self) -> bool:
+        # events go into the same transaction as the changes that raised them, their durable handlers are run by
+        # the dispatcher. they stay queued, marked, so the message bus still runs the per process handlers
+        written = False
+        for message in self.events:
+            if isinstance(message, Event) and not message.outboxed and type(message) in self.outbox_event_types:
+                self.session.add(
+                    OutboxMessage(message_name=type(message).__name__, payload=message.model_dump(mode="json"))
+                )
+                message.mark_outboxed()
+                written = True
+        return written
+
     async def _commit(self):
+        written = bool(self.outbox_event_types) and self._write_outbox()
         try:
             await self.session.commit()
         except StaleDataError:
             await self.session.rollback()
             raise exceptions.ConcurrencyException
+        except IntegrityError as e:
+            # a concurrent insert can still race past the existence check, the unique index has the final say
+            await self.session.rollback()
+            if is_unique_violation(e):
+                raise exceptions.DuplicateRecord(str(e.orig))
+            raise
+        if written:
+            for listener in outbox_listeners:
+                listener()
 
     async def _flush(self):
         await self.session.flush()
@@ -72,5 +118,10 @@ class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
         await self.session.refresh(object)
 
 
-def get_uow(repositories: dict[str, Type[AbstractRepository]]) -> AbstractUnitOfWork:
-    return SqlAlchemyUnitOfWork(repositories=repositories)
+def get_uow(repositories: dict[str, Type[AbstractRepository]], workload: Workload = "COMMAND") -> AbstractUnitOfWork:
+    return SqlAlchemyUnitOfWork(
+        repositories=repositories,
+        session_factory=db_config.transactional_session_factories.get(workload, DEFAULT_TRANSACTIONAL_SESSION_FACTORY),
+        # only command transactions raise events, auth and logging writes never need the outbox
+        outbox_event_types=outbox_event_types if settings.outbox_settings.enabled and workload == "COMMAND" else (),
+    )
@@ -1,9 +1,10 @@
+from datetime import datetime
 from typing import Literal
 
-from argon2 import PasswordHasher
-
 from src.common.security import token
-from src.domain.user.model import User
+from src.common.security.hashing import AsyncPasswordHasher
+from src.common.security.revocation import revocation_list
+from src.domain.user.model import RevokedToken, User, UserCredentials
 from src.service_layer.abstracts.abstract_unit_of_work import AbstractUnitOfWork
 from src.service_layer.exceptions import Forbidden, Unauthorized
 from src.utils.log_utils import logging_decorator
@@ -16,40 +17,43 @@ class AuthenticationService:
     def __init__(
         self,
         uow: AbstractUnitOfWork,
-        hasher: PasswordHasher,
+        hasher: AsyncPasswordHasher,
     ):
         self.uow = uow
         self.hasher = hasher
 
     @logging_decorator(LOG_PATH)
     async def login(self, email: str, password: str) -> tuple[str, str]:
+        # argon2 runs with no session open, so a slow hash never holds an AUTH pool connection
         async with self.uow:
-            user: User | None = await self.uow.user.get_by(email__eq=email)
-            if not user:
-                raise Unauthorized("email of password is incorrect")
+            user: UserCredentials | None = await self.uow.user.get_credentials_by_email(email=email)
+        if not user:
+            raise Unauthorized("email of password is incorrect")
 
-            if not user.verify(password=password, hasher=self.hasher):
-                raise Unauthorized("email of password is incorrect")
+        if not await user.averify(password=password, hasher=self.hasher):
+            raise Unauthorized("email of password is incorrect")
 
-            if self.hasher.check_needs_rehash(hash=user.password):
-                user.update_password(password=password, hasher=self.hasher)
+        if self.hasher.check_needs_rehash(hash=user.password):
+            rehashed = await self.hasher.hash(password=password)
+            async with self.uow:
+                await self.uow.user.update_password(ident=user.id, password=rehashed)
                 await self.uow.commit()
 
-            private_claims = {"email": user.email, "phone": user.phone}
+        private_claims = {"email": user.email, "phone": user.phone}
 
-            access_token = token.create_jwt_token(
-                subject=user.id,
-                private_claims=private_claims,
-                refresh=False,
-            )
+        access_token = token.create_jwt_token(
+            subject=user.id,
+            private_claims=private_claims,
+            refresh=False,
+        )
 
-            refresh_token = token.create_jwt_token(
-                subject=user.id,
-                private_claims=private_claims,
-                refresh=True,
-            )
+        refresh_token = token.create_jwt_token(
+            subject=user.id,
+            private_claims=private_claims,
+            refresh=True,
+        )
 
-            return access_token, refresh_token
+        return access_token, refresh_token
 
     @logging_decorator(LOG_PATH)
     async def refresh(self, refresh_token: str, grant_type: Literal["refresh_token"]):
@@ -64,6 +68,9 @@ class AuthenticationService:
             except token.InvalidToken as e:
                 raise Forbidden(str(e))
 
+            if await self._is_revoked(jti=decoded.jti):
+                raise Forbidden("token has been revoked")
+
             id = decoded.sub
             user: User | None = await self.uow.user.get(ident=id)
             if not user:
@@ -77,3 +84,43 @@ class AuthenticationService:
                 },
                 refresh=False,
             )
+
+    async def _is_revoked(self, jti: str) -> bool:
+        # the bloom filter answers most checks from memory, only possible hits go to the database
+        if not revocation_list.might_be_revoked(jti):
+            return False
+        revoked: RevokedToken | None = await self.uow.revoked_token.get_by(jti__eq=jti)
+        return revoked is not None
+
+    # called on every authenticated request, so it is not logged
+    async def is_revoked(self, jti: str) -> bool:
+        if not revocation_list.might_be_revoked(jti):
+            return False
+        async with self.uow:
+            return await self._is_revoked(jti=jti)
+
+    # not decorated with logging_decorator, its arguments include the raw bearer token
+    async def revoke(self, user_id: str, token_to_revoke: str):
+        try:
+            decoded: token.Token = token.validate_jwt_token(token=token_to_revoke)
+        except token.TokenExpired:
+            # expired tokens are already unusable
+            return
+        except token.InvalidToken as e:
+            raise Forbidden(str(e))
+
+        if decoded.sub != user_id:
+            raise Forbidden("token does not belong to the current user")
+
+        async with self.uow:
+            if await self._is_revoked(jti=decoded.jti):
+                return
+            self.uow.revoked_token.add(
+                RevokedToken(
+                    jti=decoded.jti,
+                    user_id=decoded.sub,
+                    expire_date=datetime.fromtimestamp(decoded.exp),
+                )
+            )
+            await self.uow.commit()
+        revocation_list.add(decoded.jti)
@@ -0,0 +1,19 @@
+from src.common.configs.settings import settings
+from src.domain.user.dto import UserOut
+from src.service_layer.cache_invalidation import invalidation_broadcaster
+from src.utils.cache import TTLCache
+from src.utils.single_flight import SingleFlight
+
+USER_CACHE_NAME = "user"
+
+# per process read-through cache of user dtos keyed by id, evicted by the UserUpdated/UserDeleted handlers,
+# the ttl bounds staleness for writes this process never sees (other workers, direct sql)
+user_cache: TTLCache[str, UserOut] = TTLCache(
+    max_size=settings.cache_settings.user_cache_size,
+    ttl=settings.cache_settings.user_cache_ttl_seconds,
+)
+
+invalidation_broadcaster.subscribe(USER_CACHE_NAME, user_cache)
+
+# collapses concurrent misses for the same user into one query
+user_single_flight: SingleFlight = SingleFlight()
@@ -1,8 +1,5 @@
-import asyncio
-
-from argon2 import PasswordHasher
-
-from src.domain.user.commands import CreateUser, DeleteUser, UpdateUser
+from src.common.security.hashing import AsyncPasswordHasher
+from src.domain.user.commands import CreateUser, CreateUsers, DeleteUser, UpdateUser
 from src.domain.user.dto import UserOut
 from src.domain.user.events import UserCreated, UserDeleted, UserUpdated
 from src.domain.user.model import User
@@ -18,36 +15,72 @@ class UserCreationHandler(CommandHandler):
     def __init__(
         self,
         uow: AbstractUnitOfWork,
-        hasher: PasswordHasher,
+        hasher: AsyncPasswordHasher,
     ):
         self.uow = uow
         self.hasher = hasher
 
     @logging_decorator(f"{LOG_PATH}.UserCreationHandler.execute")
     async def execute(self, cmd: CreateUser) -> UserOut:
+        # hash before the transaction opens so no pooled connection is held while argon2 runs
+        user = await User.acreate(
+            phone=cmd.phone,
+            email=cmd.email,
+            password=cmd.password,
+            hasher=self.hasher,
+        )
         async with self.uow:
-            duplicate_user_by_email, duplicate_user_by_phone = await asyncio.gather(
-                self.uow.user.get_by(email__eq=cmd.email),
-                self.uow.user.get_by(phone__eq=cmd.phone),
+            taken_emails, taken_phones = await self.uow.user.get_taken_emails_and_phones(
+                emails=[cmd.email],
+                phones=[cmd.phone],
             )
 
-            if duplicate_user_by_email:
+            if taken_emails:
                 raise DuplicateRecord("duplicate user by email")
-            if duplicate_user_by_phone:
+            if taken_phones:
                 raise DuplicateRecord("duplicate user by phone")
 
-            user = User.create(
-                phone=cmd.phone,
-                email=cmd.email,
-                password=cmd.password,
-                hasher=self.hasher,
-            )
             self.uow.user.add(user)
-            await self.uow.commit()
             self.uow.events.append(UserCreated(id=user.id))
+            await self.uow.commit()
             return user.to_dto()
 
 
+class UserBulkCreationHandler(CommandHandler):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        hasher: AsyncPasswordHasher,
+    ):
+        self.uow = uow
+        self.hasher = hasher
+
+    @logging_decorator(f"{LOG_PATH}.UserBulkCreationHandler.execute")
+    async def execute(self, cmd: CreateUsers) -> list[UserOut]:
+        emails = [user.email for user in cmd.users]
+        phones = [user.phone for user in cmd.users]
+        if len({email.lower() for email in emails}) != len(emails):
+            raise DuplicateRecord("duplicate user by email")
+        if len(set(phones)) != len(phones):
+            raise DuplicateRecord("duplicate user by phone")
+
+        users = await User.acreate_many(
+            users=[(user.phone, user.email, user.password) for user in cmd.users],
+            hasher=self.hasher,
+        )
+        async with self.uow:
+            taken_emails, taken_phones = await self.uow.user.get_taken_emails_and_phones(emails=emails, phones=phones)
+            if taken_emails:
+                raise DuplicateRecord("duplicate user by email")
+            if taken_phones:
+                raise DuplicateRecord("duplicate user by phone")
+
+            self.uow.user.add_all(users)
+            self.uow.events.extend(UserCreated(id=user.id) for user in users)
+            await self.uow.commit()
+            return [user.to_dto() for user in users]
+
+
 class UserUpdateHandler(CommandHandler):
     def __init__(self, uow: AbstractUnitOfWork):
         self.uow = uow
@@ -64,9 +97,9 @@ class UserUpdateHandler(CommandHandler):
                     "phone": cmd.phone,
                 }
             )
+            self.uow.events.append(UserUpdated(id=user.id))
             await self.uow.commit()
             await self.uow.refresh(user)
-            self.uow.events.append(UserUpdated(id=user.id))
             return user.to_dto()
 
 
@@ -78,6 +111,6 @@ class UserDeleteHandler(CommandHandler):
     async def execute(self, cmd: DeleteUser) -> None:
         async with self.uow:
             await self.uow.user.remove(ident=cmd.id)
-            await self.uow.commit()
             self.uow.events.append(UserDeleted(id=cmd.id))
+            await self.uow.commit()
             return
@@ -0,0 +1,53 @@
+from src.domain.user.dto import UserOut
+from src.domain.user.events import UserCreated, UserDeleted, UserUpdated
+from src.domain.user.model import User
+from src.service_layer.abstracts.abstract_event_handler import EventHandler
+from src.service_layer.abstracts.abstract_unit_of_work import AbstractUnitOfWork
+from src.service_layer.cache_invalidation import InvalidationBroadcaster
+from src.service_layer.user.cache import USER_CACHE_NAME
+from src.service_layer.user.ngram_index import USER_NGRAM_INDEX_NAME, NgramIndex
+from src.utils.cache import TTLCache
+from src.utils.log_utils import logging_decorator
+
+LOG_PATH = "src.service_layer.user.event_handlers"
+
+
+# updates this worker's index inline, then tells the other workers to refresh theirs
+class UserSearchIndexHandler(EventHandler):
+    def __init__(self, uow: AbstractUnitOfWork, index: NgramIndex, broadcaster: InvalidationBroadcaster):
+        self.uow = uow
+        self.index = index
+        self.broadcaster = broadcaster
+
+    @logging_decorator(f"{LOG_PATH}.UserSearchIndexHandler.execute")
+    async def execute(self, event: UserCreated | UserUpdated | UserDeleted) -> None:
+        await self._update_index(event=event)
+        await self.broadcaster.publish(cache_name=USER_NGRAM_INDEX_NAME, key=event.id)
+
+    async def _update_index(self, event: UserCreated | UserUpdated | UserDeleted):
+        if isinstance(event, UserDeleted):
+            self.index.remove(event.id)
+            return
+        async with self.uow:
+            user: User | None = await self.uow.user.get(ident=event.id)
+            if not user:
+                self.index.remove(event.id)
+                return
+            self.index.add(user.id, {"email": user.email, "phone": user.phone})
+
+
+class UserCacheInvalidationHandler(EventHandler):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        cache: TTLCache[str, UserOut],
+        broadcaster: InvalidationBroadcaster,
+    ):
+        self.uow = uow
+        self.cache = cache
+        self.broadcaster = broadcaster
+
+    @logging_decorator(f"{LOG_PATH}.UserCacheInvalidationHandler.execute")
+    async def execute(self, event: UserUpdated | UserDeleted) -> None:
+        self.cache.pop(event.id)
+        await self.broadcaster.publish(cache_name=USER_CACHE_NAME, key=event.id)
@@ -1,15 +1,31 @@
-from argon2 import PasswordHasher  # type: ignore
-
+from src.common.security.hashing import get_password_hasher
 from src.service_layer import unit_of_work
 from src.service_layer.abstracts.abstract_command_handler import CommandHandler
-from src.service_layer.user.command_handlers import UserCreationHandler, UserDeleteHandler, UserUpdateHandler
+from src.service_layer.abstracts.abstract_event_handler import EventHandler
+from src.service_layer.cache_invalidation import invalidation_broadcaster
+from src.service_layer.user.cache import user_cache
+from src.service_layer.user.command_handlers import (
+    UserBulkCreationHandler,
+    UserCreationHandler,
+    UserDeleteHandler,
+    UserUpdateHandler,
+)
+from src.service_layer.user.event_handlers import UserCacheInvalidationHandler, UserSearchIndexHandler
+from src.service_layer.user.ngram_index import user_ngram_index
 from src.service_layer.user.repository import UserRepository
 
 
 def get_user_creation_handler() -> CommandHandler:
     return UserCreationHandler(
         uow=unit_of_work.get_uow(repositories=dict(user=UserRepository)),
-        hasher=PasswordHasher(),
+        hasher=get_password_hasher(),
+    )
+
+
+def get_user_bulk_creation_handler() -> CommandHandler:
+    return UserBulkCreationHandler(
+        uow=unit_of_work.get_uow(repositories=dict(user=UserRepository)),
+        hasher=get_password_hasher(),
     )
 
 
@@ -23,3 +39,19 @@ def get_user_delete_handler() -> CommandHandler:
     return UserDeleteHandler(
         uow=unit_of_work.get_uow(repositories=dict(user=UserRepository)),
     )
+
+
+def get_user_search_index_handler() -> EventHandler:
+    return UserSearchIndexHandler(
+        uow=unit_of_work.get_uow(repositories=dict(user=UserRepository)),
+        index=user_ngram_index,
+        broadcaster=invalidation_broadcaster,
+    )
+
+
+def get_user_cache_invalidation_handler() -> EventHandler:
+    return UserCacheInvalidationHandler(
+        uow=unit_of_work.get_uow(repositories=dict()),
+        cache=user_cache,
+        broadcaster=invalidation_broadcaster,
+    )
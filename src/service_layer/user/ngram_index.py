@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Coroutine
+
+from sqlalchemy import select
+
+from src.common.configs.settings import settings
+from src.domain.user.model import User
+from src.service_layer import view
+from src.service_layer.cache_invalidation import invalidation_broadcaster
+from src.service_layer.user.repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+INDEXED_FIELDS = ("email", "phone")
+BUILD_BATCH_SIZE = 1000
+USER_NGRAM_INDEX_NAME = "user_ngram_index"
+
+
+# inverted index from lowercased n-grams of every indexed field to user ids, with the indexed values kept
+# alongside so candidates can be verified in memory and the database is only asked for exact matches by id
+class NgramIndex:
+    def __init__(self, n: int = 3):
+        self.n = n
+        self.postings: dict[str, dict[str, set[str]]] = {field: defaultdict(set) for field in INDEXED_FIELDS}
+        self.documents: dict[str, dict[str, str]] = {}
+        self.ready = False
+
+    def grams(self, value: str) -> set[str]:
+        value = value.lower()
+        return {value[i : i + self.n] for i in range(len(value) - self.n + 1)}
+
+    def add(self, ident: str, fields: dict[str, str]):
+        self.remove(ident)
+        document = {field: fields[field] for field in INDEXED_FIELDS}
+        self.documents[ident] = document
+        for field, value in document.items():
+            for gram in self.grams(value):
+                self.postings[field][gram].add(ident)
+
+    def remove(self, ident: str):
+        document = self.documents.pop(ident, None)
+        if document is None:
+            return
+        for field, value in document.items():
+            postings = self.postings[field]
+            for gram in self.grams(value):
+                postings[gram].discard(ident)
+                if not postings[gram]:
+                    del postings[gram]
+
+    def search(self, field: str, pattern: str) -> set[str]:
+        grams = self.grams(pattern)
+        if not grams:
+            # shorter than one gram, nothing to intersect so check every document
+            candidates = set(self.documents)
+        else:
+            postings = self.postings[field]
+            candidates = set.intersection(*(postings.get(gram, set()) for gram in grams))
+        pattern = pattern.lower()
+        return {ident for ident in candidates if pattern in self.documents[ident][field].lower()}
+
+    def clear(self):
+        for postings in self.postings.values():
+            postings.clear()
+        self.documents.clear()
+        self.ready = False
+
+
+user_ngram_index = NgramIndex()
+
+
+async def build_user_ngram_index(index: NgramIndex = user_ngram_index):
+    index.clear()
+    user_view = view.get_view(repositories=dict(user=UserRepository))
+    async with user_view:
+        query = select(User.id, User.email, User.phone)  # type: ignore
+        async for rows in user_view.stream(query=query, batch_size=BUILD_BATCH_SIZE):
+            for row in rows:
+                index.add(row.id, {"email": row.email, "phone": row.phone})
+    index.ready = True
+
+
+async def refresh_user_ngram_index(ident: str, index: NgramIndex = user_ngram_index):
+    # read from the primary, a notification can arrive before the replicas have the change
+    user_view = view.get_view(repositories=dict(user=UserRepository), workload="COMMAND")
+    async with user_view:
+        user: User | None = await user_view.user.get(ident=ident)
+    if user is None:
+        index.remove(ident)
+        return
+    index.add(user.id, {"email": user.email, "phone": user.phone})
+
+
+# subscribes the index to the invalidation broadcaster, so writes committed by other workers reach this worker's
+# index. a key refreshes that user, a clear means notifications may have been missed and rebuilds the whole index
+class NgramIndexSubscriber:
+    def __init__(self, index: NgramIndex):
+        self.index = index
+        self.tasks: set[asyncio.Task] = set()
+
+    def _schedule(self, coroutine: Coroutine[Any, Any, None]):
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"failed to refresh the user ngram index: {task.exception()}")
+
+    def pop(self, key: str):
+        self._schedule(refresh_user_ngram_index(ident=key, index=self.index))
+
+    def clear(self):
+        self._schedule(build_user_ngram_index(index=self.index))
+
+
+if settings.search_settings.backend == "NGRAM":
+    invalidation_broadcaster.subscribe(USER_NGRAM_INDEX_NAME, NgramIndexSubscriber(index=user_ngram_index))
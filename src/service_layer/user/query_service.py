@@ -1,54 +1,132 @@
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.sql import Select
 
 from src.domain.user.dto import UserOut, UserSearchParams
 from src.domain.user.model import User
-from src.entrypoints.dto import PaginationParams
+from src.entrypoints.dto import CURSOR_TIEBREAKER, Page, PaginationParams
 from src.service_layer.abstracts.abstract_query_service import AbstractQueryService
 from src.service_layer.abstracts.abstract_view import AbstractView
 from src.service_layer.exceptions import ItemNotFound
+from src.service_layer.user.search import UserSearchBackend
+from src.utils.cache import TTLCache
 from src.utils.log_utils import logging_decorator
+from src.utils.single_flight import SingleFlight
 
 LOG_PATH = "src.service_layer.user.query_service.UserQueryService"
 
+# every cursor sort key is backed by a (column, id) index
+CURSOR_SORT_COLUMNS = ["id", "email", "phone"]
+
 
 class UserQueryService(AbstractQueryService):
-    def __init__(self, view: AbstractView):
-        super().__init__(view)
+    def __init__(
+        self,
+        view: AbstractView,
+        search_backend: UserSearchBackend,
+        cache: TTLCache[str, UserOut] | None = None,
+        single_flight: SingleFlight | None = None,
+    ):
+        super().__init__(view, single_flight=single_flight)
+        self.search_backend = search_backend
+        self.cache = cache
 
     @logging_decorator(LOG_PATH)
     async def get_one_or_raise(self, ident: str) -> UserOut:
+        if self.cache is not None and (cached := self.cache.get(ident)) is not None:
+            return cached
+        query = select(User).where(User.id == ident)  # type: ignore
+        generation, dto = await self.coalesce(self.view.statement_key(query), lambda: self._load(query=query))
+        if self.cache is not None:
+            self.cache.set(ident, dto, generation=generation)
+        return dto
+
+    async def _load(self, query: Select) -> tuple[int | None, UserOut]:
+        # the generation is taken by whoever runs the load, callers that join it later share the same read
+        generation = self.cache.generation if self.cache is not None else None
+        return generation, await self._get_one_or_raise(query=query)
+
+    async def _get_one_or_raise(self, query: Select) -> UserOut:
         async with self.view:
-            user: User | None = await self.view.user.get(ident=ident)
+            user: User | None = await self.view.execute(query=query, scalars=True, one=True)
             if not user:
                 raise ItemNotFound
             return user.to_dto()
 
     @logging_decorator(LOG_PATH)
-    async def paginate(
-        self, search_params: UserSearchParams, pagination_params: PaginationParams
-    ) -> tuple[list[UserOut], int]:
+    async def paginate(self, search_params: UserSearchParams, pagination_params: PaginationParams) -> Page:
         async with self.view:
             query = select(User)
 
-            filters: list[Any] = []
-            if search_params.phone is not None:
-                filters.append(User.phone.like(f"%{search_params.phone}%"))  # type: ignore
-            if search_params.email is not None:
-                filters.append(User.email.like(f"%{search_params.email}%"))  # type: ignore
+            filters: list[Any] = await self.search_backend.get_filters(search_params=search_params)
 
-            total = await self.view.get_count(query=query, filters=filters)
-            if total == 0:
-                return [], 0
+            if pagination_params.cursor_mode:
+                return await self._paginate_by_cursor(query=query, filters=filters, pagination_params=pagination_params)
 
-            contours: list[User] = await self.view.paginate(
+            ordering = pagination_params.get_order_by_conditions(model=User)
+            if pagination_params.total_mode != "exact":
+                # one extra row tells whether there is a next page, an estimated total is only reported, planner
+                # estimates can be off in either direction so has_next is never derived from it
+                contours: list[User] = await self.view.paginate(
+                    query=query,
+                    filters=filters,
+                    ordering=ordering,
+                    offset=pagination_params.offset,
+                    size=pagination_params.size + 1,
+                    scalars=True,
+                )
+                return Page(
+                    items=[x.to_dto() for x in contours[: pagination_params.size]],
+                    total=await self._get_total(query=query, filters=filters, pagination_params=pagination_params),
+                    has_next=len(contours) > pagination_params.size,
+                    next_cursor=None,
+                )
+
+            total, contours = await self.view.count_and_paginate(
                 query=query,
                 filters=filters,
-                ordering=pagination_params.get_order_by_conditions(model=User),
+                ordering=ordering,
                 offset=pagination_params.offset,
                 size=pagination_params.size,
                 scalars=True,
             )
+            return Page(
+                items=[x.to_dto() for x in contours],
+                total=total,
+                has_next=pagination_params.offset + len(contours) < total,
+                next_cursor=None,
+            )
+
+    async def _get_total(self, query: Any, filters: list[Any], pagination_params: PaginationParams) -> int | None:
+        if pagination_params.total_mode == "none":
+            return None
+        if pagination_params.total_mode == "estimate":
+            return await self.view.get_estimated_count(query=query, filters=filters)
+        return await self.view.get_count(query=query, filters=filters)
 
-            return [x.to_dto() for x in contours], total
+    async def _paginate_by_cursor(self, query: Any, filters: list[Any], pagination_params: PaginationParams) -> Page:
+        sort_key, ascending = pagination_params.get_keyset(model=User, allowed_columns=CURSOR_SORT_COLUMNS)
+        # one extra row tells whether there is a next page without counting
+        users: list[User] = await self.view.keyset_paginate(
+            query=query,
+            filters=filters,
+            sort_column=getattr(User, sort_key),
+            tiebreaker_column=getattr(User, CURSOR_TIEBREAKER),
+            ascending=ascending,
+            after=pagination_params.decode_cursor(),
+            size=pagination_params.size + 1,
+            scalars=True,
+        )
+        next_cursor: str | None = None
+        has_next = len(users) > pagination_params.size
+        if has_next:
+            users = users[: pagination_params.size]
+            last = users[-1]
+            next_cursor = PaginationParams.encode_cursor(getattr(last, sort_key), getattr(last, CURSOR_TIEBREAKER))
+        return Page(
+            items=[x.to_dto() for x in users],
+            total=await self._get_total(query=query, filters=filters, pagination_params=pagination_params),
+            has_next=has_next,
+            next_cursor=next_cursor,
+        )
@@ -1,9 +1,41 @@
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from src.adapters.sqlalchemy_repository import SqlAlchemyRepository
-from src.domain.user.model import User
+from src.domain.user.model import User, UserCredentials
 
 
 class UserRepository(SqlAlchemyRepository[User]):  # type: ignore
     def __init__(self, session: AsyncSession):
         super(UserRepository, self).__init__(session, User)
+
+    async def get_taken_emails_and_phones(self, emails: list[str], phones: list[str]) -> tuple[set[str], set[str]]:
+        # one round trip over the unique email and phone indexes, without hydrating users.
+        # emails are compared case insensitively, like the unique lower(email) index does
+        lowered_emails = {email.lower() for email in emails}
+        query = select(User.email, User.phone).where(  # type: ignore
+            or_(func.lower(User.email).in_(lowered_emails), User.phone.in_(phones))  # type: ignore
+        )
+        execution = await self.session.execute(query)
+        taken_emails: set[str] = set()
+        taken_phones: set[str] = set()
+        for email, phone in execution.all():
+            if email.lower() in lowered_emails:
+                taken_emails.add(email)
+            if phone in phones:
+                taken_phones.add(phone)
+        return taken_emails, taken_phones
+
+    async def get_credentials_by_email(self, email: str) -> UserCredentials | None:
+        # matches through the unique lower(email) functional index, so there is at most one user
+        query = select(User.id, User.email, User.phone, User.password).where(  # type: ignore
+            func.lower(User.email) == email.lower()
+        )
+        execution = await self.session.execute(query)
+        row = execution.one_or_none()
+        if row is None:
+            return None
+        return UserCredentials(id=row.id, email=row.email, phone=row.phone, password=row.password)
+
+    async def update_password(self, ident: str, password: str) -> None:
+        await self.session.execute(update(User).where(User.id == ident).values(password=password))  # type: ignore
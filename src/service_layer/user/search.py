@@ -0,0 +1,93 @@
+import abc
+from typing import Any
+
+from sqlalchemy import false
+
+from src.common.configs.settings import settings
+from src.domain.user.dto import UserSearchParams
+from src.domain.user.model import User
+from src.entrypoints.exceptions import InvalidSearchException
+from src.service_layer.user.ngram_index import NgramIndex, user_ngram_index
+
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(value: str) -> str:
+    return value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", f"{LIKE_ESCAPE}%").replace("_", f"{LIKE_ESCAPE}_")
+
+
+class UserSearchBackend(abc.ABC):
+    def __init__(self, min_pattern_length: int):
+        self.min_pattern_length = min_pattern_length
+
+    async def get_filters(self, search_params: UserSearchParams) -> list[Any]:
+        for pattern in (search_params.phone, search_params.email):
+            if pattern is not None and len(pattern) < self.min_pattern_length:
+                raise InvalidSearchException(f"search patterns need at least {self.min_pattern_length} characters")
+        return await self._get_filters(search_params=search_params)
+
+    @abc.abstractmethod
+    async def _get_filters(self, search_params: UserSearchParams) -> list[Any]:
+        raise NotImplementedError
+
+
+class LikeSearchBackend(UserSearchBackend):
+    # fallback for databases without trigram indexes (sqlite in the test suite), always a full scan
+    async def _get_filters(self, search_params: UserSearchParams) -> list[Any]:
+        filters: list[Any] = []
+        if search_params.phone is not None:
+            filters.append(User.phone.like(f"%{escape_like(search_params.phone)}%", escape=LIKE_ESCAPE))  # type: ignore
+        if search_params.email is not None:
+            filters.append(User.email.like(f"%{escape_like(search_params.email)}%", escape=LIKE_ESCAPE))  # type: ignore
+        return filters
+
+
+class TrigramSearchBackend(UserSearchBackend):
+    # postgres answers ILIKE '%x%' from the pg_trgm gin indexes on email and phone
+    async def _get_filters(self, search_params: UserSearchParams) -> list[Any]:
+        filters: list[Any] = []
+        if search_params.phone is not None:
+            filters.append(User.phone.ilike(f"%{escape_like(search_params.phone)}%", escape=LIKE_ESCAPE))  # type: ignore
+        if search_params.email is not None:
+            filters.append(User.email.ilike(f"%{escape_like(search_params.email)}%", escape=LIKE_ESCAPE))  # type: ignore
+        return filters
+
+
+class NgramSearchBackend(UserSearchBackend):
+    # resolves patterns to user ids from the in process n-gram index, so the database only does primary key lookups
+    def __init__(self, min_pattern_length: int, index: NgramIndex, max_candidates: int):
+        super().__init__(min_pattern_length=min_pattern_length)
+        self.index = index
+        self.max_candidates = max_candidates
+        self.fallback = LikeSearchBackend(min_pattern_length=min_pattern_length)
+
+    async def _get_filters(self, search_params: UserSearchParams) -> list[Any]:
+        if not self.index.ready:
+            return await self.fallback.get_filters(search_params=search_params)
+        patterns = {"phone": search_params.phone, "email": search_params.email}
+        candidates: set[str] | None = None
+        for field, pattern in patterns.items():
+            if pattern is None:
+                continue
+            found = self.index.search(field=field, pattern=pattern)
+            candidates = found if candidates is None else candidates & found
+        if candidates is None:
+            return []
+        if not candidates:
+            return [false()]
+        if len(candidates) > self.max_candidates:
+            # an id list this long costs more than the scan it replaces
+            return await self.fallback.get_filters(search_params=search_params)
+        return [User.id.in_(candidates)]  # type: ignore
+
+
+def get_user_search_backend() -> UserSearchBackend:
+    if settings.search_settings.backend == "NGRAM":
+        return NgramSearchBackend(
+            min_pattern_length=settings.search_settings.min_pattern_length,
+            index=user_ngram_index,
+            max_candidates=settings.search_settings.ngram_max_candidates,
+        )
+    if settings.search_settings.backend == "TRIGRAM":
+        return TrigramSearchBackend(min_pattern_length=settings.search_settings.min_pattern_length)
+    return LikeSearchBackend(min_pattern_length=settings.search_settings.min_pattern_length)
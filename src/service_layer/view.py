@@ -1,18 +1,71 @@
-from typing import Any, Type
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Hashable, Type
 
-from sqlalchemy import func, select, text
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
 
 from src.adapters.abstract_repository import AbstractRepository
+from src.common.configs import db_config
 from src.common.configs.db_config import async_autocommit_session_factory
+from src.common.configs.settings import Workload
 from src.service_layer.abstracts.abstract_view import AbstractView
 from src.service_layer.failed_message_log.repository import FailedMessageLogRepository
+from src.service_layer.replica_router import replica_router
+from src.service_layer.revoked_token.repository import RevokedTokenRepository
 from src.service_layer.user.repository import UserRepository
 
 DEFAULT_AUTOCOMMIT_SESSION_FACTORY = async_autocommit_session_factory
 
 
+# one lazily created session per session factory, shared by every view opened within the scope (a request).
+# the session checks out a connection on its first query and is closed again when the last view using it exits,
+# so no connection is held between reads (or while a command runs) and nothing loaded earlier goes stale
+class SessionScope:
+    def __init__(self, read_from_primary: bool = False):
+        self.sessions: dict[Callable[[], AsyncSession], AsyncSession] = {}
+        self.users: dict[AsyncSession, int] = {}
+        self.read_from_primary = read_from_primary
+        # routed once per scope so every view of a request reads from the same server
+        self.read_session_factory: Callable[[], AsyncSession] | None = None
+
+    def acquire(self, session_factory: Callable[[], AsyncSession]) -> AsyncSession:
+        if session_factory not in self.sessions:
+            self.sessions[session_factory] = session_factory()
+        session = self.sessions[session_factory]
+        self.users[session] = self.users.get(session, 0) + 1
+        return session
+
+    async def release(self, session: AsyncSession):
+        self.users[session] -= 1
+        if self.users[session] == 0:
+            # closing gives the connection back to the pool, the session can still be used by the next view
+            await session.close()
+
+    async def close(self):
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
+        self.users.clear()
+
+
+session_scope: ContextVar[SessionScope | None] = ContextVar("session_scope", default=None)
+
+
+@asynccontextmanager
+async def shared_session_scope(read_from_primary: bool = False) -> AsyncIterator[SessionScope]:
+    scope = SessionScope(read_from_primary=read_from_primary)
+    token = session_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        session_scope.reset(token)
+        await scope.close()
+
+
 class SqlAlchemyView(AbstractView):
     def __init__(
         self,
@@ -23,9 +76,11 @@ class SqlAlchemyView(AbstractView):
         self.session_factory = session_factory
         self.user: UserRepository | None = None  # type: ignore
         self.failed_message_log: FailedMessageLogRepository | None = None  # type: ignore
+        self.revoked_token: RevokedTokenRepository | None = None  # type: ignore
 
     async def __aenter__(self) -> AbstractView:
-        self.session: AsyncSession = self.session_factory()
+        self.scope = session_scope.get()
+        self.session: AsyncSession = self.scope.acquire(self.session_factory) if self.scope else self.session_factory()
         if self.repositories:
             for attr, repository in self.repositories.items():
                 if hasattr(self, attr):
@@ -33,6 +88,10 @@ class SqlAlchemyView(AbstractView):
         return await super().__aenter__()
 
     async def __aexit__(self, *args):
+        if self.scope is not None:
+            # the scope owns the session, rolling back here would expire what other views still using it loaded
+            await self.scope.release(self.session)
+            return
         await self.session.rollback()
         await self.session.close()
 
@@ -49,6 +108,15 @@ class SqlAlchemyView(AbstractView):
                 return execution.scalars().all()
             return execution.all()
 
+    def _statement_key(self, query: Select) -> Hashable:
+        compiled = query.compile()
+        return str(compiled), tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+
+    async def _stream(self, query: Select, batch_size: int) -> AsyncIterator[list[Any]]:
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions(batch_size):  # type: ignore
+            yield list(partition)
+
     async def _paginate(
         self,
         query: Select,
@@ -65,10 +133,110 @@ class SqlAlchemyView(AbstractView):
         query = query.offset(offset).limit(size)
         return await self.execute(query=query, scalars=scalars, one=False)
 
+    async def _keyset_paginate(
+        self,
+        query: Select,
+        filters: list[Any],
+        sort_column: Any,
+        tiebreaker_column: Any,
+        ascending: bool,
+        after: tuple[Any, Any] | None,
+        size: int,
+        scalars: bool,
+    ):
+        if filters:
+            query = query.where(*filters)
+        if after is not None:
+            # a row value comparison lets the (sort_column, id) index seek straight to the page
+            keyset: Any = tuple_(sort_column, tiebreaker_column)
+            after_keyset: Any = tuple_(*after)
+            query = query.where(keyset > after_keyset if ascending else keyset < after_keyset)
+        if ascending:
+            query = query.order_by(sort_column.asc(), tiebreaker_column.asc())
+        else:
+            query = query.order_by(sort_column.desc(), tiebreaker_column.desc())
+        query = query.limit(size)
+        return await self.execute(query=query, scalars=scalars, one=False)
+
     async def _get_count(self, query: Select, filters: list) -> int:
         count_query = select(func.count()).select_from(query.where(*filters).subquery())
         return await self.execute(query=count_query, scalars=True, one=True)
 
+    @property
+    def dialect_name(self) -> str:
+        return self.session.bind.dialect.name
+
+    async def _get_estimated_count(self, query: Select, filters: list) -> int:
+        if self.dialect_name != "postgresql":
+            return await self._get_count(query=query, filters=filters)
+        # the planner's row estimate, read from the plan instead of scanning every matching row.
+        # search terms stay bound parameters, they are never rendered into the sql string
+        statement = query.where(*filters).compile(
+            dialect=self.session.bind.dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        parameters: Any = statement.params
+        if statement.positional:
+            parameters = tuple(statement.params[name] for name in statement.positiontup or ())
+        connection = await self.session.connection()
+        execution = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = execution.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def _count_in_new_session(self, query: Select, filters: list) -> int:
+        count_query = select(func.count()).select_from(query.where(*filters).subquery())
+        session: AsyncSession = self.session_factory()
+        try:
+            execution = await session.execute(count_query)
+            return execution.scalar_one()
+        finally:
+            await session.close()
+
+    async def _count_and_paginate(
+        self,
+        query: Select,
+        filters: list[Any],
+        ordering: list[Any],
+        offset: int,
+        size: int,
+        scalars: bool,
+    ) -> tuple[int, list[Any]]:
+        page_coroutine = self._paginate(
+            query=query,
+            filters=filters,
+            ordering=ordering,
+            offset=offset,
+            size=size,
+            scalars=scalars,
+        )
+        if self.dialect_name == "sqlite":
+            # sqlite serialises everything on one connection anyway
+            total = await self._get_count(query=query, filters=filters)
+            return total, await page_coroutine
+        # the count runs on its own session (and pooled connection) so both round trips overlap
+        total, items = await asyncio.gather(
+            self._count_in_new_session(query=query, filters=filters),
+            page_coroutine,
+        )
+        return total, items
+
+
+def get_read_session_factory() -> Callable[[], AsyncSession] | None:
+    scope = session_scope.get()
+    if scope is None:
+        return replica_router.route()
+    if scope.read_session_factory is None:
+        scope.read_session_factory = replica_router.route(read_from_primary=scope.read_from_primary)
+    return scope.read_session_factory
+
 
-def get_view(repositories: dict[str, Type[AbstractRepository]]) -> AbstractView:
-    return SqlAlchemyView(repositories=repositories)
+def get_view(repositories: dict[str, Type[AbstractRepository]], workload: Workload = "QUERY") -> AbstractView:
+    if workload != "QUERY":
+        # other workloads read from their own pool on the primary
+        return SqlAlchemyView(
+            repositories=repositories,
+            session_factory=db_config.autocommit_session_factories.get(workload, DEFAULT_AUTOCOMMIT_SESSION_FACTORY),
+        )
+    return SqlAlchemyView(repositories=repositories, session_factory=get_read_session_factory())
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+MAX_BATCH_SIZE = 1000
+
+
+# gathers every load() made within one event loop tick and resolves them with a single load_many call,
+# load_many returns the found values by key and missing keys resolve to None
+class BatchLoader(Generic[K, V]):
+    def __init__(self, load_many: Callable[[list[K]], Awaitable[dict[K, V]]], max_batch_size: int = MAX_BATCH_SIZE):
+        self.load_many_func = load_many
+        self.max_batch_size = max_batch_size
+        self.pending: dict[K, list[asyncio.Future[V | None]]] = {}
+        self.lock = asyncio.Lock()
+        self.batches = 0
+        self.loads = 0
+
+    def load(self, key: K) -> asyncio.Future[V | None]:
+        loop = asyncio.get_running_loop()
+        if not self.pending:
+            loop.call_soon(self._dispatch)
+        future: asyncio.Future[V | None] = loop.create_future()
+        self.pending.setdefault(key, []).append(future)
+        self.loads += 1
+        return future
+
+    async def load_many(self, keys: list[K]) -> list[V | None]:
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+    def _dispatch(self):
+        pending, self.pending = self.pending, {}
+        asyncio.ensure_future(self._resolve(pending))
+
+    async def _resolve(self, pending: dict[K, list[asyncio.Future[V | None]]]):
+        keys = list(pending)
+        try:
+            # batches share the caller's session, so they run one after another, also across ticks
+            async with self.lock:
+                for start in range(0, len(keys), self.max_batch_size):
+                    batch = keys[start : start + self.max_batch_size]
+                    self.batches += 1
+                    try:
+                        found = await self.load_many_func(batch)
+                    except Exception as e:
+                        for key in batch:
+                            for future in pending[key]:
+                                if not future.done():
+                                    future.set_exception(e)
+                        continue
+                    for key in batch:
+                        for future in pending[key]:
+                            if not future.done():
+                                future.set_result(found.get(key))
+        finally:
+            # cancelled (or any other BaseException) part way through, nothing else will resolve the rest
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.cancel()
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# bounded lru cache where every entry carries its own absolute expiry (epoch seconds).
+# pop and clear bump a generation, a read-through caller takes the generation before loading and passes it to set,
+# which skips the value if the key was invalidated in between, the load may have read the row before the write
+class TTLCache(Generic[K, V]):
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.items: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        # generation of each key's last invalidation, bounded like the items. keys that fell out count as
+        # invalidated at the newest generation that fell out, which may skip a set but never keeps a stale one
+        self.invalidated: OrderedDict[K, int] = OrderedDict()
+        self.invalidated_floor = 0
+        self.stale_sets = 0
+
+    def get(self, key: K) -> V | None:
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.time():
+                del self.items[key]
+                self.misses += 1
+                return None
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None, generation: int | None = None):
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+        with self.lock:
+            if generation is not None and self.invalidated.get(key, self.invalidated_floor) > generation:
+                self.stale_sets += 1
+                return
+            self.items[key] = (expires_at, value)
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        with self.lock:
+            self.generation += 1
+            self.invalidated[key] = self.generation
+            self.invalidated.move_to_end(key)
+            while len(self.invalidated) > self.max_size:
+                _, generation = self.invalidated.popitem(last=False)
+                self.invalidated_floor = max(self.invalidated_floor, generation)
+            item = self.items.pop(key, None)
+            return item[1] if item is not None else None
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.invalidated.clear()
+            self.invalidated_floor = self.generation
+            self.items.clear()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self.items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
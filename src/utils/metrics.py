@@ -0,0 +1,51 @@
+import bisect
+import threading
+
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+# cumulative histogram in the prometheus sense, the last bucket counts everything above the largest bound
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self.lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            cumulative: dict[str, int] = {}
+            running = 0
+            for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+                running += count
+                cumulative[bound] = running
+            return {"buckets": cumulative, "count": self.count, "sum": self.total}
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self.lock:
+            self.value += amount
+
+
+# process wide counters by name, logged periodically alongside the pool metrics
+counters: dict[str, Counter] = {}
+
+
+def get_counter(name: str) -> Counter:
+    return counters.setdefault(name, Counter())
+
+
+def snapshot_counters() -> dict[str, int]:
+    return {name: counter.value for name, counter in counters.items()}
@@ -0,0 +1,47 @@
+import asyncio
+import contextvars
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# collapses concurrent calls with the same key into one in flight call whose result (or exception) every caller
+# shares, the call runs as its own task so a cancelled caller does not cancel it for the others. the task gets an
+# empty context, so it does not pick up the first caller's request state (like its shared session scope), which
+# goes away with that caller
+class SingleFlight(Generic[K, V]):
+    def __init__(self):
+        self.in_flight: dict[K, asyncio.Task[V]] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        self.calls += 1
+        task = self.in_flight.get(key)
+        if task is None:
+
+            async def call() -> V:
+                return await func()
+
+            # created inside an empty context (create_task copies the current one), create_task(context=) is 3.11+
+            task = contextvars.Context().run(asyncio.get_running_loop().create_task, call())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: asyncio.Task[V]):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if not task.cancelled():
+            # mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "collapsed": self.collapsed,
+            "collapse_ratio": self.collapsed / self.calls if self.calls else 0.0,
+        }
@@ -15,15 +15,22 @@ from starlette.testclient import TestClient
 
 from src.adapters.abstract_repository import AbstractRepository
 from src.adapters.in_memory_orm import metadata, start_mappers
-from src.common.configs.settings import settings
+from src.common.configs.settings import Workload, settings
 from src.common.security import token
 from src.main import app
 from src.service_layer import unit_of_work, view
 from src.service_layer.abstracts.abstract_unit_of_work import AbstractUnitOfWork
 from src.service_layer.abstracts.abstract_view import AbstractView
 from src.service_layer.failed_message_log.repository import FailedMessageLogRepository
-from src.service_layer.message_bus import MessageBus, command_handlers, event_handlers, get_message_bus
+from src.service_layer.message_bus import (
+    MessageBus,
+    command_handlers,
+    event_handlers,
+    get_message_bus,
+    local_event_handlers,
+)
 from src.service_layer.unit_of_work import SqlAlchemyUnitOfWork
+from src.service_layer.user.cache import user_cache
 from src.service_layer.view import SqlAlchemyView
 
 # DB STUFF FROM HERE
@@ -92,7 +99,9 @@ def view_(session_factory) -> AbstractView:
 
 @pytest_asyncio.fixture(scope="function", autouse=True)
 def monkeypatch_get_unit_of_work(monkeypatch, session_factory):
-    def get_test_uow(repositories: dict[str, Type[AbstractRepository]]) -> AbstractUnitOfWork:
+    def get_test_uow(
+        repositories: dict[str, Type[AbstractRepository]], workload: Workload = "COMMAND"
+    ) -> AbstractUnitOfWork:
         return SqlAlchemyUnitOfWork(
             repositories=repositories,
             session_factory=session_factory,
@@ -103,7 +112,7 @@ def monkeypatch_get_unit_of_work(monkeypatch, session_factory):
 
 @pytest_asyncio.fixture(scope="function", autouse=True)
 def monkeypatch_get_view(monkeypatch, session_factory):
-    def get_test_view(repositories: dict[str, Type[AbstractRepository]]) -> AbstractView:
+    def get_test_view(repositories: dict[str, Type[AbstractRepository]], workload: Workload = "QUERY") -> AbstractView:
         return SqlAlchemyView(
             repositories=repositories,
             session_factory=session_factory,
@@ -112,6 +121,13 @@ def monkeypatch_get_view(monkeypatch, session_factory):
     monkeypatch.setattr(view, "get_view", get_test_view)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
 @pytest_asyncio.fixture(scope="function")
 def message_bus(uow: AbstractUnitOfWork) -> MessageBus:
     uow.repositories = dict(failed_message_log=FailedMessageLogRepository)
@@ -119,6 +135,7 @@ def message_bus(uow: AbstractUnitOfWork) -> MessageBus:
         uow=uow,
         event_handlers=event_handlers,
         command_handlers=command_handlers,
+        local_event_handlers=local_event_handlers,
     )
 
 
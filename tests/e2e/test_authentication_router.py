@@ -67,3 +67,27 @@ async def test_refresh_token(app_for_test: FastAPI):
     # THEN
     data = res.json()
     assert res.status_code == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_revoke_token(app_for_test: FastAPI):
+    # GIVEN
+    headers, user = await create_test_user_and_login(app_for_test=app_for_test)
+    data = {"token": headers["Authorization"].replace("Bearer ", "")}
+
+    # WHEN
+    url = app_for_test.url_path_for("revoke_token")
+    async with AsyncClient(
+        transport=ASGITransport(app=app_for_test),  # type: ignore
+        base_url=settings.test_url,
+    ) as ac:
+        res = await ac.post(url, json=data, headers=headers)
+
+        # THEN
+        assert res.status_code == HTTPStatus.OK
+
+        # WHEN the revoked token is used again
+        res = await ac.get(app_for_test.url_path_for("get_one_user", user_id=user["id"]), headers=headers)
+
+        # THEN
+        assert res.status_code == HTTPStatus.UNAUTHORIZED
@@ -73,3 +73,22 @@ async def test_paginate_users(app_for_test: FastAPI, authorized: bool, status: H
 
     # THEN
     assert res.status_code == status
+
+
+@pytest.mark.asyncio
+async def test_paginate_users_rejects_short_search_patterns(app_for_test: FastAPI):
+    # GIVEN
+    headers, _ = await create_test_user_and_login(app_for_test=app_for_test)
+    short_pattern = "x" * (settings.search_settings.min_pattern_length - 1)
+
+    # WHEN
+    url = app_for_test.url_path_for("paginate_users")
+    async with AsyncClient(
+        transport=ASGITransport(app=app_for_test),  # type: ignore
+        base_url=settings.test_url,
+    ) as ac:
+        res = await ac.get(url, headers=headers, params={"email": short_pattern})
+
+    # THEN
+    assert res.status_code == HTTPStatus.BAD_REQUEST
+    assert res.json()["error"] == "Invalid search parameters"
@@ -22,10 +22,10 @@ async def create_user(session: AsyncSession, user_data: dict) -> UserOut:
 @pytest_asyncio.fixture
 async def create_users_for_pagination(session: AsyncSession, user_data: dict) -> list[UserOut]:
     users: list[User] = []
-    for _ in range(20):
+    for i in range(20):
         user = User.create(
-            phone=user_data["phone"],
-            email=user_data["email"],
+            phone=f"{user_data['phone']}{i}",
+            email=f"{i}{user_data['email']}",
             password=user_data["password"],
             hasher=PasswordHasher(),
         )
@@ -1,7 +1,17 @@
+from datetime import datetime, timedelta
+
 import pytest
+from argon2 import PasswordHasher
+from nanoid import generate  # type: ignore
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.common.security import token
+from src.common.security.revocation import revocation_list
 from src.domain.user.dto import UserOut
+from src.domain.user.model import RevokedToken, User
 from src.service_layer.exceptions import Forbidden, Unauthorized
+from src.service_layer.jobs import refresh_revocation_list
 from src.service_layer.service_factory import get_auth_service
 
 
@@ -72,3 +82,102 @@ async def test_refresh_token_unhappy_path_invalid_token(
     # WHEN
     with pytest.raises(Forbidden):  # THEN
         await service.refresh(refresh_token=refresh_token, grant_type="refresh_token")
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_happy_path(create_user: UserOut, user_data: dict):
+    # GIVEN
+    service = get_auth_service()
+    _, refresh_token = await service.login(email=user_data["email"], password=user_data["password"])
+    jti = token.validate_jwt_token(refresh_token).jti
+    assert not await service.is_revoked(jti=jti)
+
+    # WHEN
+    await service.revoke(user_id=create_user.id, token_to_revoke=refresh_token)
+
+    # THEN
+    assert await service.is_revoked(jti=jti)
+    with pytest.raises(Forbidden, match="revoked"):
+        await service.refresh(refresh_token=refresh_token, grant_type="refresh_token")
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_unhappy_path_other_users_token(create_user: UserOut, user_data: dict):
+    # GIVEN
+    service = get_auth_service()
+    _, refresh_token = await service.login(email=user_data["email"], password=user_data["password"])
+
+    # WHEN
+    with pytest.raises(Forbidden):  # THEN
+        await service.revoke(user_id=generate(), token_to_revoke=refresh_token)
+
+
+@pytest.mark.asyncio
+async def test_refresh_revocation_list(session: AsyncSession):
+    # GIVEN
+    active, expired = generate(), generate()
+    session.add_all(
+        [
+            RevokedToken(jti=active, user_id=generate(), expire_date=datetime.now() + timedelta(days=1)),
+            RevokedToken(jti=expired, user_id=generate(), expire_date=datetime.now() - timedelta(days=1)),
+        ]
+    )
+    await session.commit()
+
+    # WHEN
+    await refresh_revocation_list()
+
+    # THEN
+    assert revocation_list.might_be_revoked(active)
+    assert not revocation_list.might_be_revoked(expired)
+    remaining = (await session.execute(select(RevokedToken.jti))).scalars().all()  # type: ignore
+    assert remaining == [active]
+
+
+@pytest.mark.asyncio
+async def test_login_is_case_insensitive_and_rehashes(create_user: UserOut, user_data: dict, session: AsyncSession):
+    # GIVEN a stored hash made with weaker parameters than the service's hasher
+    weak_hash = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash(user_data["password"])
+    await session.execute(update(User).where(User.id == create_user.id).values(password=weak_hash))  # type: ignore
+    await session.commit()
+    service = get_auth_service()
+
+    # WHEN
+    token, refresh_token = await service.login(email=user_data["email"].upper(), password=user_data["password"])
+
+    # THEN
+    assert token, refresh_token
+    execution = await session.execute(select(User.password).where(User.id == create_user.id))  # type: ignore
+    assert execution.scalar_one() != weak_hash
+
+
+@pytest.mark.asyncio
+async def test_login_hashes_with_no_session_open(
+    create_user: UserOut, user_data: dict, session: AsyncSession, monkeypatch
+):
+    # GIVEN a stored hash that needs a rehash, so login both verifies and hashes
+    weak_hash = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash(user_data["password"])
+    await session.execute(update(User).where(User.id == create_user.id).values(password=weak_hash))  # type: ignore
+    await session.commit()
+    service = get_auth_service()
+    in_transaction: list[bool] = []
+    verify, hash = service.hasher.verify, service.hasher.hash
+
+    async def recording_verify(hash: str, password: str) -> bool:
+        in_transaction.append(service.uow.session.in_transaction())
+        return await verify(hash=hash, password=password)
+
+    async def recording_hash(password: str) -> str:
+        in_transaction.append(service.uow.session.in_transaction())
+        return await hash(password=password)
+
+    monkeypatch.setattr(service.hasher, "verify", recording_verify)
+    monkeypatch.setattr(service.hasher, "hash", recording_hash)
+
+    # WHEN
+    await service.login(email=user_data["email"], password=user_data["password"])
+
+    # THEN
+    assert in_transaction == [False, False]
+    execution = await session.execute(select(User.password).where(User.id == create_user.id))  # type: ignore
+    assert execution.scalar_one() != weak_hash
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from nanoid import generate  # type: ignore
+
+from src.common.configs.settings import settings
+from src.common.security.token import Token
+from src.domain.user.dto import UserClaims, UserOut
+from src.entrypoints.depdencies import get_current_user_from_claims
+from src.service_layer.exceptions import ItemNotFound
+from src.service_layer.service_factory import get_user_query_service
+
+
+def make_token(sub: str, email: str, phone: str, issued_at: datetime) -> Token:
+    return Token(
+        sub=sub,
+        email=email,
+        phone=phone,
+        iat=int(issued_at.timestamp()),
+        exp=int((issued_at + timedelta(minutes=30)).timestamp()),
+        jti=generate(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_fresh_claims_skip_user_lookup():
+    # GIVEN a user that does not exist in the database
+    token = make_token(sub=generate(), email="test@email.com", phone="1234", issued_at=datetime.now())
+
+    # WHEN
+    claims = await get_current_user_from_claims(token=token, user_query_service=get_user_query_service())
+
+    # THEN
+    assert claims == UserClaims(id=token.sub, email=token.email, phone=token.phone)
+
+
+@pytest.mark.asyncio
+async def test_stale_claims_are_revalidated(create_user: UserOut, monkeypatch):
+    # GIVEN
+    stale = datetime.now() - settings.jwt_settings.claims_max_staleness - timedelta(minutes=1)
+    token = make_token(sub=create_user.id, email="old@email.com", phone="old", issued_at=stale)
+
+    # WHEN
+    claims = await get_current_user_from_claims(token=token, user_query_service=get_user_query_service())
+
+    # THEN
+    assert claims == UserClaims(id=create_user.id, email=create_user.email, phone=create_user.phone)
+
+    # WHEN the user no longer exists
+    with pytest.raises(ItemNotFound):  # THEN
+        await get_current_user_from_claims(
+            token=make_token(sub=generate(), email="old@email.com", phone="old", issued_at=stale),
+            user_query_service=get_user_query_service(),
+        )
+
+    # WHEN revalidation is disabled
+    monkeypatch.setattr(settings.jwt_settings, "revalidate_stale_claims", False)
+    with pytest.raises(HTTPException):  # THEN
+        await get_current_user_from_claims(token=token, user_query_service=get_user_query_service())
@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.base import FailedMessageLog
+from src.domain.user.events import UserUpdated
+from src.service_layer.failed_message_log.writer import DROPPED, FailedMessageLogWriter
+from src.service_layer.message_bus import MessageBus
+from src.utils.metrics import snapshot_counters
+
+
+def make_log(i: int, error_message: str = "boom") -> FailedMessageLog:
+    return FailedMessageLog.create(
+        message_type="COMMAND",
+        message_name=f"Command{i}",
+        error_message=error_message,
+        window_seconds=3600,
+        payload={"id": str(i), "password": "secret"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_buffered_logs_in_batches(session: AsyncSession):
+    # GIVEN
+    writer = FailedMessageLogWriter(capacity=10, batch_size=2, flush_interval_seconds=1)
+    for i in range(5):
+        writer.append(make_log(i))
+
+    # WHEN
+    flushed = await writer.flush()
+
+    # THEN
+    assert flushed == 5
+    assert writer.stats() == dict(buffered=0, written=5, collapsed=0, dropped=0, failures=0)
+    logs = (await session.execute(select(FailedMessageLog))).scalars().all()
+    assert sorted(x.message_name for x in logs) == [f"Command{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_writer_drops_the_oldest_logs_when_full(session: AsyncSession):
+    # GIVEN
+    writer = FailedMessageLogWriter(capacity=3, batch_size=10, flush_interval_seconds=1)
+    dropped_before = DROPPED.value
+
+    # WHEN
+    for i in range(5):
+        writer.append(make_log(i))
+    await writer.flush()
+
+    # THEN
+    assert writer.dropped == 2
+    assert snapshot_counters()["failed_message_log_writer.dropped"] == dropped_before + 2
+    logs = (await session.execute(select(FailedMessageLog))).scalars().all()
+    assert sorted(x.message_name for x in logs) == ["Command2", "Command3", "Command4"]
+
+
+@pytest.mark.asyncio
+async def test_writer_keeps_logs_when_the_flush_fails(monkeypatch):
+    # GIVEN
+    writer = FailedMessageLogWriter(capacity=3, batch_size=2, flush_interval_seconds=1)
+    for i in range(3):
+        writer.append(make_log(i))
+
+    async def failing_write(batch: list[FailedMessageLog]):
+        raise ConnectionError("database is down")
+
+    monkeypatch.setattr(writer, "_write", failing_write)
+
+    # WHEN
+    flushed = await writer.flush()
+
+    # THEN
+    assert flushed == 0
+    assert writer.flush_failures == 1
+    assert [x.message_name for x in writer.buffer.values()] == ["Command0", "Command1", "Command2"]
+
+
+@pytest.mark.asyncio
+async def test_writer_aggregates_repeated_failures_into_one_row(session: AsyncSession):
+    # GIVEN
+    writer = FailedMessageLogWriter(capacity=10, batch_size=10, flush_interval_seconds=1)
+    for _ in range(3):
+        writer.append(make_log(1))
+    writer.append(make_log(1, error_message="another error"))
+
+    # WHEN
+    await writer.flush()
+    writer.append(make_log(1))
+    await writer.flush()
+
+    # THEN
+    assert writer.collapsed == 2
+    logs = (await session.execute(select(FailedMessageLog))).scalars().all()
+    assert len(logs) == 2
+    for log in logs:
+        await session.refresh(log)
+    occurrences = {log.error_message: log.occurrences for log in logs}
+    assert occurrences == {"boom": 4, "another error": 1}
+    assert all(log.payload == {"id": "1", "password": "[REDACTED]"} for log in logs)
+
+
+@pytest.mark.asyncio
+async def test_message_bus_writes_directly_when_the_writer_is_not_running(
+    message_bus: MessageBus, session: AsyncSession
+):
+    # GIVEN a writer that was never started
+    writer = FailedMessageLogWriter(capacity=10, batch_size=10, flush_interval_seconds=1)
+    message_bus.failed_message_log_writer = writer
+
+    # WHEN
+    await message_bus._add_log(message_type="EVENT", message=UserUpdated(id="user"), error_message="boom")
+
+    # THEN
+    assert not writer.buffer
+    logs = (await session.execute(select(FailedMessageLog))).scalars().all()
+    assert [(x.message_name, x.error_message) for x in logs] == [("UserUpdated", "boom")]
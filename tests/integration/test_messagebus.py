@@ -1,3 +1,4 @@
+import asyncio
 from typing import Callable, Type
 
 import pytest
@@ -115,3 +116,104 @@ async def test_messagebus_unhappy_path(message_bus: MessageBus):
         log = logs[0]
         assert log.message_name == "RaiseException"
         assert log.message_type == "COMMAND"
+
+
+class SomethingFailed(Event):
+    message: str
+
+
+class FailingHandler(EventHandler):
+    def __init__(self, uow: AbstractUnitOfWork):
+        self.uow = uow
+
+    async def execute(self, event: SomethingFailed) -> None:
+        raise ExampleException("handler failed")
+
+
+class SlowHandler(EventHandler):
+    def __init__(self, uow: AbstractUnitOfWork):
+        self.uow = uow
+
+    async def execute(self, event: SomethingFailed) -> None:
+        await asyncio.sleep(1)
+
+
+class RecordingHandler(EventHandler):
+    handled: list[str] = []
+
+    def __init__(self, uow: AbstractUnitOfWork):
+        self.uow = uow
+
+    async def execute(self, event: SomethingFailed) -> None:
+        RecordingHandler.handled.append(event.message)
+
+
+@pytest.mark.asyncio
+async def test_messagebus_concurrent_event_dispatch_runs_every_handler(message_bus: MessageBus):
+    # GIVEN
+    RecordingHandler.handled = []
+    message_bus.event_handlers = {
+        SomethingFailed: [
+            lambda: FailingHandler(uow=get_fake_uow()),
+            lambda: SlowHandler(uow=get_fake_uow()),
+            lambda: RecordingHandler(uow=get_fake_uow()),
+        ]
+    }
+    message_bus.event_dispatch = "CONCURRENT"
+    message_bus.event_handler_timeout_seconds = 0.1
+
+    # WHEN
+    with pytest.raises(ExampleException):
+        await message_bus.handle(SomethingFailed(message="oops"))
+
+    # THEN
+    assert RecordingHandler.handled == ["oops"]
+    async with message_bus.uow:
+        logs: list[FailedMessageLog] = await message_bus.uow.failed_message_log.get_all()
+        assert sorted(log.error_message for log in logs) == [
+            "SlowHandler timed out after 0.1 seconds",
+            "handler failed",
+        ]
+        assert all(log.message_name == "SomethingFailed" and log.message_type == "EVENT" for log in logs)
+
+
+class SomethingRecorded(Event):
+    message: str
+
+
+class FollowUpRaisingHandler(EventHandler):
+    def __init__(self, uow: AbstractUnitOfWork):
+        self.uow = uow
+
+    async def execute(self, event: SomethingFailed) -> None:
+        self.uow.events.append(SomethingRecorded(message=event.message))
+
+
+class FollowUpHandler(EventHandler):
+    def __init__(self, uow: AbstractUnitOfWork):
+        self.uow = uow
+
+    async def execute(self, event: SomethingRecorded) -> None:
+        RecordingHandler.handled.append(f"{event.message} followed up")
+
+
+@pytest.mark.asyncio
+async def test_messagebus_concurrent_event_dispatch_handles_follow_ups_before_raising(message_bus: MessageBus):
+    # GIVEN
+    RecordingHandler.handled = []
+    message_bus.event_handlers = {
+        SomethingFailed: [
+            lambda: FailingHandler(uow=get_fake_uow()),
+            lambda: FollowUpRaisingHandler(uow=get_fake_uow()),
+        ],
+        SomethingRecorded: [lambda: FollowUpHandler(uow=get_fake_uow())],
+    }
+    message_bus.event_dispatch = "CONCURRENT"
+
+    # WHEN
+    with pytest.raises(ExampleException):
+        await message_bus.handle(SomethingFailed(message="oops"))
+
+    # THEN
+    assert RecordingHandler.handled == ["oops followed up"]
+    assert not message_bus.queue
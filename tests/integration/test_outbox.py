@@ -0,0 +1,263 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
+
+from src.domain import Event
+from src.domain.base import FailedMessageLog, OutboxMessage
+from src.domain.user.commands import UpdateUser
+from src.domain.user.dto import UserOut
+from src.domain.user.events import UserUpdated
+from src.service_layer import unit_of_work
+from src.service_layer.abstracts.abstract_event_handler import EventHandler
+from src.service_layer.abstracts.abstract_unit_of_work import AbstractUnitOfWork
+from src.service_layer.jobs import purge_processed_outbox_messages
+from src.service_layer.message_bus import MessageBus
+from src.service_layer.outbox.dispatcher import OutboxDispatcher
+from src.service_layer.outbox.repository import OutboxRepository
+from src.service_layer.unit_of_work import SqlAlchemyUnitOfWork
+from src.service_layer.user.command_handlers import UserUpdateHandler
+from src.service_layer.user.repository import UserRepository
+
+handled: list[UserUpdated] = []
+
+
+class RecordingHandler(EventHandler):
+    def __init__(self, uow: AbstractUnitOfWork):
+        self.uow = uow
+
+    async def execute(self, event: UserUpdated) -> None:
+        handled.append(event)
+
+
+class FailingHandler(EventHandler):
+    def __init__(self, uow: AbstractUnitOfWork):
+        self.uow = uow
+
+    async def execute(self, event: UserUpdated) -> None:
+        raise ValueError("handler failed")
+
+
+def get_recording_handler() -> EventHandler:
+    return RecordingHandler(uow=unit_of_work.get_uow(repositories=dict()))
+
+
+def get_failing_handler() -> EventHandler:
+    return FailingHandler(uow=unit_of_work.get_uow(repositories=dict()))
+
+
+def get_dispatcher(handler_factory) -> OutboxDispatcher:
+    return OutboxDispatcher(
+        event_handlers={UserUpdated: [handler_factory]},
+        command_handlers={},
+        batch_size=10,
+        poll_interval_seconds=0.01,
+        max_attempts=2,
+        lease_seconds=60,
+    )
+
+
+async def update_user_with_outbox(session_factory: async_scoped_session, user: UserOut) -> AbstractUnitOfWork:
+    uow = SqlAlchemyUnitOfWork(
+        repositories=dict(user=UserRepository),
+        session_factory=session_factory,
+        outbox_event_types={UserUpdated},
+    )
+    handler = UserUpdateHandler(uow=uow)
+    await handler.execute(cmd=UpdateUser(id=user.id, email="outbox@example.com", phone=user.phone))
+    return uow
+
+
+@pytest.mark.asyncio
+async def test_events_are_written_to_the_outbox_on_commit(
+    create_user: UserOut,
+    session_factory: async_scoped_session,
+    session: AsyncSession,
+):
+    # GIVEN
+    user = create_user
+
+    # WHEN
+    uow = await update_user_with_outbox(session_factory=session_factory, user=user)
+
+    # THEN the event stays queued for the per process handlers
+    assert [(x.model_dump(), isinstance(x, Event) and x.outboxed) for x in uow.events] == [({"id": user.id}, True)]
+    messages = (await session.execute(select(OutboxMessage))).scalars().all()
+    assert [(x.message_name, x.payload, x.processed_date) for x in messages] == [("UserUpdated", {"id": user.id}, None)]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_handles_outbox_messages(
+    create_user: UserOut,
+    session_factory: async_scoped_session,
+    session: AsyncSession,
+):
+    # GIVEN
+    user = create_user
+    await update_user_with_outbox(session_factory=session_factory, user=user)
+    handled.clear()
+
+    # WHEN
+    dispatched = await get_dispatcher(get_recording_handler).dispatch_batch()
+
+    # THEN
+    assert dispatched == 1
+    assert handled == [UserUpdated(id=user.id)]
+    message = (await session.execute(select(OutboxMessage))).scalar_one()
+    await session.refresh(message)
+    assert message.processed_date is not None
+    assert message.attempts == 0
+
+    # WHEN nothing is pending
+    dispatched = await get_dispatcher(get_recording_handler).dispatch_batch()
+
+    # THEN
+    assert dispatched == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_retries_failed_messages_until_max_attempts(
+    create_user: UserOut,
+    session_factory: async_scoped_session,
+    session: AsyncSession,
+):
+    # GIVEN
+    user = create_user
+    await update_user_with_outbox(session_factory=session_factory, user=user)
+    dispatcher = get_dispatcher(get_failing_handler)
+
+    # WHEN
+    await dispatcher.dispatch_batch()
+
+    # THEN
+    message = (await session.execute(select(OutboxMessage))).scalar_one()
+    await session.refresh(message)
+    assert message.attempts == 1
+    assert message.last_error == "handler failed"
+    assert message.processed_date is None
+
+    # WHEN
+    await dispatcher.dispatch_batch()
+
+    # THEN
+    await session.refresh(message)
+    assert message.attempts == 2
+    assert message.processed_date is not None
+    # both failures share a fingerprint, so they are counted on one row
+    log = (await session.execute(select(FailedMessageLog))).scalar_one()
+    await session.refresh(log)
+    assert log.occurrences == 2
+
+
+@pytest.mark.asyncio
+async def test_message_bus_runs_local_handlers_inline_and_leaves_durable_ones_to_the_outbox(
+    create_user: UserOut,
+    session_factory: async_scoped_session,
+    session: AsyncSession,
+):
+    # GIVEN
+    user = create_user
+    local: list[UserUpdated] = []
+
+    class LocalHandler(RecordingHandler):
+        async def execute(self, event: UserUpdated) -> None:
+            local.append(event)
+
+    def get_update_handler() -> UserUpdateHandler:
+        uow = SqlAlchemyUnitOfWork(
+            repositories=dict(user=UserRepository), session_factory=session_factory, outbox_event_types={UserUpdated}
+        )
+        return UserUpdateHandler(uow=uow)
+
+    message_bus = MessageBus(
+        uow=unit_of_work.get_uow(repositories=dict()),
+        event_handlers={UserUpdated: [get_failing_handler]},
+        command_handlers={UpdateUser: get_update_handler},
+        local_event_handlers={UserUpdated: [lambda: LocalHandler(uow=unit_of_work.get_uow(repositories=dict()))]},
+    )
+
+    # WHEN
+    await message_bus.handle(UpdateUser(id=user.id, email="outbox@example.com", phone=user.phone))
+
+    # THEN the local handler ran in this process, the failing durable handler was never called
+    assert [x.id for x in local] == [user.id]
+    message = (await session.execute(select(OutboxMessage))).scalar_one()
+    assert message.message_name == "UserUpdated"
+    assert message.processed_date is None
+
+
+@pytest.mark.asyncio
+async def test_claimed_messages_are_leased_until_the_outcome_is_recorded(
+    create_user: UserOut,
+    session_factory: async_scoped_session,
+    session: AsyncSession,
+):
+    # GIVEN
+    user = create_user
+    await update_user_with_outbox(session_factory=session_factory, user=user)
+    dispatcher = get_dispatcher(get_recording_handler)
+
+    # WHEN
+    claimed = await dispatcher.claim()
+
+    # THEN the claim is committed and nobody else gets the message while the lease holds
+    assert len(claimed) == 1
+    assert not session.in_transaction()
+    assert await dispatcher.claim() == []
+
+    # WHEN the lease runs out without an outcome, as if the dispatcher died
+    await session.execute(
+        update(OutboxMessage).values(lease_expire_date=datetime.now() - timedelta(seconds=1))  # type: ignore
+    )
+    await session.commit()
+
+    # THEN
+    assert [x.id for x in await dispatcher.claim()] == [claimed[0].id]
+
+
+@pytest.mark.asyncio
+async def test_processed_outbox_messages_are_purged_after_retention(
+    create_user: UserOut,
+    session_factory: async_scoped_session,
+    session: AsyncSession,
+):
+    # GIVEN one processed message past retention and one still pending
+    user = create_user
+    await update_user_with_outbox(session_factory=session_factory, user=user)
+    uow = unit_of_work.get_uow(repositories=dict(outbox=OutboxRepository))
+    async with uow:
+        old = (await session.execute(select(OutboxMessage))).scalar_one()
+        await uow.outbox.update_outcome(ident=old.id, processed_date=datetime.now() - timedelta(days=30))
+        await uow.commit()
+    await update_user_with_outbox(session_factory=session_factory, user=user)
+
+    # WHEN
+    await purge_processed_outbox_messages()
+
+    # THEN
+    messages = (await session.execute(select(OutboxMessage))).scalars().all()
+    assert [x.processed_date for x in messages] == [None]
+
+
+@pytest.mark.asyncio
+async def test_events_without_durable_handlers_are_not_outboxed(
+    create_user: UserOut,
+    session_factory: async_scoped_session,
+    session: AsyncSession,
+):
+    # GIVEN the registered handlers, none of them durable
+    user = create_user
+    uow = SqlAlchemyUnitOfWork(
+        repositories=dict(user=UserRepository),
+        session_factory=session_factory,
+        outbox_event_types=unit_of_work.outbox_event_types,
+    )
+
+    # WHEN
+    await UserUpdateHandler(uow=uow).execute(cmd=UpdateUser(id=user.id, email="outbox@example.com", phone=user.phone))
+
+    # THEN the event is left to the local handlers, no row is written
+    assert UserUpdated not in unit_of_work.outbox_event_types
+    assert [isinstance(x, Event) and x.outboxed for x in uow.events] == [False]
+    assert (await session.execute(select(OutboxMessage))).scalars().all() == []
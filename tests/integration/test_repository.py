@@ -1,4 +1,7 @@
+import asyncio
+
 import pytest
+from nanoid import generate  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.user.model import User
@@ -64,3 +67,46 @@ async def test_repository(session: AsyncSession):
     # THEN
     after_delete_users: list[User] = await repository.get_all()
     assert len(after_delete_users) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_taken_emails_and_phones(session: AsyncSession):
+    # GIVEN
+    repository = UserRepository(session=session)
+    repository.add(User(email="test1@email.com", password="password", phone="1234"))
+    repository.add(User(email="test2@email.com", password="password", phone="5678"))
+    await session.commit()
+
+    # WHEN
+    taken_emails, taken_phones = await repository.get_taken_emails_and_phones(
+        emails=["test1@email.com", "free@email.com"],
+        phones=["5678", "0000"],
+    )
+
+    # THEN
+    assert taken_emails == {"test1@email.com"}
+    assert taken_phones == {"5678"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_are_batched(session: AsyncSession):
+    # GIVEN
+    repository = UserRepository(session=session)
+    users = [User(email=f"test{i}@email.com", password="password", phone=f"{i}") for i in range(3)]
+    repository.add_all(users)
+    await session.commit()
+    missing = generate()
+
+    # WHEN
+    found = await asyncio.gather(*[repository.get(ident=x.id) for x in users], repository.get(ident=missing))
+
+    # THEN
+    assert found == [*users, None]
+    assert repository.loader.batches == 1
+
+    # WHEN
+    found_many = await repository.get_many(idents=[users[2].id, missing, users[0].id])
+
+    # THEN
+    assert found_many == [users[2], users[0]]
+    assert repository.loader.batches == 2
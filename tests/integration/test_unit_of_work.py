@@ -4,6 +4,7 @@ from sqlalchemy.future import select
 
 from src.domain.user.model import User
 from src.service_layer.abstracts.abstract_unit_of_work import AbstractUnitOfWork
+from src.service_layer.exceptions import DuplicateRecord
 from src.service_layer.user.repository import UserRepository
 
 
@@ -65,3 +66,18 @@ async def test_will_rollback_on_error(uow: AbstractUnitOfWork):
     async with uow:
         users: list[User] = await uow.user.get_all()
         assert len(users) == 0
+
+
+@pytest.mark.asyncio
+async def test_unique_violation_on_commit_raises_duplicate_record(uow: AbstractUnitOfWork):
+    # GIVEN
+    uow.repositories = dict(user=UserRepository)
+    async with uow:
+        uow.user.add(User(email="test@email.com", phone="1234", password="password"))
+        await uow.commit()
+
+    # WHEN
+    with pytest.raises(DuplicateRecord):  # THEN
+        async with uow:
+            uow.user.add(User(email="test@email.com", phone="5678", password="password"))
+            await uow.commit()
@@ -3,12 +3,17 @@ from nanoid import generate  # type: ignore
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.user.commands import CreateUser, DeleteUser, UpdateUser
+from src.domain.user.commands import CreateUser, CreateUsers, DeleteUser, UpdateUser
 from src.domain.user.dto import UserOut
 from src.domain.user.events import UserCreated, UserDeleted, UserUpdated
 from src.service_layer.abstracts.abstract_command_handler import CommandHandler
 from src.service_layer.exceptions import DuplicateRecord, ItemNotFound
-from src.service_layer.user.factory import get_user_creation_handler, get_user_delete_handler, get_user_update_handler
+from src.service_layer.user.factory import (
+    get_user_bulk_creation_handler,
+    get_user_creation_handler,
+    get_user_delete_handler,
+    get_user_update_handler,
+)
 
 
 @pytest.mark.asyncio
@@ -64,6 +69,63 @@ async def test_create_user_unhappy_path(create_user: UserOut):
             )
         )
 
+    # WHEN the email only differs in case
+    with pytest.raises(DuplicateRecord):  # THEN
+        await service.execute(
+            cmd=CreateUser(
+                email=created.email.upper(),
+                phone="another phone",
+                password="password",
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_happy_path():
+    # GIVEN
+    service: CommandHandler = get_user_bulk_creation_handler()
+    cmd = CreateUsers(
+        users=[CreateUser(email=f"test{i}@email.com", phone=f"1234{i}", password=f"password{i}") for i in range(5)]
+    )
+
+    # WHEN
+    users = await service.execute(cmd=cmd)
+
+    # THEN
+    assert len(users) == 5
+    assert [user.email for user in users] == [user.email for user in cmd.users]
+    assert len(service.uow.events) == 5
+    assert all(isinstance(event, UserCreated) for event in service.uow.events)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_unhappy_path(create_user: UserOut):
+    # GIVEN
+    service: CommandHandler = get_user_bulk_creation_handler()
+    created = create_user
+
+    # WHEN
+    with pytest.raises(DuplicateRecord):  # THEN
+        await service.execute(
+            cmd=CreateUsers(
+                users=[
+                    CreateUser(email="new@email.com", phone="5678", password="password"),
+                    CreateUser(email=created.email, phone="9999", password="password"),
+                ]
+            )
+        )
+
+    # WHEN
+    with pytest.raises(DuplicateRecord):  # THEN
+        await service.execute(
+            cmd=CreateUsers(
+                users=[
+                    CreateUser(email="new@email.com", phone="5678", password="password"),
+                    CreateUser(email="new@email.com", phone="9999", password="password"),
+                ]
+            )
+        )
+
 
 @pytest.mark.asyncio
 async def test_update_user_happy_path(create_user: UserOut):
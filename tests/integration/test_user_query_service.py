@@ -1,10 +1,29 @@
+import asyncio
+from typing import Any, Literal
+
 import pytest
 from nanoid import generate  # type: ignore
 
+from src.domain.user.commands import DeleteUser, UpdateUser
 from src.domain.user.dto import UserOut, UserSearchParams
+from src.domain.user.events import UserDeleted, UserUpdated
 from src.entrypoints.dto import PaginationParams
+from src.entrypoints.exceptions import InvalidCursorException, InvalidSearchException, InvalidSortException
+from src.service_layer import unit_of_work
+from src.service_layer.cache_invalidation import LoopbackBroadcaster
 from src.service_layer.exceptions import ItemNotFound
+from src.service_layer.message_bus import MessageBus
 from src.service_layer.service_factory import get_user_query_service
+from src.service_layer.user.cache import user_cache, user_single_flight
+from src.service_layer.user.event_handlers import UserSearchIndexHandler
+from src.service_layer.user.ngram_index import NgramIndex, build_user_ngram_index
+from src.service_layer.user.repository import UserRepository
+from src.service_layer.user.search import (
+    LikeSearchBackend,
+    NgramSearchBackend,
+    TrigramSearchBackend,
+    UserSearchBackend,
+)
 
 
 @pytest.mark.asyncio
@@ -21,6 +40,81 @@ async def test_get_one_user_happy_path(create_user: UserOut):
     assert found == created
 
 
+@pytest.mark.asyncio
+async def test_get_one_user_does_not_cache_a_read_invalidated_while_loading(create_user: UserOut, monkeypatch):
+    # GIVEN a load that is suspended after reading the row
+    created = create_user
+    service = get_user_query_service()
+    read, resume = asyncio.Event(), asyncio.Event()
+    get_one_or_raise = service._get_one_or_raise
+
+    async def suspended_get_one_or_raise(query: Any) -> UserOut:
+        dto = await get_one_or_raise(query=query)
+        read.set()
+        await resume.wait()
+        return dto
+
+    monkeypatch.setattr(service, "_get_one_or_raise", suspended_get_one_or_raise)
+    stale_sets = user_cache.stale_sets
+    loading = asyncio.create_task(service.get_one_or_raise(ident=created.id))
+    await read.wait()
+
+    # WHEN the user is invalidated before the load finishes
+    user_cache.pop(created.id)
+    resume.set()
+
+    # THEN the caller still gets its read, but it is not cached
+    assert await loading == created
+    assert user_cache.get(created.id) is None
+    assert user_cache.stale_sets == stale_sets + 1
+
+
+@pytest.mark.asyncio
+async def test_get_one_user_is_cached_until_updated(create_user: UserOut, message_bus: MessageBus):
+    # GIVEN
+    created = create_user
+    service = get_user_query_service()
+    await service.get_one_or_raise(ident=created.id)
+    stats = user_cache.stats()
+
+    # WHEN
+    found = await service.get_one_or_raise(ident=created.id)
+
+    # THEN
+    assert found == created
+    assert user_cache.stats()["hits"] == stats["hits"] + 1
+
+    # WHEN
+    await message_bus.handle(UpdateUser(id=created.id, email="cached@example.com", phone=created.phone))
+
+    # THEN
+    assert user_cache.get(created.id) is None
+    found = await service.get_one_or_raise(ident=created.id)
+    assert found.email == "cached@example.com"
+
+    # WHEN
+    await message_bus.handle(DeleteUser(id=created.id))
+
+    # THEN
+    with pytest.raises(ItemNotFound):
+        await service.get_one_or_raise(ident=created.id)
+
+
+@pytest.mark.asyncio
+async def test_get_one_user_collapses_concurrent_reads(create_user: UserOut):
+    # GIVEN
+    created = create_user
+    stats = user_single_flight.stats()
+
+    # WHEN
+    found = await asyncio.gather(*[get_user_query_service().get_one_or_raise(ident=created.id) for _ in range(5)])
+
+    # THEN
+    assert found == [created] * 5
+    assert user_single_flight.stats()["calls"] == stats["calls"] + 5
+    assert user_single_flight.stats()["collapsed"] == stats["collapsed"] + 4
+
+
 @pytest.mark.asyncio
 async def test_get_one_user_unhappy_path():
     # GIVEN
@@ -41,7 +135,7 @@ async def test_paginate_users_happy_path(create_users_for_pagination: list[UserO
     final_total = 0
     for page, size in [(1, 10), (2, 10)]:
         service = get_user_query_service()
-        found, found_total = await service.paginate(
+        page_found = await service.paginate(
             search_params=UserSearchParams(
                 phone=None,
                 email=None,
@@ -52,8 +146,8 @@ async def test_paginate_users_happy_path(create_users_for_pagination: list[UserO
                 sort=None,
             ),
         )
-        final_found.extend(found)
-        final_total = found_total
+        final_found.extend(page_found.items)
+        final_total = page_found.total or 0
 
     # THEN
     assert final_total == len(expected)
@@ -61,3 +155,218 @@ async def test_paginate_users_happy_path(create_users_for_pagination: list[UserO
     expected.sort(key=lambda x: x.id)
     for expected, got in zip(expected, final_found):  # type: ignore
         assert expected == got
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", [None, "email", "-phone"])
+async def test_paginate_users_by_cursor(create_users_for_pagination: list[UserOut], sort: str | None):
+    # GIVEN
+    expected = create_users_for_pagination
+
+    # WHEN
+    final_found: list[UserOut] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        service = get_user_query_service()
+        page = await service.paginate(
+            search_params=UserSearchParams(phone=None, email=None),
+            pagination_params=PaginationParams(size=6, sort=sort, mode="cursor", cursor=cursor),
+        )
+        final_found.extend(page.items)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    # THEN
+    assert pages == 4
+    assert len(final_found) == len(expected)
+    if sort is None:
+        assert [x.id for x in final_found] == sorted(x.id for x in expected)
+    elif sort == "email":
+        assert [x.email for x in final_found] == sorted(x.email for x in expected)
+    else:
+        assert [x.phone for x in final_found] == sorted((x.phone for x in expected), reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_paginate_users_by_cursor_only_counts_on_request(create_users_for_pagination: list[UserOut]):
+    # GIVEN
+    service = get_user_query_service()
+
+    # WHEN
+    uncounted = await service.paginate(
+        search_params=UserSearchParams(phone=None, email=None),
+        pagination_params=PaginationParams(size=6, mode="cursor"),
+    )
+    counted = await get_user_query_service().paginate(
+        search_params=UserSearchParams(phone=None, email=None),
+        pagination_params=PaginationParams(size=6, mode="cursor", include_total="exact"),
+    )
+
+    # THEN
+    assert uncounted.total is None
+    assert counted.total == len(create_users_for_pagination)
+
+
+@pytest.mark.asyncio
+async def test_paginate_users_by_cursor_unhappy_path():
+    # GIVEN
+    service = get_user_query_service()
+
+    # WHEN
+    with pytest.raises(InvalidSortException):  # THEN
+        await service.paginate(
+            search_params=UserSearchParams(phone=None, email=None),
+            pagination_params=PaginationParams(sort="password", mode="cursor"),
+        )
+
+    # WHEN
+    with pytest.raises(InvalidCursorException):  # THEN
+        await service.paginate(
+            search_params=UserSearchParams(phone=None, email=None),
+            pagination_params=PaginationParams(cursor="not a cursor"),
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "include_total, page, expected_total, expected_has_next",
+    [
+        ("exact", 1, 20, True),
+        ("exact", 2, 20, False),
+        ("estimate", 1, 20, True),
+        ("none", 1, None, True),
+        ("none", 2, None, False),
+    ],
+)
+async def test_paginate_users_include_total(
+    create_users_for_pagination: list[UserOut],
+    include_total: Literal["exact", "estimate", "none"],
+    page: int,
+    expected_total: int | None,
+    expected_has_next: bool,
+):
+    # GIVEN
+    service = get_user_query_service()
+
+    # WHEN
+    found = await service.paginate(
+        search_params=UserSearchParams(phone=None, email=None),
+        pagination_params=PaginationParams(page=page, size=10, include_total=include_total),
+    )
+
+    # THEN
+    assert len(found.items) == 10
+    assert found.total == expected_total
+    assert found.has_next is expected_has_next
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page, estimate, expected_has_next", [(1, 5, True), (2, 1000, False)])
+async def test_paginate_users_does_not_trust_the_estimate_for_has_next(
+    create_users_for_pagination: list[UserOut], monkeypatch, page: int, estimate: int, expected_has_next: bool
+):
+    # GIVEN a planner estimate that is far off
+    service = get_user_query_service()
+
+    async def get_estimated_count(query: Any, filters: list[Any]) -> int:
+        return estimate
+
+    monkeypatch.setattr(service.view, "get_estimated_count", get_estimated_count)
+
+    # WHEN
+    found = await service.paginate(
+        search_params=UserSearchParams(phone=None, email=None),
+        pagination_params=PaginationParams(page=page, size=10, include_total="estimate"),
+    )
+
+    # THEN only the reported total comes from the estimate
+    assert len(found.items) == 10
+    assert found.total == estimate
+    assert found.has_next is expected_has_next
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "search_backend",
+    [LikeSearchBackend(min_pattern_length=3), TrigramSearchBackend(min_pattern_length=3)],
+)
+async def test_search_users(create_users_for_pagination: list[UserOut], search_backend: UserSearchBackend):
+    # GIVEN
+    expected = [x for x in create_users_for_pagination if "15test" in x.email]
+    service = get_user_query_service()
+    service.search_backend = search_backend
+
+    # WHEN
+    found = await service.paginate(
+        search_params=UserSearchParams(phone="2222", email="15TEST"),
+        pagination_params=PaginationParams(),
+    )
+
+    # THEN
+    assert found.total == 1
+    assert found.items == expected
+
+    # WHEN the pattern is too short
+    with pytest.raises(InvalidSearchException):  # THEN
+        await service.paginate(
+            search_params=UserSearchParams(phone="22", email=None),
+            pagination_params=PaginationParams(),
+        )
+
+    # WHEN the pattern contains like wildcards
+    found = await get_user_query_service().paginate(
+        search_params=UserSearchParams(phone=None, email="%%%"),
+        pagination_params=PaginationParams(),
+    )
+
+    # THEN
+    assert found.total == 0
+
+
+@pytest.mark.asyncio
+async def test_search_users_with_ngram_index(create_users_for_pagination: list[UserOut]):
+    # GIVEN
+    index = NgramIndex()
+    await build_user_ngram_index(index=index)
+    expected = [x for x in create_users_for_pagination if "15test" in x.email]
+    service = get_user_query_service()
+    service.search_backend = NgramSearchBackend(min_pattern_length=3, index=index, max_candidates=100)
+
+    # WHEN
+    found = await service.paginate(
+        search_params=UserSearchParams(phone=None, email="15TEST"),
+        pagination_params=PaginationParams(),
+    )
+
+    # THEN
+    assert index.ready
+    assert len(index.documents) == len(create_users_for_pagination)
+    assert found.total == 1
+    assert found.items == expected
+
+    # WHEN the user is updated and then deleted
+    updated = expected[0]
+    uow = unit_of_work.get_uow(repositories=dict(user=UserRepository))
+    async with uow:
+        user = await uow.user.get(ident=updated.id)
+        user.email = "renamed@example.com"
+        await uow.commit()
+    handler = UserSearchIndexHandler(uow=uow, index=index, broadcaster=LoopbackBroadcaster())
+    await handler.execute(event=UserUpdated(id=updated.id))
+
+    # THEN
+    assert index.search(field="email", pattern="15test") == set()
+    assert index.search(field="email", pattern="renamed") == {updated.id}
+
+    # WHEN
+    await handler.execute(event=UserDeleted(id=updated.id))
+
+    # THEN
+    found = await service.paginate(
+        search_params=UserSearchParams(phone=None, email="renamed"),
+        pagination_params=PaginationParams(),
+    )
+    assert found.total == 0
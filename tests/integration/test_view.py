@@ -1,10 +1,12 @@
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
 
 from src.domain.user.model import User
 from src.service_layer.abstracts.abstract_view import AbstractView
 from src.service_layer.user.repository import UserRepository
+from src.service_layer.view import SqlAlchemyView, shared_session_scope
 
 
 @pytest.mark.asyncio
@@ -64,3 +66,33 @@ async def test_can_get_from_view_with_sqlalchemy_query(session: AsyncSession, vi
         assert res.email == user.email
         assert res.phone == user.phone
         assert res.password == user.password
+
+
+@pytest.mark.asyncio
+async def test_views_share_one_session_within_a_scope(async_engine: AsyncEngine):
+    # GIVEN
+    session_factory = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    first = SqlAlchemyView(repositories=dict(user=UserRepository), session_factory=session_factory)
+    second = SqlAlchemyView(repositories=dict(user=UserRepository), session_factory=session_factory)
+
+    # WHEN
+    async with shared_session_scope() as scope:
+        async with first:
+            await first.execute(query=select(User), scalars=True, one=False)
+        async with second:
+            await second.execute(query=select(User), scalars=True, one=False)
+
+        # THEN
+        assert first.session is second.session
+        assert list(scope.sessions.values()) == [first.session]
+        # the connection went back to the pool when each view exited
+        assert not first.session.in_transaction()
+
+    # WHEN
+    async with first:
+        pass
+    async with second:
+        pass
+
+    # THEN
+    assert first.session is not second.session
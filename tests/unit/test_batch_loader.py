@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from src.utils.batch_loader import BatchLoader
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_gathers_loads_within_one_tick():
+    # GIVEN
+    calls: list[list[int]] = []
+
+    async def load_many(keys: list[int]) -> dict[int, str]:
+        calls.append(keys)
+        return {key: str(key) for key in keys if key != 3}
+
+    loader: BatchLoader[int, str] = BatchLoader(load_many, max_batch_size=2)
+
+    # WHEN
+    found = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+
+    # THEN
+    assert found == ["1", "2", "1", None]
+    assert calls == [[1, 2], [3]]
+    assert loader.loads == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_fails_every_load_of_a_failed_batch():
+    # GIVEN
+    async def load_many(keys: list[int]) -> dict[int, str]:
+        raise ValueError("boom")
+
+    loader: BatchLoader[int, str] = BatchLoader(load_many)
+
+    # WHEN
+    found = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    # THEN
+    assert all(isinstance(x, ValueError) for x in found)
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_cancels_loads_when_the_batch_is_cancelled():
+    # GIVEN
+    async def load_many(keys: list[int]) -> dict[int, str]:
+        raise asyncio.CancelledError()
+
+    loader: BatchLoader[int, str] = BatchLoader(load_many)
+
+    # WHEN
+    futures = [loader.load(1), loader.load(2)]
+    done, _ = await asyncio.wait(futures, timeout=1)
+
+    # THEN
+    assert len(done) == 2
+    assert all(future.cancelled() for future in futures)
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.service_layer.cache_invalidation import LoopbackBroadcaster, PostgresBroadcaster
+from src.utils.cache import TTLCache
+
+
+@pytest.mark.asyncio
+async def test_loopback_broadcaster_evicts_subscribed_cache():
+    # GIVEN
+    cache: TTLCache[str, str] = TTLCache(max_size=10)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    broadcaster = LoopbackBroadcaster()
+    broadcaster.subscribe("test", cache)
+
+    # WHEN
+    await broadcaster.publish(cache_name="test", key="a")
+    await broadcaster.publish(cache_name="unknown", key="b")
+
+    # THEN
+    assert cache.get("a") is None
+    assert cache.get("b") == "2"
+
+
+def test_postgres_broadcaster_handles_notifications():
+    # GIVEN
+    cache: TTLCache[str, str] = TTLCache(max_size=10)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    broadcaster = PostgresBroadcaster(
+        engine=create_async_engine("postgresql+asyncpg://u:p@localhost/d"),
+        channel="cache_invalidation",
+    )
+    broadcaster.subscribe("test", cache)
+
+    # WHEN
+    broadcaster._on_notification(None, 1, "cache_invalidation", json.dumps({"cache": "test", "key": "a"}))
+    broadcaster._on_notification(None, 1, "cache_invalidation", "not json")
+
+    # THEN
+    assert cache.get("a") is None
+    assert cache.get("b") == "2"
+
+    # WHEN the listening connection is lost
+    broadcaster.stopping = True
+    broadcaster._on_termination(None)
+
+    # THEN
+    assert len(cache) == 0
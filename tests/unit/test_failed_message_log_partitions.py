@@ -0,0 +1,55 @@
+from datetime import date
+
+from src.service_layer.failed_message_log.partitions import add_months, partition_month, partition_name, plan_partitions
+
+
+def test_partition_names_round_trip():
+    # GIVEN
+    month = date(2026, 1, 1)
+
+    # WHEN
+    name = partition_name(month)
+
+    # THEN
+    assert name == "failed_message_log_y2026m01"
+    assert partition_month(name) == month
+    assert partition_month("failed_message_log_default") is None
+    assert add_months(month, -1) == date(2025, 12, 1)
+    assert add_months(month, 13) == date(2027, 2, 1)
+
+
+def test_plan_partitions_creates_upcoming_and_drops_expired():
+    # GIVEN
+    existing = [
+        "failed_message_log_y2026m06",
+        "failed_message_log_y2026m07",
+        "failed_message_log_y2026m10",
+        "failed_message_log_default",
+    ]
+
+    # WHEN
+    to_create, to_drop = plan_partitions(
+        existing=existing, today=date(2026, 10, 18), premake_months=2, retention_months=3
+    )
+
+    # THEN
+    assert to_create == [date(2026, 11, 1), date(2026, 12, 1)]
+    assert to_drop == ["failed_message_log_y2026m06"]
+
+
+def test_plan_partitions_splits_out_months_stranded_in_the_default_partition():
+    # GIVEN maintenance lapsed, so rows of August and of an expired month landed in the default partition
+    existing = ["failed_message_log_y2026m07", "failed_message_log_default"]
+
+    # WHEN
+    to_create, to_drop = plan_partitions(
+        existing=existing,
+        today=date(2026, 10, 18),
+        premake_months=2,
+        retention_months=3,
+        stranded_months=[date(2026, 8, 1), date(2026, 1, 1)],
+    )
+
+    # THEN
+    assert to_create == [date(2026, 8, 1), date(2026, 10, 1), date(2026, 11, 1), date(2026, 12, 1)]
+    assert to_drop == []
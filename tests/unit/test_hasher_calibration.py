@@ -0,0 +1,38 @@
+from src.common.security.hasher_calibration import MIN_MEMORY_COST, calibrate
+from src.common.security.hashing import async_password_hasher_factory, max_concurrent_hashes
+
+
+def test_calibrate_selects_measured_parameters():
+    # WHEN
+    selected, measured = calibrate(
+        target_latency_ms=10_000,
+        max_memory_cost=MIN_MEMORY_COST,
+        parallelism=1,
+        samples=1,
+        max_time_cost=3,
+    )
+
+    # THEN
+    assert len(measured) == 2
+    assert selected in measured
+    assert selected.memory_cost == MIN_MEMORY_COST
+    assert selected.time_cost == 3
+    assert selected.p50_ms <= selected.p99_ms
+
+
+def test_memory_budget_caps_concurrent_hashes():
+    # GIVEN
+    memory_cost = 65536
+
+    # WHEN
+    hasher = async_password_hasher_factory(
+        backend="THREAD",
+        max_workers=16,
+        max_queue_size=4,
+        memory_budget_kib=memory_cost * 2,
+    )
+
+    # THEN
+    assert max_concurrent_hashes(memory_budget_kib=memory_cost // 2, memory_cost=memory_cost) == 1
+    assert hasher.max_pending == 2 + 4
+    hasher.shutdown()
@@ -0,0 +1,38 @@
+from src.service_layer.user.ngram_index import NgramIndex
+
+
+def test_ngram_index_search():
+    # GIVEN
+    index = NgramIndex()
+    index.add("1", {"email": "Alice@Example.com", "phone": "01012345678"})
+    index.add("2", {"email": "bob@example.com", "phone": "01087654321"})
+
+    # WHEN
+    by_email = index.search(field="email", pattern="ALICE")
+    by_phone = index.search(field="phone", pattern="010")
+    by_short_pattern = index.search(field="email", pattern="b")
+
+    # THEN
+    assert by_email == {"1"}
+    assert by_phone == {"1", "2"}
+    assert by_short_pattern == {"2"}
+
+
+def test_ngram_index_update_and_remove():
+    # GIVEN
+    index = NgramIndex()
+    index.add("1", {"email": "old@example.com", "phone": "01012345678"})
+
+    # WHEN
+    index.add("1", {"email": "new@example.com", "phone": "01012345678"})
+
+    # THEN
+    assert index.search(field="email", pattern="old") == set()
+    assert index.search(field="email", pattern="new") == {"1"}
+
+    # WHEN
+    index.remove("1")
+
+    # THEN
+    assert index.search(field="phone", pattern="0101") == set()
+    assert not index.postings["email"]
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.common.configs.pool_metrics import InstrumentedQueuePool
+from src.utils.metrics import Histogram
+
+
+def test_histogram_is_cumulative():
+    # GIVEN
+    histogram = Histogram(buckets=(1, 10))
+
+    # WHEN
+    for value in (0.5, 5, 5, 50):
+        histogram.observe(value)
+
+    # THEN
+    assert histogram.snapshot() == {"buckets": {"1": 1, "10": 3, "+Inf": 4}, "count": 4, "sum": 60.5}
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_checkouts_and_saturation():
+    # GIVEN
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=1,
+        max_overflow=0,
+    )
+    pool: InstrumentedQueuePool = engine.sync_engine.pool  # type: ignore
+
+    # WHEN
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+        # THEN
+        assert pool.saturated()
+        assert pool.snapshot()["in_use"] == 1
+
+    # THEN
+    assert not pool.saturated()
+    assert pool.metrics.checkout_ms.count == 1
+    assert pool.metrics.wait_ms.count == 1
+    assert pool.metrics.pre_ping_ms.count == 1
+    await engine.dispose()
@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.service_layer import view
+from src.service_layer.replica_router import Replica, ReplicaRouter
+
+
+def primary_session_factory(): ...
+
+
+def get_replicas(count: int) -> list[Replica]:
+    return [Replica(engine=create_async_engine(f"postgresql+asyncpg://u:p@replica{i}/d")) for i in range(count)]
+
+
+def test_round_robin_skips_unusable_replicas():
+    # GIVEN
+    replicas = get_replicas(3)
+    router = ReplicaRouter(
+        primary_session_factory=primary_session_factory,
+        replicas=replicas,
+        policy="ROUND_ROBIN",
+        max_lag_seconds=5,
+    )
+    replicas[1].healthy = False
+    replicas[2].lag_seconds = 10
+
+    # WHEN
+    routed = {router.route() for _ in range(4)}
+
+    # THEN
+    assert routed == {replicas[0].session_factory}
+    assert router.route(read_from_primary=True) is primary_session_factory
+
+    # WHEN no replica is usable
+    replicas[0].healthy = False
+
+    # THEN
+    assert router.route() is primary_session_factory
+
+
+def test_least_busy_picks_replica_with_fewest_checked_out_connections(monkeypatch):
+    # GIVEN
+    replicas = get_replicas(2)
+    router = ReplicaRouter(
+        primary_session_factory=primary_session_factory,
+        replicas=replicas,
+        policy="LEAST_BUSY",
+        max_lag_seconds=5,
+    )
+    monkeypatch.setattr(replicas[0].engine.sync_engine.pool, "checkedout", lambda: 3)
+    monkeypatch.setattr(replicas[1].engine.sync_engine.pool, "checkedout", lambda: 1)
+
+    # WHEN
+    routed = router.route()
+
+    # THEN
+    assert routed is replicas[1].session_factory
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_is_marked_unhealthy():
+    # GIVEN
+    replicas = [Replica(engine=create_async_engine("sqlite+aiosqlite:///:memory:"))]
+    router = ReplicaRouter(
+        primary_session_factory=primary_session_factory,
+        replicas=replicas,
+        policy="ROUND_ROBIN",
+        max_lag_seconds=5,
+    )
+
+    # WHEN
+    await router.check_health()
+
+    # THEN
+    assert replicas[0].healthy is False
+    assert router.route() is primary_session_factory
+
+
+@pytest.mark.asyncio
+async def test_views_of_one_scope_read_from_the_same_server(monkeypatch):
+    # GIVEN
+    replicas = get_replicas(2)
+    router = ReplicaRouter(
+        primary_session_factory=primary_session_factory,
+        replicas=replicas,
+        policy="ROUND_ROBIN",
+        max_lag_seconds=5,
+    )
+    monkeypatch.setattr(view, "replica_router", router)
+
+    # WHEN
+    async with view.shared_session_scope():
+        routed = {view.get_read_session_factory() for _ in range(3)}
+    async with view.shared_session_scope(read_from_primary=True):
+        routed_after_write = view.get_read_session_factory()
+
+    # THEN
+    assert len(routed) == 1
+    assert routed_after_write is primary_session_factory
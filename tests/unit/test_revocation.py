@@ -0,0 +1,38 @@
+from nanoid import generate  # type: ignore
+
+from src.common.security.revocation import BloomFilter, RevocationList
+
+
+def test_bloom_filter_has_no_false_negatives():
+    # GIVEN
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    added = [generate() for _ in range(1000)]
+
+    # WHEN
+    for item in added:
+        bloom_filter.add(item)
+
+    # THEN
+    assert all(item in bloom_filter for item in added)
+    false_positives = sum(generate() in bloom_filter for _ in range(1000))
+    assert false_positives < 50
+
+
+def test_revocation_list_keeps_local_revocations_across_refresh():
+    # GIVEN
+    revocation_list = RevocationList(capacity=100, error_rate=0.001)
+    revocation_list.add("local")
+
+    # WHEN
+    revocation_list.replace(["from-db"])
+
+    # THEN
+    assert revocation_list.might_be_revoked("local")
+    assert revocation_list.might_be_revoked("from-db")
+    assert revocation_list.refreshed_at is not None
+
+    # WHEN refreshed again without the local jti in the database
+    revocation_list.replace([])
+
+    # THEN
+    assert not revocation_list.might_be_revoked("local")
@@ -0,0 +1,75 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_collapses_concurrent_calls():
+    # GIVEN
+    single_flight: SingleFlight = SingleFlight()
+    release = asyncio.Event()
+    executions = 0
+
+    async def query():
+        nonlocal executions
+        executions += 1
+        await release.wait()
+        return "result"
+
+    # WHEN
+    waiters = [asyncio.ensure_future(single_flight.do("key", query)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    # THEN
+    assert results == ["result"] * 5
+    assert executions == 1
+    assert single_flight.stats() == {"calls": 5, "collapsed": 4, "collapse_ratio": 0.8}
+    assert not single_flight.in_flight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions_and_survives_cancelled_callers():
+    # GIVEN
+    single_flight: SingleFlight = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing_query():
+        await release.wait()
+        raise ValueError("boom")
+
+    leader = asyncio.ensure_future(single_flight.do("key", failing_query))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(single_flight.do("key", failing_query))
+    await asyncio.sleep(0)
+
+    # WHEN
+    leader.cancel()
+    release.set()
+
+    # THEN
+    with pytest.raises(ValueError):
+        await follower
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_single_flight_does_not_run_in_the_first_callers_context():
+    # GIVEN
+    single_flight: SingleFlight = SingleFlight()
+    request_state: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_state", default=None)
+    request_state.set("leader")
+
+    async def query():
+        return request_state.get()
+
+    # WHEN
+    result = await single_flight.do("key", query)
+
+    # THEN
+    assert result is None
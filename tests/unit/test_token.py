@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from src.common.security import token
+from src.utils.cache import TTLCache
+
+
+def test_validate_jwt_token_is_cached_until_expiry():
+    # GIVEN
+    token.token_cache.clear()
+    jwt_token = token.create_jwt_token(subject="id", private_claims={"email": "e", "phone": "p"}, refresh=False)
+    hits = token.token_cache.hits
+
+    # WHEN
+    first = token.validate_jwt_token(jwt_token)
+    second = token.validate_jwt_token(jwt_token)
+
+    # THEN
+    assert first == second
+    assert token.token_cache.hits == hits + 1
+
+
+def test_invalid_token_is_not_cached():
+    # GIVEN
+    token.token_cache.clear()
+
+    # WHEN
+    with pytest.raises(token.InvalidToken):  # THEN
+        token.validate_jwt_token("token")
+    assert len(token.token_cache) == 0
+
+
+def test_ttl_cache_expiry_and_eviction():
+    # GIVEN
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+
+    # WHEN
+    cache.set("expired", 1, expires_at=time.time() - 1)
+    cache.set("a", 2)
+    cache.set("b", 3)
+    cache.set("c", 4)
+
+    # THEN
+    assert cache.get("expired") is None
+    assert cache.get("a") is None
+    assert cache.get("c") == 4
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 2, "evictions": 2}
@@ -1,5 +1,9 @@
+import asyncio
+
+import pytest
 from argon2 import PasswordHasher
 
+from src.common.security.hashing import HasherOverloaded, async_password_hasher_factory
 from src.domain.user.model import User
 
 
@@ -60,3 +64,78 @@ def test_update_user_password():
 
     # THEN
     assert user.verify(password="new password", hasher=PasswordHasher())
+
+
+@pytest.mark.asyncio
+async def test_create_and_verify_user_with_async_hasher():
+    # GIVEN
+    hasher = async_password_hasher_factory(backend="THREAD", max_workers=1, max_queue_size=1)
+
+    # WHEN
+    user = await User.acreate(
+        phone="010",
+        email="email@email.com",
+        password="password",
+        hasher=hasher,
+    )
+
+    # THEN
+    assert user.password != "password"
+    assert await user.averify(password="password", hasher=hasher)
+    assert not await user.averify(password="not password", hasher=hasher)
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_hasher_rejects_when_overloaded():
+    # GIVEN
+    hasher = async_password_hasher_factory(backend="THREAD", max_workers=1, max_queue_size=0)
+
+    # WHEN
+    first = asyncio.create_task(hasher.hash(password="password"))
+    await asyncio.sleep(0)
+
+    # THEN
+    with pytest.raises(HasherOverloaded):
+        await hasher.hash(password="password")
+    assert await first
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_hasher_admits_batches_per_item():
+    # GIVEN
+    hasher = async_password_hasher_factory(backend="THREAD", max_workers=1, max_queue_size=2)
+
+    # WHEN
+    first = asyncio.create_task(hasher.hash_many(passwords=["a", "b"]))
+    await asyncio.sleep(0)
+
+    # THEN
+    assert hasher.pending == 2
+    with pytest.raises(HasherOverloaded):
+        await hasher.hash_many(passwords=["c", "d"])
+    assert len(await first) == 2
+    assert hasher.pending == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_retired_async_hasher_drains_and_forwards_to_its_successor():
+    # GIVEN a hash in flight on the old hasher
+    old = async_password_hasher_factory(backend="THREAD", max_workers=1, max_queue_size=1)
+    new = async_password_hasher_factory(backend="THREAD", max_workers=1, max_queue_size=1)
+    in_flight = asyncio.create_task(old.hash(password="password"))
+    await asyncio.sleep(0)
+
+    # WHEN
+    old.retire(successor=new)
+    hashed = await old.hash(password="password")
+
+    # THEN the in flight hash finished on the old executor, the later one ran on the new hasher
+    assert await in_flight
+    assert hashed
+    assert old.pending == 0
+    with pytest.raises(RuntimeError):
+        old.executor.submit(print)
+    new.shutdown()
@@ -0,0 +1,37 @@
+from starlette.requests import Request
+
+from src.common.configs import db_config
+from src.main import get_request_workload
+from src.service_layer.unit_of_work import get_uow
+from src.service_layer.view import get_view
+
+
+def auth_session_factory(): ...
+
+
+def logging_session_factory(): ...
+
+
+def test_units_of_work_and_views_use_their_workload_pool(monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(db_config, "transactional_session_factories", {"LOGGING": logging_session_factory})
+    monkeypatch.setattr(db_config, "autocommit_session_factories", {"AUTH": auth_session_factory})
+
+    # WHEN
+    uow = get_uow(repositories=dict(), workload="LOGGING")
+    auth_view = get_view(repositories=dict(), workload="AUTH")
+
+    # THEN
+    assert uow.session_factory is logging_session_factory  # type: ignore
+    assert auth_view.session_factory is auth_session_factory  # type: ignore
+
+
+def test_requests_are_admitted_against_their_workload_pool():
+    # GIVEN
+    def request(method: str, path: str) -> Request:
+        return Request({"type": "http", "method": method, "path": path, "headers": []})
+
+    # THEN
+    assert get_request_workload(request("POST", "/api/v1/login")) == "AUTH"
+    assert get_request_workload(request("GET", "/api/v1/users")) == "QUERY"
+    assert get_request_workload(request("PATCH", "/api/v1/users/1")) == "COMMAND"